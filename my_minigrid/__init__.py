@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import warnings
+
+import minigrid  # noqa: F401  (registers the ids without a my_minigrid environment, e.g. MiniGrid-WFC-*)
 from gymnasium.envs.registration import register
 
 from my_minigrid import minigrid_env, wrappers
@@ -26,32 +29,32 @@ def register_minigrid_envs():
 
     register(
         id="MiniGrid-BlockedUnlockPickup-v0",
-        entry_point="minigrid.envs:BlockedUnlockPickupEnv",
+        entry_point="my_minigrid.envs:BlockedUnlockPickupEnv",
     )
 
     # LavaCrossing
     # ----------------------------------------
     register(
         id="MiniGrid-LavaCrossingS9N1-v0",
-        entry_point="minigrid.envs:CrossingEnv",
+        entry_point="my_minigrid.envs:CrossingEnv",
         kwargs={"size": 9, "num_crossings": 1},
     )
 
     register(
         id="MiniGrid-LavaCrossingS9N2-v0",
-        entry_point="minigrid.envs:CrossingEnv",
+        entry_point="my_minigrid.envs:CrossingEnv",
         kwargs={"size": 9, "num_crossings": 2},
     )
 
     register(
         id="MiniGrid-LavaCrossingS9N3-v0",
-        entry_point="minigrid.envs:CrossingEnv",
+        entry_point="my_minigrid.envs:CrossingEnv",
         kwargs={"size": 9, "num_crossings": 3},
     )
 
     register(
         id="MiniGrid-LavaCrossingS11N5-v0",
-        entry_point="minigrid.envs:CrossingEnv",
+        entry_point="my_minigrid.envs:CrossingEnv",
         kwargs={"size": 11, "num_crossings": 5},
     )
 
@@ -60,25 +63,25 @@ def register_minigrid_envs():
 
     register(
         id="MiniGrid-SimpleCrossingS9N1-v0",
-        entry_point="minigrid.envs:CrossingEnv",
+        entry_point="my_minigrid.envs:CrossingEnv",
         kwargs={"size": 9, "num_crossings": 1, "obstacle_type": Wall},
     )
 
     register(
         id="MiniGrid-SimpleCrossingS9N2-v0",
-        entry_point="minigrid.envs:CrossingEnv",
+        entry_point="my_minigrid.envs:CrossingEnv",
         kwargs={"size": 9, "num_crossings": 2, "obstacle_type": Wall},
     )
 
     register(
         id="MiniGrid-SimpleCrossingS9N3-v0",
-        entry_point="minigrid.envs:CrossingEnv",
+        entry_point="my_minigrid.envs:CrossingEnv",
         kwargs={"size": 9, "num_crossings": 3, "obstacle_type": Wall},
     )
 
     register(
         id="MiniGrid-SimpleCrossingS11N5-v0",
-        entry_point="minigrid.envs:CrossingEnv",
+        entry_point="my_minigrid.envs:CrossingEnv",
         kwargs={"size": 11, "num_crossings": 5, "obstacle_type": Wall},
     )
 
@@ -87,13 +90,13 @@ def register_minigrid_envs():
 
     register(
         id="MiniGrid-DistShift1-v0",
-        entry_point="minigrid.envs:DistShiftEnv",
+        entry_point="my_minigrid.envs:DistShiftEnv",
         kwargs={"strip2_row": 2},
     )
 
     register(
         id="MiniGrid-DistShift2-v0",
-        entry_point="minigrid.envs:DistShiftEnv",
+        entry_point="my_minigrid.envs:DistShiftEnv",
         kwargs={"strip2_row": 5},
     )
 
@@ -102,25 +105,25 @@ def register_minigrid_envs():
 
     register(
         id="MiniGrid-DoorKey-5x5-v0",
-        entry_point="minigrid.envs:DoorKeyEnv",
+        entry_point="my_minigrid.envs:DoorKeyEnv",
         kwargs={"size": 5},
     )
 
     register(
         id="MiniGrid-DoorKey-6x6-v0",
-        entry_point="minigrid.envs:DoorKeyEnv",
+        entry_point="my_minigrid.envs:DoorKeyEnv",
         kwargs={"size": 6},
     )
 
     register(
         id="MiniGrid-DoorKey-8x8-v0",
-        entry_point="minigrid.envs:DoorKeyEnv",
+        entry_point="my_minigrid.envs:DoorKeyEnv",
         kwargs={"size": 8},
     )
 
     register(
         id="MiniGrid-DoorKey-16x16-v0",
-        entry_point="minigrid.envs:DoorKeyEnv",
+        entry_point="my_minigrid.envs:DoorKeyEnv",
         kwargs={"size": 16},
     )
 
@@ -129,36 +132,36 @@ def register_minigrid_envs():
 
     register(
         id="MiniGrid-Dynamic-Obstacles-5x5-v0",
-        entry_point="minigrid.envs:DynamicObstaclesEnv",
+        entry_point="my_minigrid.envs:DynamicObstaclesEnv",
         kwargs={"size": 5, "n_obstacles": 2},
     )
 
     register(
         id="MiniGrid-Dynamic-Obstacles-Random-5x5-v0",
-        entry_point="minigrid.envs:DynamicObstaclesEnv",
+        entry_point="my_minigrid.envs:DynamicObstaclesEnv",
         kwargs={"size": 5, "agent_start_pos": None, "n_obstacles": 2},
     )
 
     register(
         id="MiniGrid-Dynamic-Obstacles-6x6-v0",
-        entry_point="minigrid.envs:DynamicObstaclesEnv",
+        entry_point="my_minigrid.envs:DynamicObstaclesEnv",
         kwargs={"size": 6, "n_obstacles": 3},
     )
 
     register(
         id="MiniGrid-Dynamic-Obstacles-Random-6x6-v0",
-        entry_point="minigrid.envs:DynamicObstaclesEnv",
+        entry_point="my_minigrid.envs:DynamicObstaclesEnv",
         kwargs={"size": 6, "agent_start_pos": None, "n_obstacles": 3},
     )
 
     register(
         id="MiniGrid-Dynamic-Obstacles-8x8-v0",
-        entry_point="minigrid.envs:DynamicObstaclesEnv",
+        entry_point="my_minigrid.envs:DynamicObstaclesEnv",
     )
 
     register(
         id="MiniGrid-Dynamic-Obstacles-16x16-v0",
-        entry_point="minigrid.envs:DynamicObstaclesEnv",
+        entry_point="my_minigrid.envs:DynamicObstaclesEnv",
         kwargs={"size": 16, "n_obstacles": 8},
     )
 
@@ -167,36 +170,36 @@ def register_minigrid_envs():
 
     register(
         id="MiniGrid-Empty-5x5-v0",
-        entry_point="minigrid.envs:EmptyEnv",
+        entry_point="my_minigrid.envs:EmptyEnv",
         kwargs={"size": 5},
     )
 
     register(
         id="MiniGrid-Empty-Random-5x5-v0",
-        entry_point="minigrid.envs:EmptyEnv",
+        entry_point="my_minigrid.envs:EmptyEnv",
         kwargs={"size": 5, "agent_start_pos": None},
     )
 
     register(
         id="MiniGrid-Empty-6x6-v0",
-        entry_point="minigrid.envs:EmptyEnv",
+        entry_point="my_minigrid.envs:EmptyEnv",
         kwargs={"size": 6},
     )
 
     register(
         id="MiniGrid-Empty-Random-6x6-v0",
-        entry_point="minigrid.envs:EmptyEnv",
+        entry_point="my_minigrid.envs:EmptyEnv",
         kwargs={"size": 6, "agent_start_pos": None},
     )
 
     register(
         id="MiniGrid-Empty-8x8-v0",
-        entry_point="minigrid.envs:EmptyEnv",
+        entry_point="my_minigrid.envs:EmptyEnv",
     )
 
     register(
         id="MiniGrid-Empty-16x16-v0",
-        entry_point="minigrid.envs:EmptyEnv",
+        entry_point="my_minigrid.envs:EmptyEnv",
         kwargs={"size": 16},
     )
 
@@ -205,24 +208,24 @@ def register_minigrid_envs():
 
     register(
         id="MiniGrid-Fetch-5x5-N2-v0",
-        entry_point="minigrid.envs:FetchEnv",
+        entry_point="my_minigrid.envs:FetchEnv",
         kwargs={"size": 5, "numObjs": 2},
     )
 
     register(
         id="MiniGrid-Fetch-6x6-N2-v0",
-        entry_point="minigrid.envs:FetchEnv",
+        entry_point="my_minigrid.envs:FetchEnv",
         kwargs={"size": 6, "numObjs": 2},
     )
 
-    register(id="MiniGrid-Fetch-8x8-N3-v0", entry_point="minigrid.envs:FetchEnv")
+    register(id="MiniGrid-Fetch-8x8-N3-v0", entry_point="my_minigrid.envs:FetchEnv")
 
     # FourRooms
     # ----------------------------------------
 
     register(
         id="MiniGrid-FourRooms-v0",
-        entry_point="minigrid.envs:FourRoomsEnv",
+        entry_point="my_minigrid.envs:FourRoomsEnv",
     )
 
     # GoToDoor
@@ -230,18 +233,18 @@ def register_minigrid_envs():
 
     register(
         id="MiniGrid-GoToDoor-5x5-v0",
-        entry_point="minigrid.envs:GoToDoorEnv",
+        entry_point="my_minigrid.envs:GoToDoorEnv",
     )
 
     register(
         id="MiniGrid-GoToDoor-6x6-v0",
-        entry_point="minigrid.envs:GoToDoorEnv",
+        entry_point="my_minigrid.envs:GoToDoorEnv",
         kwargs={"size": 6},
     )
 
     register(
         id="MiniGrid-GoToDoor-8x8-v0",
-        entry_point="minigrid.envs:GoToDoorEnv",
+        entry_point="my_minigrid.envs:GoToDoorEnv",
         kwargs={"size": 8},
     )
 
@@ -250,12 +253,12 @@ def register_minigrid_envs():
 
     register(
         id="MiniGrid-GoToObject-6x6-N2-v0",
-        entry_point="minigrid.envs:GoToObjectEnv",
+        entry_point="my_minigrid.envs:GoToObjectEnv",
     )
 
     register(
         id="MiniGrid-GoToObject-8x8-N2-v0",
-        entry_point="minigrid.envs:GoToObjectEnv",
+        entry_point="my_minigrid.envs:GoToObjectEnv",
         kwargs={"size": 8, "numObjs": 2},
     )
 
@@ -264,37 +267,37 @@ def register_minigrid_envs():
 
     register(
         id="MiniGrid-KeyCorridorS3R1-v0",
-        entry_point="minigrid.envs:KeyCorridorEnv",
+        entry_point="my_minigrid.envs:KeyCorridorEnv",
         kwargs={"room_size": 3, "num_rows": 1},
     )
 
     register(
         id="MiniGrid-KeyCorridorS3R2-v0",
-        entry_point="minigrid.envs:KeyCorridorEnv",
+        entry_point="my_minigrid.envs:KeyCorridorEnv",
         kwargs={"room_size": 3, "num_rows": 2},
     )
 
     register(
         id="MiniGrid-KeyCorridorS3R3-v0",
-        entry_point="minigrid.envs:KeyCorridorEnv",
+        entry_point="my_minigrid.envs:KeyCorridorEnv",
         kwargs={"room_size": 3, "num_rows": 3},
     )
 
     register(
         id="MiniGrid-KeyCorridorS4R3-v0",
-        entry_point="minigrid.envs:KeyCorridorEnv",
+        entry_point="my_minigrid.envs:KeyCorridorEnv",
         kwargs={"room_size": 4, "num_rows": 3},
     )
 
     register(
         id="MiniGrid-KeyCorridorS5R3-v0",
-        entry_point="minigrid.envs:KeyCorridorEnv",
+        entry_point="my_minigrid.envs:KeyCorridorEnv",
         kwargs={"room_size": 5, "num_rows": 3},
     )
 
     register(
         id="MiniGrid-KeyCorridorS6R3-v0",
-        entry_point="minigrid.envs:KeyCorridorEnv",
+        entry_point="my_minigrid.envs:KeyCorridorEnv",
         kwargs={"room_size": 6, "num_rows": 3},
     )
 
@@ -303,19 +306,19 @@ def register_minigrid_envs():
 
     register(
         id="MiniGrid-LavaGapS5-v0",
-        entry_point="minigrid.envs:LavaGapEnv",
+        entry_point="my_minigrid.envs:LavaGapEnv",
         kwargs={"size": 5},
     )
 
     register(
         id="MiniGrid-LavaGapS6-v0",
-        entry_point="minigrid.envs:LavaGapEnv",
+        entry_point="my_minigrid.envs:LavaGapEnv",
         kwargs={"size": 6},
     )
 
     register(
         id="MiniGrid-LavaGapS7-v0",
-        entry_point="minigrid.envs:LavaGapEnv",
+        entry_point="my_minigrid.envs:LavaGapEnv",
         kwargs={"size": 7},
     )
 
@@ -324,7 +327,7 @@ def register_minigrid_envs():
 
     register(
         id="MiniGrid-LockedRoom-v0",
-        entry_point="minigrid.envs:LockedRoomEnv",
+        entry_point="my_minigrid.envs:LockedRoomEnv",
     )
 
     # Memory
@@ -332,37 +335,37 @@ def register_minigrid_envs():
 
     register(
         id="MiniGrid-MemoryS17Random-v0",
-        entry_point="minigrid.envs:MemoryEnv",
+        entry_point="my_minigrid.envs:MemoryEnv",
         kwargs={"size": 17, "random_length": True},
     )
 
     register(
         id="MiniGrid-MemoryS13Random-v0",
-        entry_point="minigrid.envs:MemoryEnv",
+        entry_point="my_minigrid.envs:MemoryEnv",
         kwargs={"size": 13, "random_length": True},
     )
 
     register(
         id="MiniGrid-MemoryS13-v0",
-        entry_point="minigrid.envs:MemoryEnv",
+        entry_point="my_minigrid.envs:MemoryEnv",
         kwargs={"size": 13},
     )
 
     register(
         id="MiniGrid-MemoryS11-v0",
-        entry_point="minigrid.envs:MemoryEnv",
+        entry_point="my_minigrid.envs:MemoryEnv",
         kwargs={"size": 11},
     )
 
     register(
         id="MiniGrid-MemoryS9-v0",
-        entry_point="minigrid.envs:MemoryEnv",
+        entry_point="my_minigrid.envs:MemoryEnv",
         kwargs={"size": 9},
     )
 
     register(
         id="MiniGrid-MemoryS7-v0",
-        entry_point="minigrid.envs:MemoryEnv",
+        entry_point="my_minigrid.envs:MemoryEnv",
         kwargs={"size": 7},
     )
 
@@ -371,19 +374,25 @@ def register_minigrid_envs():
 
     register(
         id="MiniGrid-MultiRoom-N2-S4-v0",
-        entry_point="minigrid.envs:MultiRoomEnv",
+        entry_point="my_minigrid.envs:MultiRoomEnv",
         kwargs={"minNumRooms": 2, "maxNumRooms": 2, "maxRoomSize": 4},
     )
 
     register(
         id="MiniGrid-MultiRoom-N4-S5-v0",
-        entry_point="minigrid.envs:MultiRoomEnv",
+        entry_point="my_minigrid.envs:MultiRoomEnv",
         kwargs={"minNumRooms": 6, "maxNumRooms": 6, "maxRoomSize": 5},
     )
 
+    register(
+        id="MiniGrid-MultiRoom-N4-S5-v1",
+        entry_point="my_minigrid.envs:MultiRoomEnv",
+        kwargs={"minNumRooms": 4, "maxNumRooms": 4, "maxRoomSize": 5},
+    )
+
     register(
         id="MiniGrid-MultiRoom-N6-v0",
-        entry_point="minigrid.envs:MultiRoomEnv",
+        entry_point="my_minigrid.envs:MultiRoomEnv",
         kwargs={"minNumRooms": 6, "maxNumRooms": 6},
     )
 
@@ -392,24 +401,24 @@ def register_minigrid_envs():
 
     register(
         id="MiniGrid-ObstructedMaze-1Dl-v0",
-        entry_point="minigrid.envs:ObstructedMaze_1Dlhb",
+        entry_point="my_minigrid.envs:ObstructedMaze_1Dlhb",
         kwargs={"key_in_box": False, "blocked": False},
     )
 
     register(
         id="MiniGrid-ObstructedMaze-1Dlh-v0",
-        entry_point="minigrid.envs:ObstructedMaze_1Dlhb",
+        entry_point="my_minigrid.envs:ObstructedMaze_1Dlhb",
         kwargs={"key_in_box": True, "blocked": False},
     )
 
     register(
         id="MiniGrid-ObstructedMaze-1Dlhb-v0",
-        entry_point="minigrid.envs:ObstructedMaze_1Dlhb",
+        entry_point="my_minigrid.envs:ObstructedMaze_1Dlhb",
     )
 
     register(
         id="MiniGrid-ObstructedMaze-2Dl-v0",
-        entry_point="minigrid.envs:ObstructedMaze_Full",
+        entry_point="my_minigrid.envs:ObstructedMaze_Full",
         kwargs={
             "agent_room": (2, 1),
             "key_in_box": False,
@@ -421,7 +430,7 @@ def register_minigrid_envs():
 
     register(
         id="MiniGrid-ObstructedMaze-2Dlh-v0",
-        entry_point="minigrid.envs:ObstructedMaze_Full",
+        entry_point="my_minigrid.envs:ObstructedMaze_Full",
         kwargs={
             "agent_room": (2, 1),
             "key_in_box": True,
@@ -433,7 +442,7 @@ def register_minigrid_envs():
 
     register(
         id="MiniGrid-ObstructedMaze-2Dlhb-v0",
-        entry_point="minigrid.envs:ObstructedMaze_Full",
+        entry_point="my_minigrid.envs:ObstructedMaze_Full",
         kwargs={
             "agent_room": (2, 1),
             "key_in_box": True,
@@ -445,7 +454,7 @@ def register_minigrid_envs():
 
     register(
         id="MiniGrid-ObstructedMaze-1Q-v0",
-        entry_point="minigrid.envs:ObstructedMaze_Full",
+        entry_point="my_minigrid.envs:ObstructedMaze_Full",
         kwargs={
             "agent_room": (1, 1),
             "key_in_box": True,
@@ -457,7 +466,7 @@ def register_minigrid_envs():
 
     register(
         id="MiniGrid-ObstructedMaze-2Q-v0",
-        entry_point="minigrid.envs:ObstructedMaze_Full",
+        entry_point="my_minigrid.envs:ObstructedMaze_Full",
         kwargs={
             "agent_room": (2, 1),
             "key_in_box": True,
@@ -469,7 +478,7 @@ def register_minigrid_envs():
 
     register(
         id="MiniGrid-ObstructedMaze-Full-v0",
-        entry_point="minigrid.envs:ObstructedMaze_Full",
+        entry_point="my_minigrid.envs:ObstructedMaze_Full",
     )
 
     # ObstructedMaze-v1
@@ -477,7 +486,7 @@ def register_minigrid_envs():
 
     register(
         id="MiniGrid-ObstructedMaze-2Dlhb-v1",
-        entry_point="minigrid.envs.obstructedmaze_v1:ObstructedMaze_Full",
+        entry_point="my_minigrid.envs.obstructedmaze_v1:ObstructedMaze_Full",
         kwargs={
             "agent_room": (2, 1),
             "key_in_box": True,
@@ -489,7 +498,7 @@ def register_minigrid_envs():
 
     register(
         id="MiniGrid-ObstructedMaze-1Q-v1",
-        entry_point="minigrid.envs.obstructedmaze_v1:ObstructedMaze_Full",
+        entry_point="my_minigrid.envs.obstructedmaze_v1:ObstructedMaze_Full",
         kwargs={
             "agent_room": (1, 1),
             "key_in_box": True,
@@ -501,7 +510,7 @@ def register_minigrid_envs():
 
     register(
         id="MiniGrid-ObstructedMaze-2Q-v1",
-        entry_point="minigrid.envs.obstructedmaze_v1:ObstructedMaze_Full",
+        entry_point="my_minigrid.envs.obstructedmaze_v1:ObstructedMaze_Full",
         kwargs={
             "agent_room": (2, 1),
             "key_in_box": True,
@@ -513,7 +522,7 @@ def register_minigrid_envs():
 
     register(
         id="MiniGrid-ObstructedMaze-Full-v1",
-        entry_point="minigrid.envs.obstructedmaze_v1:ObstructedMaze_Full",
+        entry_point="my_minigrid.envs.obstructedmaze_v1:ObstructedMaze_Full",
     )
 
     # Playground
@@ -521,7 +530,7 @@ def register_minigrid_envs():
 
     register(
         id="MiniGrid-Playground-v0",
-        entry_point="minigrid.envs:PlaygroundEnv",
+        entry_point="my_minigrid.envs:PlaygroundEnv",
     )
 
     # PutNear
@@ -529,12 +538,12 @@ def register_minigrid_envs():
 
     register(
         id="MiniGrid-PutNear-6x6-N2-v0",
-        entry_point="minigrid.envs:PutNearEnv",
+        entry_point="my_minigrid.envs:PutNearEnv",
     )
 
     register(
         id="MiniGrid-PutNear-8x8-N3-v0",
-        entry_point="minigrid.envs:PutNearEnv",
+        entry_point="my_minigrid.envs:PutNearEnv",
         kwargs={"size": 8, "numObjs": 3},
     )
 
@@ -543,26 +552,26 @@ def register_minigrid_envs():
 
     register(
         id="MiniGrid-RedBlueDoors-6x6-v0",
-        entry_point="minigrid.envs:RedBlueDoorEnv",
+        entry_point="my_minigrid.envs:RedBlueDoorEnv",
         kwargs={"size": 6},
     )
 
     register(
         id="MiniGrid-RedBlueDoors-8x8-v0",
-        entry_point="minigrid.envs:RedBlueDoorEnv",
+        entry_point="my_minigrid.envs:RedBlueDoorEnv",
     )
 
     # Unlock
     # ----------------------------------------
 
-    register(id="MiniGrid-Unlock-v0", entry_point="minigrid.envs:UnlockEnv")
+    register(id="MiniGrid-Unlock-v0", entry_point="my_minigrid.envs:UnlockEnv")
 
     # UnlockPickup
     # ----------------------------------------
 
     register(
         id="MiniGrid-UnlockPickup-v0",
-        entry_point="minigrid.envs:UnlockPickupEnv",
+        entry_point="my_minigrid.envs:UnlockPickupEnv",
     )
 
     # BabyAI - Language based levels - GoTo
@@ -570,202 +579,208 @@ def register_minigrid_envs():
 
     register(
         id="BabyAI-GoToRedBallGrey-v0",
-        entry_point="minigrid.envs.babyai:GoToRedBallGrey",
+        entry_point="my_minigrid.envs.babyai:GoToRedBallGrey",
     )
 
 
     register(
         id="BabyAI-GoToRedBall-v0",
-        entry_point="minigrid.envs.babyai:GoToRedBall",
+        entry_point="my_minigrid.envs.babyai:GoToRedBall",
     )
 
     register(
         id="BabyAI-GoToRedBallNoDists-v0",
-        entry_point="minigrid.envs.babyai:GoToRedBallNoDists",
+        entry_point="my_minigrid.envs.babyai:GoToRedBallNoDists",
     )
 
     register(
         id="BabyAI-GoToObj-v0",
-        entry_point="minigrid.envs.babyai:GoToObj",
+        entry_point="my_minigrid.envs.babyai:GoToObj",
     )
 
     register(
         id="BabyAI-GoToObjS4-v0",
-        entry_point="minigrid.envs.babyai:GoToObj",
+        entry_point="my_minigrid.envs.babyai:GoToObj",
         kwargs={"room_size": 4},
     )
 
     register(
         id="BabyAI-GoToObjS6-v0",
-        entry_point="minigrid.envs.babyai:GoToObj",
+        entry_point="my_minigrid.envs.babyai:GoToObj",
         kwargs={"room_size": 4},
     )
 
+    register(
+        id="BabyAI-GoToObjS6-v1",
+        entry_point="my_minigrid.envs.babyai:GoToObj",
+        kwargs={"room_size": 6},
+    )
+
     register(
         id="BabyAI-GoToLocal-v0",
-        entry_point="minigrid.envs.babyai:GoToLocal",
+        entry_point="my_minigrid.envs.babyai:GoToLocal",
     )
 
     register(
         id="BabyAI-GoToLocalS5N2-v0",
-        entry_point="minigrid.envs.babyai:GoToLocal",
+        entry_point="my_minigrid.envs.babyai:GoToLocal",
         kwargs={"room_size": 5, "num_dists": 2},
     )
 
     register(
         id="BabyAI-GoToLocalS6N2-v0",
-        entry_point="minigrid.envs.babyai:GoToLocal",
+        entry_point="my_minigrid.envs.babyai:GoToLocal",
         kwargs={"room_size": 6, "num_dists": 2},
     )
 
     register(
         id="BabyAI-GoToLocalS6N3-v0",
-        entry_point="minigrid.envs.babyai:GoToLocal",
+        entry_point="my_minigrid.envs.babyai:GoToLocal",
         kwargs={"room_size": 6, "num_dists": 3},
     )
 
     register(
         id="BabyAI-GoToLocalS6N4-v0",
-        entry_point="minigrid.envs.babyai:GoToLocal",
+        entry_point="my_minigrid.envs.babyai:GoToLocal",
         kwargs={"room_size": 6, "num_dists": 4},
     )
 
     register(
         id="BabyAI-GoToLocalS7N4-v0",
-        entry_point="minigrid.envs.babyai:GoToLocal",
+        entry_point="my_minigrid.envs.babyai:GoToLocal",
         kwargs={"room_size": 7, "num_dists": 4},
     )
 
     register(
         id="BabyAI-GoToLocalS7N5-v0",
-        entry_point="minigrid.envs.babyai:GoToLocal",
+        entry_point="my_minigrid.envs.babyai:GoToLocal",
         kwargs={"room_size": 7, "num_dists": 5},
     )
 
     register(
         id="BabyAI-GoToLocalS8N2-v0",
-        entry_point="minigrid.envs.babyai:GoToLocal",
+        entry_point="my_minigrid.envs.babyai:GoToLocal",
         kwargs={"room_size": 8, "num_dists": 2},
     )
 
     register(
         id="BabyAI-GoToLocalS8N3-v0",
-        entry_point="minigrid.envs.babyai:GoToLocal",
+        entry_point="my_minigrid.envs.babyai:GoToLocal",
         kwargs={"room_size": 8, "num_dists": 3},
     )
 
     register(
         id="BabyAI-GoToLocalS8N4-v0",
-        entry_point="minigrid.envs.babyai:GoToLocal",
+        entry_point="my_minigrid.envs.babyai:GoToLocal",
         kwargs={"room_size": 8, "num_dists": 4},
     )
 
     register(
         id="BabyAI-GoToLocalS8N5-v0",
-        entry_point="minigrid.envs.babyai:GoToLocal",
+        entry_point="my_minigrid.envs.babyai:GoToLocal",
         kwargs={"room_size": 8, "num_dists": 5},
     )
 
     register(
         id="BabyAI-GoToLocalS8N6-v0",
-        entry_point="minigrid.envs.babyai:GoToLocal",
+        entry_point="my_minigrid.envs.babyai:GoToLocal",
         kwargs={"room_size": 8, "num_dists": 6},
     )
 
     register(
         id="BabyAI-GoToLocalS8N7-v0",
-        entry_point="minigrid.envs.babyai:GoToLocal",
+        entry_point="my_minigrid.envs.babyai:GoToLocal",
         kwargs={"room_size": 8, "num_dists": 7},
     )
 
     register(
         id="BabyAI-GoToLocalS16N14-v0",
-        entry_point="minigrid.envs.babyai:GoToLocal",
+        entry_point="my_minigrid.envs.babyai:GoToLocal",
         kwargs={"room_size": 16, "num_dists": 14},
     )
 
     register(
         id="BabyAI-GoTo-v0",
-        entry_point="minigrid.envs.babyai:GoTo",
+        entry_point="my_minigrid.envs.babyai:GoTo",
     )
 
     register(
         "BabyAI-GoToOpen-v0",
-        entry_point="minigrid.envs.babyai:GoTo",
+        entry_point="my_minigrid.envs.babyai:GoTo",
         kwargs={"doors_open": True},
     )
 
     register(
         id="BabyAI-GoToObjMaze-v0",
-        entry_point="minigrid.envs.babyai:GoTo",
+        entry_point="my_minigrid.envs.babyai:GoTo",
         kwargs={"num_dists": 1, "doors_open": False},
     )
 
     register(
         id="BabyAI-GoToObjMazeOpen-v0",
-        entry_point="minigrid.envs.babyai:GoTo",
+        entry_point="my_minigrid.envs.babyai:GoTo",
         kwargs={"num_dists": 1, "doors_open": True},
     )
 
     register(
         id="BabyAI-GoToObjMazeS4R2-v0",
-        entry_point="minigrid.envs.babyai:GoTo",
+        entry_point="my_minigrid.envs.babyai:GoTo",
         kwargs={"num_dists": 1, "room_size": 4, "num_rows": 2, "num_cols": 2},
     )
 
     register(
         id="BabyAI-GoToObjMazeS4-v0",
-        entry_point="minigrid.envs.babyai:GoTo",
+        entry_point="my_minigrid.envs.babyai:GoTo",
         kwargs={"num_dists": 1, "room_size": 4},
     )
 
     register(
         id="BabyAI-GoToObjMazeS5-v0",
-        entry_point="minigrid.envs.babyai:GoTo",
+        entry_point="my_minigrid.envs.babyai:GoTo",
         kwargs={"num_dists": 1, "room_size": 5},
     )
 
     register(
         id="BabyAI-GoToObjMazeS6-v0",
-        entry_point="minigrid.envs.babyai:GoTo",
+        entry_point="my_minigrid.envs.babyai:GoTo",
         kwargs={"num_dists": 1, "room_size": 6},
     )
 
     register(
         id="BabyAI-GoToObjMazeS7-v0",
-        entry_point="minigrid.envs.babyai:GoTo",
+        entry_point="my_minigrid.envs.babyai:GoTo",
         kwargs={"num_dists": 1, "room_size": 7},
     )
 
     register(
         id="BabyAI-GoToImpUnlock-v0",
-        entry_point="minigrid.envs.babyai:GoToImpUnlock",
+        entry_point="my_minigrid.envs.babyai:GoToImpUnlock",
     )
 
     register(
         id="BabyAI-GoToSeq-v0",
-        entry_point="minigrid.envs.babyai:GoToSeq",
+        entry_point="my_minigrid.envs.babyai:GoToSeq",
     )
 
     register(
         id="BabyAI-GoToSeqS5R2-v0",
-        entry_point="minigrid.envs.babyai:GoToSeq",
+        entry_point="my_minigrid.envs.babyai:GoToSeq",
         kwargs={"room_size": 5, "num_rows": 2, "num_cols": 2, "num_dists": 4},
     )
 
     register(
         id="BabyAI-GoToRedBlueBall-v0",
-        entry_point="minigrid.envs.babyai:GoToRedBlueBall",
+        entry_point="my_minigrid.envs.babyai:GoToRedBlueBall",
     )
 
     register(
         id="BabyAI-GoToDoor-v0",
-        entry_point="minigrid.envs.babyai:GoToDoor",
+        entry_point="my_minigrid.envs.babyai:GoToDoor",
     )
 
     register(
         id="BabyAI-GoToObjDoor-v0",
-        entry_point="minigrid.envs.babyai:GoToObjDoor",
+        entry_point="my_minigrid.envs.babyai:GoToObjDoor",
     )
 
     # BabyAI - Language based levels - Open
@@ -773,51 +788,51 @@ def register_minigrid_envs():
 
     register(
         id="BabyAI-Open-v0",
-        entry_point="minigrid.envs.babyai:Open",
+        entry_point="my_minigrid.envs.babyai:Open",
     )
 
     register(
         id="BabyAI-OpenRedDoor-v0",
-        entry_point="minigrid.envs.babyai:OpenRedDoor",
+        entry_point="my_minigrid.envs.babyai:OpenRedDoor",
     )
 
     register(
         id="BabyAI-OpenDoor-v0",
-        entry_point="minigrid.envs.babyai:OpenDoor",
+        entry_point="my_minigrid.envs.babyai:OpenDoor",
     )
 
     register(
         id="BabyAI-OpenDoorDebug-v0",
-        entry_point="minigrid.envs.babyai:OpenDoor",
+        entry_point="my_minigrid.envs.babyai:OpenDoor",
         kwargs={"debug": True, "select_by": None},
     )
 
     register(
         id="BabyAI-OpenDoorColor-v0",
-        entry_point="minigrid.envs.babyai:OpenDoor",
+        entry_point="my_minigrid.envs.babyai:OpenDoor",
         kwargs={"select_by": "color"},
     )
 
     register(
         id="BabyAI-OpenDoorLoc-v0",
-        entry_point="minigrid.envs.babyai:OpenDoor",
+        entry_point="my_minigrid.envs.babyai:OpenDoor",
         kwargs={"select_by": "loc"},
     )
 
     register(
         id="BabyAI-OpenTwoDoors-v0",
-        entry_point="minigrid.envs.babyai:OpenTwoDoors",
+        entry_point="my_minigrid.envs.babyai:OpenTwoDoors",
     )
 
     register(
         id="BabyAI-OpenRedBlueDoors-v0",
-        entry_point="minigrid.envs.babyai:OpenTwoDoors",
+        entry_point="my_minigrid.envs.babyai:OpenTwoDoors",
         kwargs={"first_color": "red", "second_color": "blue"},
     )
 
     register(
         id="BabyAI-OpenRedBlueDoorsDebug-v0",
-        entry_point="minigrid.envs.babyai:OpenTwoDoors",
+        entry_point="my_minigrid.envs.babyai:OpenTwoDoors",
         kwargs={
             "first_color": "red",
             "second_color": "blue",
@@ -827,25 +842,25 @@ def register_minigrid_envs():
 
     register(
         id="BabyAI-OpenDoorsOrderN2-v0",
-        entry_point="minigrid.envs.babyai:OpenDoorsOrder",
+        entry_point="my_minigrid.envs.babyai:OpenDoorsOrder",
         kwargs={"num_doors": 2},
     )
 
     register(
         id="BabyAI-OpenDoorsOrderN4-v0",
-        entry_point="minigrid.envs.babyai:OpenDoorsOrder",
+        entry_point="my_minigrid.envs.babyai:OpenDoorsOrder",
         kwargs={"num_doors": 4},
     )
 
     register(
         id="BabyAI-OpenDoorsOrderN2Debug-v0",
-        entry_point="minigrid.envs.babyai:OpenDoorsOrder",
+        entry_point="my_minigrid.envs.babyai:OpenDoorsOrder",
         kwargs={"debug": True, "num_doors": 2},
     )
 
     register(
         id="BabyAI-OpenDoorsOrderN4Debug-v0",
-        entry_point="minigrid.envs.babyai:OpenDoorsOrder",
+        entry_point="my_minigrid.envs.babyai:OpenDoorsOrder",
         kwargs={"debug": True, "num_doors": 4},
     )
 
@@ -854,33 +869,34 @@ def register_minigrid_envs():
 
     register(
         id="BabyAI-Pickup-v0",
-        entry_point="minigrid.envs.babyai:Pickup",
+        entry_point="my_minigrid.envs.babyai:Pickup",
     )
 
     register(
         id="BabyAI-UnblockPickup-v0",
-        entry_point="minigrid.envs.babyai:UnblockPickup",
+        entry_point="my_minigrid.envs.babyai:UnblockPickup",
     )
 
     register(
         id="BabyAI-PickupLoc-v0",
-        entry_point="minigrid.envs.babyai:PickupLoc",
+        entry_point="my_minigrid.envs.babyai:PickupLoc",
+        kwargs={"num_dists": 8},
     )
 
     register(
         id="BabyAI-PickupDist-v0",
-        entry_point="minigrid.envs.babyai:PickupDist",
+        entry_point="my_minigrid.envs.babyai:PickupDist",
     )
 
     register(
         id="BabyAI-PickupDistDebug-v0",
-        entry_point="minigrid.envs.babyai:PickupDist",
+        entry_point="my_minigrid.envs.babyai:PickupDist",
         kwargs={"debug": True},
     )
 
     register(
         id="BabyAI-PickupAbove-v0",
-        entry_point="minigrid.envs.babyai:PickupAbove",
+        entry_point="my_minigrid.envs.babyai:PickupAbove",
     )
 
     # BabyAI - Language based levels - PutNext
@@ -888,66 +904,66 @@ def register_minigrid_envs():
 
     register(
         id="BabyAI-PutNextLocal-v0",
-        entry_point="minigrid.envs.babyai:PutNextLocal",
+        entry_point="my_minigrid.envs.babyai:PutNextLocal",
     )
 
     register(
         id="BabyAI-PutNextLocalS5N3-v0",
-        entry_point="minigrid.envs.babyai:PutNextLocal",
+        entry_point="my_minigrid.envs.babyai:PutNextLocal",
         kwargs={"room_size": 5, "num_objs": 3},
     )
 
     register(
         id="BabyAI-PutNextLocalS6N4-v0",
-        entry_point="minigrid.envs.babyai:PutNextLocal",
+        entry_point="my_minigrid.envs.babyai:PutNextLocal",
         kwargs={"room_size": 6, "num_objs": 4},
     )
 
     register(
         id="BabyAI-PutNextS4N1-v0",
-        entry_point="minigrid.envs.babyai:PutNext",
+        entry_point="my_minigrid.envs.babyai:PutNext",
         kwargs={"room_size": 4, "objs_per_room": 1},
     )
 
     register(
         id="BabyAI-PutNextS5N2-v0",
-        entry_point="minigrid.envs.babyai:PutNext",
+        entry_point="my_minigrid.envs.babyai:PutNext",
         kwargs={"room_size": 5, "objs_per_room": 2},
     )
 
     register(
         id="BabyAI-PutNextS5N1-v0",
-        entry_point="minigrid.envs.babyai:PutNext",
+        entry_point="my_minigrid.envs.babyai:PutNext",
         kwargs={"room_size": 5, "objs_per_room": 1},
     )
 
     register(
         id="BabyAI-PutNextS6N3-v0",
-        entry_point="minigrid.envs.babyai:PutNext",
+        entry_point="my_minigrid.envs.babyai:PutNext",
         kwargs={"room_size": 6, "objs_per_room": 3},
     )
 
     register(
         id="BabyAI-PutNextS7N4-v0",
-        entry_point="minigrid.envs.babyai:PutNext",
+        entry_point="my_minigrid.envs.babyai:PutNext",
         kwargs={"room_size": 7, "objs_per_room": 4},
     )
 
     register(
         id="BabyAI-PutNextS5N2Carrying-v0",
-        entry_point="minigrid.envs.babyai:PutNext",
+        entry_point="my_minigrid.envs.babyai:PutNext",
         kwargs={"room_size": 5, "objs_per_room": 2, "start_carrying": True},
     )
 
     register(
         id="BabyAI-PutNextS6N3Carrying-v0",
-        entry_point="minigrid.envs.babyai:PutNext",
+        entry_point="my_minigrid.envs.babyai:PutNext",
         kwargs={"room_size": 6, "objs_per_room": 3, "start_carrying": True},
     )
 
     register(
         id="BabyAI-PutNextS7N4Carrying-v0",
-        entry_point="minigrid.envs.babyai:PutNext",
+        entry_point="my_minigrid.envs.babyai:PutNext",
         kwargs={"room_size": 7, "objs_per_room": 4, "start_carrying": True},
     )
 
@@ -956,44 +972,44 @@ def register_minigrid_envs():
 
     register(
         id="BabyAI-Unlock-v0",
-        entry_point="minigrid.envs.babyai:Unlock",
+        entry_point="my_minigrid.envs.babyai:Unlock",
     )
 
     register(
         id="BabyAI-UnlockLocal-v0",
-        entry_point="minigrid.envs.babyai:UnlockLocal",
+        entry_point="my_minigrid.envs.babyai:UnlockLocal",
     )
 
     register(
         id="BabyAI-UnlockLocalDist-v0",
-        entry_point="minigrid.envs.babyai:UnlockLocal",
+        entry_point="my_minigrid.envs.babyai:UnlockLocal",
         kwargs={"distractors": True},
     )
 
     register(
         id="BabyAI-KeyInBox-v0",
-        entry_point="minigrid.envs.babyai:KeyInBox",
+        entry_point="my_minigrid.envs.babyai:KeyInBox",
     )
 
     register(
         id="BabyAI-UnlockPickup-v0",
-        entry_point="minigrid.envs.babyai:UnlockPickup",
+        entry_point="my_minigrid.envs.babyai:UnlockPickup",
     )
 
     register(
         id="BabyAI-UnlockPickupDist-v0",
-        entry_point="minigrid.envs.babyai:UnlockPickup",
+        entry_point="my_minigrid.envs.babyai:UnlockPickup",
         kwargs={"distractors": True},
     )
 
     register(
         id="BabyAI-BlockedUnlockPickup-v0",
-        entry_point="minigrid.envs.babyai:BlockedUnlockPickup",
+        entry_point="my_minigrid.envs.babyai:BlockedUnlockPickup",
     )
 
     register(
         id="BabyAI-UnlockToUnlock-v0",
-        entry_point="minigrid.envs.babyai:UnlockToUnlock",
+        entry_point="my_minigrid.envs.babyai:UnlockToUnlock",
     )
 
     # BabyAI - Language based levels - Other
@@ -1001,99 +1017,99 @@ def register_minigrid_envs():
 
     register(
         id="BabyAI-ActionObjDoor-v0",
-        entry_point="minigrid.envs.babyai:ActionObjDoor",
+        entry_point="my_minigrid.envs.babyai:ActionObjDoor",
     )
 
     register(
         id="BabyAI-FindObjS5-v0",
-        entry_point="minigrid.envs.babyai:FindObjS5",
+        entry_point="my_minigrid.envs.babyai:FindObjS5",
     )
 
     register(
         id="BabyAI-FindObjS6-v0",
-        entry_point="minigrid.envs.babyai:FindObjS5",
+        entry_point="my_minigrid.envs.babyai:FindObjS5",
         kwargs={"room_size": 6},
     )
 
     register(
         id="BabyAI-FindObjS7-v0",
-        entry_point="minigrid.envs.babyai:FindObjS5",
+        entry_point="my_minigrid.envs.babyai:FindObjS5",
         kwargs={"room_size": 7},
     )
 
     register(
         id="BabyAI-KeyCorridor-v0",
-        entry_point="minigrid.envs.babyai:KeyCorridor",
+        entry_point="my_minigrid.envs.babyai:KeyCorridor",
     )
 
     register(
         id="BabyAI-KeyCorridorS3R1-v0",
-        entry_point="minigrid.envs.babyai:KeyCorridor",
+        entry_point="my_minigrid.envs.babyai:KeyCorridor",
         kwargs={"room_size": 3, "num_rows": 1},
     )
 
     register(
         id="BabyAI-KeyCorridorS3R2-v0",
-        entry_point="minigrid.envs.babyai:KeyCorridor",
+        entry_point="my_minigrid.envs.babyai:KeyCorridor",
         kwargs={"room_size": 3, "num_rows": 2},
     )
 
     register(
         id="BabyAI-KeyCorridorS3R3-v0",
-        entry_point="minigrid.envs.babyai:KeyCorridor",
+        entry_point="my_minigrid.envs.babyai:KeyCorridor",
         kwargs={"room_size": 3, "num_rows": 3},
     )
 
     register(
         id="BabyAI-KeyCorridorS4R3-v0",
-        entry_point="minigrid.envs.babyai:KeyCorridor",
+        entry_point="my_minigrid.envs.babyai:KeyCorridor",
         kwargs={"room_size": 4, "num_rows": 3},
     )
 
     register(
         id="BabyAI-KeyCorridorS5R3-v0",
-        entry_point="minigrid.envs.babyai:KeyCorridor",
+        entry_point="my_minigrid.envs.babyai:KeyCorridor",
         kwargs={"room_size": 5, "num_rows": 3},
     )
 
     register(
         id="BabyAI-KeyCorridorS6R3-v0",
-        entry_point="minigrid.envs.babyai:KeyCorridor",
+        entry_point="my_minigrid.envs.babyai:KeyCorridor",
         kwargs={"room_size": 6, "num_rows": 3},
     )
 
     register(
         id="BabyAI-OneRoomS8-v0",
-        entry_point="minigrid.envs.babyai:OneRoomS8",
+        entry_point="my_minigrid.envs.babyai:OneRoomS8",
     )
 
     register(
         id="BabyAI-OneRoomS12-v0",
-        entry_point="minigrid.envs.babyai:OneRoomS8",
+        entry_point="my_minigrid.envs.babyai:OneRoomS8",
         kwargs={"room_size": 12},
     )
 
     register(
         id="BabyAI-OneRoomS16-v0",
-        entry_point="minigrid.envs.babyai:OneRoomS8",
+        entry_point="my_minigrid.envs.babyai:OneRoomS8",
         kwargs={"room_size": 16},
     )
 
     register(
         id="BabyAI-OneRoomS20-v0",
-        entry_point="minigrid.envs.babyai:OneRoomS8",
+        entry_point="my_minigrid.envs.babyai:OneRoomS8",
         kwargs={"room_size": 20},
     )
 
     register(
         id="BabyAI-MoveTwoAcrossS5N2-v0",
-        entry_point="minigrid.envs.babyai:MoveTwoAcross",
+        entry_point="my_minigrid.envs.babyai:MoveTwoAcross",
         kwargs={"room_size": 5, "objs_per_room": 2},
     )
 
     register(
         id="BabyAI-MoveTwoAcrossS8N9-v0",
-        entry_point="minigrid.envs.babyai:MoveTwoAcross",
+        entry_point="my_minigrid.envs.babyai:MoveTwoAcross",
         kwargs={"room_size": 8, "objs_per_room": 9},
     )
 
@@ -1102,40 +1118,47 @@ def register_minigrid_envs():
 
     register(
         id="BabyAI-Synth-v0",
-        entry_point="minigrid.envs.babyai:Synth",
+        entry_point="my_minigrid.envs.babyai:Synth",
     )
 
     register(
         id="BabyAI-SynthS5R2-v0",
-        entry_point="minigrid.envs.babyai:Synth",
+        entry_point="my_minigrid.envs.babyai:Synth",
         kwargs={"room_size": 5, "num_rows": 2},
     )
 
     register(
         id="BabyAI-SynthLoc-v0",
-        entry_point="minigrid.envs.babyai:SynthLoc",
+        entry_point="my_minigrid.envs.babyai:SynthLoc",
     )
 
     register(
         id="BabyAI-SynthSeq-v0",
-        entry_point="minigrid.envs.babyai:SynthSeq",
+        entry_point="my_minigrid.envs.babyai:SynthSeq",
     )
 
     register(
         id="BabyAI-MiniBossLevel-v0",
-        entry_point="minigrid.envs.babyai:MiniBossLevel",
+        entry_point="my_minigrid.envs.babyai:MiniBossLevel",
     )
 
     register(
         id="BabyAI-BossLevel-v0",
-        entry_point="minigrid.envs.babyai:BossLevel",
+        entry_point="my_minigrid.envs.babyai:BossLevel",
     )
 
     register(
         id="BabyAI-BossLevelNoUnlock-v0",
-        entry_point="minigrid.envs.babyai:BossLevelNoUnlock",
+        entry_point="my_minigrid.envs.babyai:BossLevelNoUnlock",
     )
 
+
+# The ids of the installed minigrid package are registered again, on the
+# environments of my_minigrid
+with warnings.catch_warnings():
+    warnings.filterwarnings("ignore", message=".*Overriding environment")
+    register_minigrid_envs()
+
 register(
     id="BabyAI-GoToRedBallGrey-v1",
     entry_point="my_minigrid.envs.babyai:GoToRedBallGrey",
@@ -1,13 +1,29 @@
 from __future__ import annotations
 
 import math
+import os
+import tempfile
+from collections import OrderedDict
 from typing import Any, Callable
 
 import numpy as np
 
-from minigrid.core.constants import OBJECT_TO_IDX, TILE_PIXELS
-from minigrid.core.world_object import Wall, WorldObj
-from minigrid.utils.rendering import (
+from my_minigrid.core.constants import (
+    COLOR_NAMES,
+    COLOR_TO_IDX,
+    OBJECT_TO_IDX,
+    STATE_TO_IDX,
+    TILE_PIXELS,
+)
+from my_minigrid.core.view import (
+    EMPTY_ENCODING,
+    WALL_ENCODING,
+    opaque,
+    process_vis_single,
+)
+from my_minigrid.core.world_object import Wall, WorldObj, shared_factory
+from my_minigrid.core.zobrist import cell_code, hash_grids, zobrist_keys
+from my_minigrid.utils.rendering import (
     downsample,
     fill_coords,
     highlight_img,
@@ -20,10 +36,26 @@ from minigrid.utils.rendering import (
 class Grid:
     """
     Represent a grid and operations on it
+
+    Alongside the list of objects, the grid keeps its (width, height, 3)
+    encoding up to date: cells are encoded when set, and objects notify
+    the cell holding them when their state changes (e.g. a door is opened).
+    The grids returned by `slice` and `rotate_left` share the objects but
+    not this ownership: their encoding is a snapshot.
+
+    Once computed by `zobrist_hash`, the Zobrist hash of the encoding is
+    updated along with each cell.
     """
 
-    # Static cache of pre-renderer tiles
-    tile_cache: dict[tuple[Any, ...], Any] = {}
+    # Atlases of all the tiles, by tile size (see `prewarm_tiles`), with
+    # the least recently used ones dropped past `tile_atlases_size` sizes
+    tile_atlases: OrderedDict[int, TileAtlas] = OrderedDict()
+    tile_atlases_size: int = 4
+
+    # Static cache of pre-renderer tiles missing from the atlases, with the
+    # least recently used ones evicted past `tile_cache_size` tiles
+    tile_cache: OrderedDict[tuple[Any, ...], Any] = OrderedDict()
+    tile_cache_size: int = 2048
 
     def __init__(self, width: int, height: int):
         assert width >= 3
@@ -34,6 +66,12 @@ class Grid:
 
         self.grid: list[WorldObj | None] = [None] * (width * height)
 
+        self.encoding = np.zeros((width, height, 3), dtype=np.uint8)
+        self.encoding[:, :] = EMPTY_ENCODING
+
+        # Zobrist hash of the encoding, None until computed
+        self.zobrist: int | None = None
+
     def __contains__(self, key: Any) -> bool:
         if isinstance(key, WorldObj):
             for e in self.grid:
@@ -50,17 +88,36 @@ class Grid:
         return False
 
     def __eq__(self, other: Grid) -> bool:
-        grid1 = self.encode()
-        grid2 = other.encode()
-        return np.array_equal(grid2, grid1)
+        return np.array_equal(self.encoding, other.encoding)
 
     def __ne__(self, other: Grid) -> bool:
         return not self == other
 
     def copy(self) -> Grid:
-        from copy import deepcopy
+        """
+        Copy of the grid and of its objects, like `deepcopy` but only going
+        through the objects of the cells. Shared objects stay shared.
+        """
+
+        grid = Grid.__new__(Grid)
+        grid.width = self.width
+        grid.height = self.height
+        grid.encoding = self.encoding.copy()
+        grid.zobrist = self.zobrist
+
+        copies: dict[int, WorldObj] = {}
+        grid.grid = [None] * len(self.grid)
+        for k, v in enumerate(self.grid):
+            if v is None:
+                continue
+            obj = copies.get(id(v))
+            if obj is None:
+                obj = copies[id(v)] = v.copy()
+            if obj.owner is None and not obj.is_shared:
+                obj.owner = (grid, k % self.width, k // self.width)
+            grid.grid[k] = obj
 
-        return deepcopy(self)
+        return grid
 
     def set(self, i: int, j: int, v: WorldObj | None):
         assert (
@@ -69,8 +126,51 @@ class Grid:
         assert (
             0 <= j < self.height
         ), f"row index {j} outside of grid of height {self.height}"
+
+        # The object leaving the cell may already have been set in another
+        # cell, which then owns it
+        old = self.grid[j * self.width + i]
+        if old is not None and self._owns(old, i, j):
+            old.owner = None
+
         self.grid[j * self.width + i] = v
 
+        if v is None:
+            self.encode_cell(i, j, EMPTY_ENCODING)
+        else:
+            if v._shared_args is None:
+                v.owner = (self, i, j)
+            self.encode_cell(i, j, v.encode())
+
+    def _owns(self, obj: WorldObj, i: int, j: int) -> bool:
+        """
+        Whether the encoding of the cell (i, j) of this grid follows `obj`
+        """
+
+        owner = obj.owner
+        return owner is not None and owner[0] is self and owner[1] == i and owner[2] == j
+
+    def encode_cell(self, i: int, j: int, encoding: tuple[int, int, int]):
+        """
+        Update the encoding of a cell, and the hash of the grid
+        """
+
+        if self.zobrist is not None:
+            cell_keys, _ = zobrist_keys(self.width, self.height)
+            self.zobrist ^= cell_keys.item(i, j, cell_code(self.encoding[i, j]))
+            self.zobrist ^= cell_keys.item(i, j, cell_code(encoding))
+
+        self.encoding[i, j] = encoding
+
+    def zobrist_hash(self) -> int:
+        """
+        64-bit Zobrist hash of the encoding of the grid
+        """
+
+        if self.zobrist is None:
+            self.zobrist = int(hash_grids(self.encoding[None])[0])
+        return self.zobrist
+
     def get(self, i: int, j: int) -> WorldObj | None:
         assert 0 <= i < self.width
         assert 0 <= j < self.height
@@ -86,6 +186,7 @@ class Grid:
     ):
         if length is None:
             length = self.width - x
+        obj_type = shared_factory(obj_type)
         for i in range(0, length):
             self.set(x + i, y, obj_type())
 
@@ -98,6 +199,7 @@ class Grid:
     ):
         if length is None:
             length = self.height - y
+        obj_type = shared_factory(obj_type)
         for j in range(0, length):
             self.set(x, y + j, obj_type())
 
@@ -114,10 +216,12 @@ class Grid:
 
         grid = Grid(self.height, self.width)
 
-        for i in range(self.width):
-            for j in range(self.height):
-                v = self.get(i, j)
-                grid.set(j, grid.height - 1 - i, v)
+        # Cell (i, j) goes to (j, width - 1 - i)
+        grid.encoding = np.ascontiguousarray(self.encoding.transpose(1, 0, 2)[:, ::-1])
+
+        objects = np.empty(len(self.grid), dtype=object)
+        objects[:] = self.grid
+        grid.grid = objects.reshape(self.height, self.width).T[::-1].ravel().tolist()
 
         return grid
 
@@ -128,17 +232,26 @@ class Grid:
 
         grid = Grid(width, height)
 
-        for j in range(0, height):
-            for i in range(0, width):
-                x = topX + i
-                y = topY + j
-
-                if 0 <= x < self.width and 0 <= y < self.height:
-                    v = self.get(x, y)
-                else:
-                    v = Wall()
-
-                grid.set(i, j, v)
+        # Cells outside of the grid are walls
+        grid.encoding[:, :] = WALL_ENCODING
+        x0, x1 = max(topX, 0), min(topX + width, self.width)
+        y0, y1 = max(topY, 0), min(topY + height, self.height)
+        if x0 < x1 and y0 < y1:
+            grid.encoding[x0 - topX : x1 - topX, y0 - topY : y1 - topY] = self.encoding[
+                x0:x1, y0:y1
+            ]
+
+        xs = np.arange(topX, topX + width)
+        ys = np.arange(topY, topY + height)
+        inside = ((0 <= ys) & (ys < self.height))[:, None] & (
+            (0 <= xs) & (xs < self.width)
+        )[None, :]
+        index = np.where(inside, ys[:, None] * self.width + xs[None, :], len(self.grid))
+
+        objects = np.empty(len(self.grid) + 1, dtype=object)
+        objects[:-1] = self.grid
+        objects[-1] = Wall.shared()
+        grid.grid = objects[index].ravel().tolist()
 
         return grid
 
@@ -155,13 +268,42 @@ class Grid:
         Render a tile and cache the result
         """
 
+        atlas = cls.tile_atlases.get(tile_size)
+        if atlas is not None and subdivs == atlas.subdivs:
+            encoding = obj.encode() if obj else tuple(EMPTY_ENCODING)
+            index = atlas.tile_index(encoding, agent_dir, highlight)
+            if index >= 0:
+                return atlas.tiles[index]
+
         # Hash map lookup key for the cache
         key: tuple[Any, ...] = (agent_dir, highlight, tile_size)
         key = obj.encode() + key if obj else key
 
         if key in cls.tile_cache:
+            cls.tile_cache.move_to_end(key)
             return cls.tile_cache[key]
 
+        img = cls.draw_tile(obj, agent_dir, highlight, tile_size, subdivs)
+
+        # Cache the rendered tile
+        cls.tile_cache[key] = img
+        if len(cls.tile_cache) > cls.tile_cache_size:
+            cls.tile_cache.popitem(last=False)
+
+        return img
+
+    @staticmethod
+    def draw_tile(
+        obj: WorldObj | None,
+        agent_dir: int | None = None,
+        highlight: bool = False,
+        tile_size: int = TILE_PIXELS,
+        subdivs: int = 3,
+    ) -> np.ndarray:
+        """
+        Render a tile, without caching
+        """
+
         img = np.zeros(
             shape=(tile_size * subdivs, tile_size * subdivs, 3), dtype=np.uint8
         )
@@ -192,11 +334,44 @@ class Grid:
         # Downsample the image to perform supersampling/anti-aliasing
         img = downsample(img, subdivs)
 
-        # Cache the rendered tile
-        cls.tile_cache[key] = img
-
         return img
 
+    @classmethod
+    def prewarm_tiles(
+        cls, tile_size: int = TILE_PIXELS, path: str | None = None
+    ) -> TileAtlas:
+        """
+        Render the atlas of all the tiles of a given size up front, so that
+        `render_tile` doesn't render any of them later.
+
+        If `path` is given, the atlas is loaded from a `.npy` file named
+        after it and the tile size (e.g. `atlas_32.npy` for `atlas.npy`) as
+        a read-only memory map, so that all the processes using it share
+        one copy. The file is created if it doesn't exist.
+        """
+
+        atlas = cls.tile_atlases.get(tile_size)
+        if atlas is not None:
+            cls.tile_atlases.move_to_end(tile_size)
+            return atlas
+
+        if path is not None:
+            path = TileAtlas.sized_path(path, tile_size)
+            if os.path.exists(path):
+                atlas = TileAtlas.load(path, tile_size)
+
+        if atlas is None:
+            atlas = TileAtlas.build(tile_size)
+            if path is not None:
+                atlas.save(path)
+                atlas = TileAtlas.load(path, tile_size)
+
+        cls.tile_atlases[tile_size] = atlas
+        if len(cls.tile_atlases) > cls.tile_atlases_size:
+            cls.tile_atlases.popitem(last=False)
+
+        return atlas
+
     def render(
         self,
         tile_size: int,
@@ -206,13 +381,43 @@ class Grid:
     ) -> np.ndarray:
         """
         Render this grid at a given scale
-        :param r: target renderer object
+
+        The tile of each cell is looked up in the tile atlas of this size
+        (see `prewarm_tiles`), and the image is assembled with a single
+        gather of the tiles.
+
         :param tile_size: tile size in pixels
         """
 
         if highlight_mask is None:
             highlight_mask = np.zeros(shape=(self.width, self.height), dtype=bool)
 
+        atlas = Grid.prewarm_tiles(tile_size)
+        index = atlas.tile_indices(self.encoding, agent_pos, agent_dir, highlight_mask)
+        if np.any(index < 0):
+            return self.render_cells(tile_size, agent_pos, agent_dir, highlight_mask)
+
+        # Gather the (width, height, tile_size, tile_size, 3) tiles at once
+        # and lay them out row by row
+        tiles = atlas.tiles[index]
+        img = tiles.transpose(1, 2, 0, 3, 4).reshape(
+            self.height * tile_size, self.width * tile_size, 3
+        )
+
+        return img
+
+    def render_cells(
+        self,
+        tile_size: int,
+        agent_pos: tuple[int, int],
+        agent_dir: int | None,
+        highlight_mask: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Render this grid one cell at a time, for grids holding objects
+        missing from the tile atlas
+        """
+
         # Compute the total grid size
         width_px = self.width * tile_size
         height_px = self.height * tile_size
@@ -225,7 +430,6 @@ class Grid:
                 cell = self.get(i, j)
 
                 agent_here = np.array_equal(agent_pos, (i, j))
-                assert highlight_mask is not None
                 tile_img = Grid.render_tile(
                     cell,
                     agent_dir=agent_dir if agent_here else None,
@@ -246,24 +450,10 @@ class Grid:
         Produce a compact numpy encoding of the grid
         """
 
-        if vis_mask is None:
-            vis_mask = np.ones((self.width, self.height), dtype=bool)
-
-        array = np.zeros((self.width, self.height, 3), dtype="uint8")
-
-        for i in range(self.width):
-            for j in range(self.height):
-                assert vis_mask is not None
-                if vis_mask[i, j]:
-                    v = self.get(i, j)
+        array = self.encoding.copy()
 
-                    if v is None:
-                        array[i, j, 0] = OBJECT_TO_IDX["empty"]
-                        array[i, j, 1] = 0
-                        array[i, j, 2] = 0
-
-                    else:
-                        array[i, j, :] = v.encode()
+        if vis_mask is not None:
+            array[~vis_mask] = 0
 
         return array
 
@@ -289,40 +479,226 @@ class Grid:
         return grid, vis_mask
 
     def process_vis(self, agent_pos: tuple[int, int]) -> np.ndarray:
-        mask = np.zeros(shape=(self.width, self.height), dtype=bool)
+        """
+        Compute which cells are visible from `agent_pos`, with the occlusion
+        kernel of `my_minigrid.core.view` on the opaque cells of the grid
+        encoding, and clear the other cells
+        """
 
-        mask[agent_pos[0], agent_pos[1]] = True
+        mask = process_vis_single(opaque(self.encoding), agent_pos)
 
-        for j in reversed(range(0, self.height)):
-            for i in range(0, self.width - 1):
-                if not mask[i, j]:
-                    continue
+        hidden = ~mask
+        self.encoding[hidden] = EMPTY_ENCODING
+        self.zobrist = None
 
-                cell = self.get(i, j)
-                if cell and not cell.see_behind():
-                    continue
+        # The objects are stored row by row
+        hidden = hidden.T.ravel()
+        objects = np.empty(len(self.grid), dtype=object)
+        objects[:] = self.grid
+        for k in np.flatnonzero(hidden):
+            obj = objects[k]
+            if obj is not None and self._owns(obj, k % self.width, k // self.width):
+                obj.owner = None
+        objects[hidden] = None
+        self.grid = objects.tolist()
 
-                mask[i + 1, j] = True
-                if j > 0:
-                    mask[i + 1, j - 1] = True
-                    mask[i, j - 1] = True
+        return mask
 
-            for i in reversed(range(1, self.width)):
-                if not mask[i, j]:
-                    continue
 
-                cell = self.get(i, j)
-                if cell and not cell.see_behind():
-                    continue
+class FrameRenderer:
+    """
+    Render successive frames of a grid, re-blitting only the cells whose
+    tile (encoding, agent overlay or highlight) changed since the previous
+    frame, for rendering an environment step after step.
+    """
 
-                mask[i - 1, j] = True
-                if j > 0:
-                    mask[i - 1, j - 1] = True
-                    mask[i, j - 1] = True
+    def __init__(self):
+        self.tile_size: int | None = None
+        self.index: np.ndarray | None = None
+        self.frame: np.ndarray | None = None
 
-        for j in range(0, self.height):
-            for i in range(0, self.width):
-                if not mask[i, j]:
-                    self.set(i, j, None)
+    def render(
+        self,
+        grid: Grid,
+        tile_size: int,
+        agent_pos: tuple[int, int],
+        agent_dir: int | None = None,
+        highlight_mask: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """
+        Render a grid like `Grid.render`
+        """
 
-        return mask
+        if highlight_mask is None:
+            highlight_mask = np.zeros(shape=(grid.width, grid.height), dtype=bool)
+
+        atlas = Grid.prewarm_tiles(tile_size)
+        index = atlas.tile_indices(grid.encoding, agent_pos, agent_dir, highlight_mask)
+        if np.any(index < 0):
+            self.index = None
+            return grid.render_cells(tile_size, agent_pos, agent_dir, highlight_mask)
+
+        if (
+            self.index is None
+            or self.index.shape != index.shape
+            or self.tile_size != tile_size
+        ):
+            self.frame = grid.render(tile_size, agent_pos, agent_dir, highlight_mask)
+        else:
+            # View the frame as (height, tile_size, width, tile_size, 3) to
+            # write the tiles of the changed cells
+            xs, ys = np.nonzero(index != self.index)
+            tiles = self.frame.reshape(grid.height, tile_size, grid.width, tile_size, 3)
+            tiles[ys, :, xs] = atlas.tiles[index[xs, ys]]
+
+        self.tile_size = tile_size
+        self.index = index
+
+        return self.frame.copy()
+
+
+class TileAtlas:
+    """
+    Rendered tiles of every object encoding, with every agent overlay
+    (none or one of the 4 directions) and highlight, for one tile size,
+    stacked in a (num_tiles, tile_size, tile_size, 3) array.
+
+    The tile of the object of index `k` in `TileAtlas.objects()`, agent
+    overlay `d` (0 for no agent, `agent_dir + 1` otherwise) and highlight
+    `h` is at index `(k * 5 + d) * 2 + h`.
+    """
+
+    subdivs = 3
+
+    def __init__(self, tiles: np.ndarray):
+        self.tiles = tiles
+        self.tile_size = tiles.shape[1]
+
+        # Index of the object of each (type, color, state) encoding, or -1
+        self.object_index = np.full(
+            (len(OBJECT_TO_IDX), len(COLOR_TO_IDX), len(STATE_TO_IDX)), -1
+        )
+        for k, obj in enumerate(self.objects()):
+            encoding = obj.encode() if obj else tuple(EMPTY_ENCODING)
+            self.object_index[encoding] = k
+        self.object_index[OBJECT_TO_IDX["unseen"]] = 0
+
+    @staticmethod
+    def objects() -> list[WorldObj | None]:
+        """
+        One object of each encoding that can appear in a grid
+        """
+
+        objs = [None]
+        for obj_type in ("wall", "floor", "key", "ball", "box"):
+            for color in COLOR_NAMES:
+                objs.append(
+                    WorldObj.decode(OBJECT_TO_IDX[obj_type], COLOR_TO_IDX[color], 0)
+                )
+        for color in COLOR_NAMES:
+            for state in STATE_TO_IDX.values():
+                objs.append(
+                    WorldObj.decode(OBJECT_TO_IDX["door"], COLOR_TO_IDX[color], state)
+                )
+        objs.append(WorldObj.decode(OBJECT_TO_IDX["goal"], COLOR_TO_IDX["green"], 0))
+        objs.append(WorldObj.decode(OBJECT_TO_IDX["lava"], COLOR_TO_IDX["red"], 0))
+
+        return objs
+
+    @classmethod
+    def build(cls, tile_size: int) -> TileAtlas:
+        objs = cls.objects()
+        tiles = np.zeros((len(objs) * 10, tile_size, tile_size, 3), dtype=np.uint8)
+
+        index = 0
+        for obj in objs:
+            for agent_dir in (None, 0, 1, 2, 3):
+                for highlight in (False, True):
+                    tiles[index] = Grid.draw_tile(
+                        obj, agent_dir, highlight, tile_size, cls.subdivs
+                    )
+                    index += 1
+
+        return cls(tiles)
+
+    @classmethod
+    def load(cls, path: str, tile_size: int) -> TileAtlas | None:
+        """
+        Load an atlas saved with `save` as a read-only memory map, or return
+        None if the file doesn't hold an atlas of this tile size
+        """
+
+        tiles = np.load(path, mmap_mode="r")
+
+        shape = (len(cls.objects()) * 10, tile_size, tile_size, 3)
+        if tiles.shape != shape or tiles.dtype != np.uint8:
+            return None
+
+        return cls(tiles)
+
+    @staticmethod
+    def sized_path(path: str, tile_size: int) -> str:
+        """
+        Path of the atlas of a given tile size saved at `path`
+        """
+
+        root, ext = os.path.splitext(path)
+        return f"{root}_{tile_size}{ext or '.npy'}"
+
+    def save(self, path: str):
+        """
+        Save the atlas to a temporary file replacing `path` once written,
+        so that other processes never load a partially written atlas
+        """
+
+        fd, tmp_path = tempfile.mkstemp(
+            suffix=".npy", dir=os.path.dirname(os.path.abspath(path))
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.asarray(self.tiles))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def tile_index(
+        self,
+        encoding: tuple[int, int, int],
+        agent_dir: int | None = None,
+        highlight: bool = False,
+    ) -> int:
+        """
+        Index of a tile in the atlas, or -1 if the encoding isn't in it
+        """
+
+        k = self.object_index[encoding]
+        if k < 0:
+            return -1
+
+        agent_slot = 0 if agent_dir is None else agent_dir + 1
+        return (k * 5 + agent_slot) * 2 + int(highlight)
+
+    def tile_indices(
+        self,
+        encoding: np.ndarray,
+        agent_pos: tuple[int, int],
+        agent_dir: int | None,
+        highlight_mask: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Vectorized version of `tile_index` for a (width, height, 3) grid
+        encoding, with the agent overlay at `agent_pos`. Cells whose encoding
+        isn't in the atlas get -1.
+        """
+
+        k = self.object_index[encoding[..., 0], encoding[..., 1], encoding[..., 2]]
+
+        agent_slot = np.zeros(k.shape, dtype=k.dtype)
+        if agent_dir is not None and agent_pos is not None:
+            x, y = agent_pos
+            if 0 <= x < k.shape[0] and 0 <= y < k.shape[1]:
+                agent_slot[x, y] = agent_dir + 1
+
+        index = (k * 5 + agent_slot) * 2 + highlight_mask.astype(k.dtype)
+        return np.where(k < 0, -1, index)
@@ -120,6 +120,15 @@ class RoomGrid(MiniGridEnv):
         assert j < self.num_rows
         return self.room_grid[j][i]
 
+    def get_state(self):
+        state = super().get_state()
+        state["room_grid"] = self.room_grid
+        return state
+
+    def set_state(self, state):
+        super().set_state(state)
+        self.room_grid = state["room_grid"]
+
     def _gen_grid(self, width, height):
         # Create the grid
         self.grid = Grid(width, height)
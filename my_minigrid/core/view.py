@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import functools
+
+import numpy as np
+
+from my_minigrid.core.constants import (
+    COLOR_TO_IDX,
+    DIR_TO_VEC,
+    OBJECT_TO_IDX,
+    STATE_TO_IDX,
+)
+
+# Encoding of the walls surrounding the grid, as in `Grid.slice`
+WALL_ENCODING = np.array(
+    (OBJECT_TO_IDX["wall"], COLOR_TO_IDX["grey"], 0), dtype=np.uint8
+)
+
+# Encoding of an empty cell, as in `Grid.encode`
+EMPTY_ENCODING = np.array((OBJECT_TO_IDX["empty"], 0, 0), dtype=np.uint8)
+
+
+@functools.lru_cache(maxsize=None)
+def view_offsets(agent_view_size: int) -> np.ndarray:
+    """
+    Offsets from the agent position of the cells of its view, as a
+    (4, agent_view_size, agent_view_size, 2) array indexed by the agent
+    direction and the view coordinates. The view is rotated so that the
+    agent is at its bottom middle, looking up.
+    """
+
+    sz = agent_view_size
+    vis_i, vis_j = np.meshgrid(np.arange(sz), np.arange(sz), indexing="ij")
+    vis_i, vis_j = vis_i[..., None], vis_j[..., None]
+
+    offsets = np.zeros((4, sz, sz, 2), dtype=np.int64)
+    for agent_dir, f_vec in enumerate(DIR_TO_VEC):
+        r_vec = np.array((-f_vec[1], f_vec[0]))
+        top_left = f_vec * (sz - 1) - r_vec * (sz // 2)
+        offsets[agent_dir] = top_left - f_vec * vis_j + r_vec * vis_i
+
+    offsets.setflags(write=False)
+    return offsets
+
+
+def extract_views(
+    grids: np.ndarray,
+    agent_pos: np.ndarray,
+    agent_dir: np.ndarray,
+    agent_view_size: int,
+) -> np.ndarray:
+    """
+    Gather the encodings of the cells viewed by a batch of agents
+
+    :param grids: (N, width, height, 3) grid encodings
+    :param agent_pos: (N, 2) agent positions
+    :param agent_dir: (N,) agent directions
+    :return: (N, agent_view_size, agent_view_size, 3) encodings of the views,
+        rotated like in `MiniGridEnv.gen_obs_grid`. Cells outside of the
+        grid are walls.
+    """
+
+    num_grids, width, height, _ = grids.shape
+
+    coords = agent_pos[:, None, None, :] + view_offsets(agent_view_size)[agent_dir]
+    x, y = coords[..., 0], coords[..., 1]
+    inside = (0 <= x) & (x < width) & (0 <= y) & (y < height)
+
+    views = grids[
+        np.arange(num_grids)[:, None, None],
+        np.clip(x, 0, width - 1),
+        np.clip(y, 0, height - 1),
+    ]
+    views[~inside] = WALL_ENCODING
+
+    return views
+
+
+def opaque(cells: np.ndarray) -> np.ndarray:
+    """
+    Mask of the encoded cells the agent can't see behind: walls and closed
+    or locked doors (see `WorldObj.see_behind`)
+    """
+
+    types = cells[..., 0]
+    closed_door = (types == OBJECT_TO_IDX["door"]) & (
+        cells[..., 2] != STATE_TO_IDX["open"]
+    )
+    return (types == OBJECT_TO_IDX["wall"]) | closed_door
+
+
+# Rows wider than this are processed by sweeping over their cells
+MAX_LUT_WIDTH = 8
+
+
+@functools.lru_cache(maxsize=None)
+def row_vis_table(width: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Lookup tables of the two sweeps `Grid.process_vis` runs over a row.
+
+    A row is given by the bits of its visible cells before the sweeps and
+    the bits of its opaque cells, as the index `visible | opaque << width`.
+    The first table gives the visible cells of the row after the sweeps,
+    the second one the cells they make visible in the row above.
+    """
+
+    codes = np.arange(1 << (2 * width), dtype=np.int64)
+    opaque = codes >> width
+    mask = codes & ((1 << width) - 1)
+    above = np.zeros_like(mask)
+
+    def spread(i):
+        return (mask >> i) & ~(opaque >> i) & 1
+
+    for i in range(0, width - 1):
+        s = spread(i)
+        mask |= s << (i + 1)
+        above |= (s << (i + 1)) | (s << i)
+
+    for i in reversed(range(1, width)):
+        s = spread(i)
+        mask |= s << (i - 1)
+        above |= (s << (i - 1)) | (s << i)
+
+    return mask.astype(np.uint8), above.astype(np.uint8)
+
+
+def process_vis(opaque: np.ndarray, agent_pos: tuple[int, int]) -> np.ndarray:
+    """
+    Batched version of `Grid.process_vis`
+
+    The rows are processed from the bottom up, each one with a lookup in
+    `row_vis_table` keyed on its visible and opaque cells.
+
+    :param opaque: (N, width, height) masks of the cells the agent can't
+        see behind
+    :param agent_pos: position of the agent in the grids
+    :return: (N, width, height) visibility masks
+    """
+
+    num_grids, width, height = opaque.shape
+
+    if width > MAX_LUT_WIDTH:
+        return _sweep_vis(opaque, agent_pos)
+
+    row_mask, row_above = row_vis_table(width)
+
+    # Bits of the opaque cells of each row
+    opaque_rows = np.packbits(opaque, axis=1, bitorder="little")[:, 0].astype(np.int64)
+
+    rows = np.zeros((num_grids, height), dtype=np.uint8)
+    rows[:, agent_pos[1]] = 1 << agent_pos[0]
+
+    for j in reversed(range(0, height)):
+        code = rows[:, j] | (opaque_rows[:, j] << width)
+        rows[:, j] = row_mask[code]
+        if j > 0:
+            rows[:, j - 1] |= row_above[code]
+
+    mask = np.unpackbits(rows[:, None], axis=1, count=width, bitorder="little")
+    return mask.astype(bool)
+
+
+def process_vis_single(opaque: np.ndarray, agent_pos: tuple[int, int]) -> np.ndarray:
+    """
+    Version of `process_vis` for a single (width, height) mask, with the
+    lookups done on Python integers, which is faster than array operations
+    on a batch of one grid
+    """
+
+    width, height = opaque.shape
+
+    if width > MAX_LUT_WIDTH:
+        return _sweep_vis(opaque[None], agent_pos)[0]
+
+    row_mask, row_above = row_vis_table(width)
+
+    opaque_rows = np.packbits(opaque, axis=0, bitorder="little")[0].tolist()
+
+    rows = [0] * height
+    rows[agent_pos[1]] = 1 << agent_pos[0]
+
+    for j in reversed(range(0, height)):
+        code = rows[j] | (opaque_rows[j] << width)
+        rows[j] = int(row_mask[code])
+        if j > 0:
+            rows[j - 1] |= int(row_above[code])
+
+    mask = np.unpackbits(
+        np.array(rows, dtype=np.uint8)[None], axis=0, count=width, bitorder="little"
+    )
+    return mask.astype(bool)
+
+
+def _sweep_vis(opaque: np.ndarray, agent_pos: tuple[int, int]) -> np.ndarray:
+    """
+    Batched version of `Grid.process_vis` sweeping over the cells of each
+    row, for rows too wide for `row_vis_table`
+    """
+
+    _, width, height = opaque.shape
+    transparent = ~opaque
+
+    mask = np.zeros(opaque.shape, dtype=bool)
+    mask[:, agent_pos[0], agent_pos[1]] = True
+
+    for j in reversed(range(0, height)):
+        for i in range(0, width - 1):
+            spread = mask[:, i, j] & transparent[:, i, j]
+
+            mask[:, i + 1, j] |= spread
+            if j > 0:
+                mask[:, i + 1, j - 1] |= spread
+                mask[:, i, j - 1] |= spread
+
+        for i in reversed(range(1, width)):
+            spread = mask[:, i, j] & transparent[:, i, j]
+
+            mask[:, i - 1, j] |= spread
+            if j > 0:
+                mask[:, i - 1, j - 1] |= spread
+                mask[:, i, j - 1] |= spread
+
+    return mask
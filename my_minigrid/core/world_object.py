@@ -1,17 +1,19 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Tuple
+import functools
+import inspect
+from typing import TYPE_CHECKING, Any, Callable, Tuple
 
 import numpy as np
 
-from minigrid.core.constants import (
+from my_minigrid.core.constants import (
     COLOR_TO_IDX,
     COLORS,
     IDX_TO_COLOR,
     IDX_TO_OBJECT,
     OBJECT_TO_IDX,
 )
-from minigrid.utils.rendering import (
+from my_minigrid.utils.rendering import (
     fill_coords,
     point_in_circle,
     point_in_line,
@@ -19,20 +21,54 @@ from minigrid.utils.rendering import (
 )
 
 if TYPE_CHECKING:
-    from minigrid.minigrid_env import MiniGridEnv
+    from my_minigrid.core.grid import Grid
+    from my_minigrid.minigrid_env import MiniGridEnv
 
 Point = Tuple[int, int]
 
 
+# Instances of the stateless object classes, by class and arguments
+_shared_objects: dict[tuple, WorldObj] = {}
+
+
+@functools.lru_cache(maxsize=None)
+def _slot_names(cls: type) -> tuple[str, ...]:
+    return tuple(
+        name for c in cls.__mro__ for name in getattr(c, "__slots__", ())
+    )
+
+
 class WorldObj:
 
     """
     Base class for grid world objects
+
+    Objects of the `stateless` classes (walls, floors, lava, goals) can't
+    change, so one instance of each color, given by `shared`, can fill any
+    number of cells. Shared objects have no owner cell nor position.
     """
 
+    __slots__ = (
+        "owner",
+        "type",
+        "_color",
+        "contains",
+        "init_pos",
+        "cur_pos",
+        "_shared_args",
+    )
+
+    # Whether the objects of this class have no state that can change
+    stateless = False
+
     def __init__(self, type: str, color: str):
         assert type in OBJECT_TO_IDX, type
         assert color in COLOR_TO_IDX, color
+
+        # Grid cell holding the object, whose encoding is kept up to date
+        self.owner: tuple[Grid, int, int] | None = None
+        self._shared_args: tuple | None = None
+
         self.type = type
         self.color = color
         self.contains = None
@@ -43,6 +79,88 @@ class WorldObj:
         # Current position of the object
         self.cur_pos: Point | None = None
 
+    @property
+    def color(self) -> str:
+        return self._color
+
+    @color.setter
+    def color(self, color: str):
+        assert self._shared_args is None, "shared objects can't be modified"
+        self._color = color
+        self.update_encoding()
+
+    @classmethod
+    def shared(cls, *args) -> WorldObj:
+        """
+        Shared instance of a stateless object class, created with the given
+        arguments on first use. Arguments left to their default value give
+        the same instance as when they are passed, e.g. `Wall.shared()` and
+        `Wall.shared("grey")`.
+        """
+
+        assert cls.stateless, f"{cls.__name__} objects can't be shared"
+
+        key = (cls, *args)
+        obj = _shared_objects.get(key)
+        if obj is None:
+            bound = inspect.signature(cls).bind(*args)
+            bound.apply_defaults()
+            args = bound.args
+            obj = _shared_objects.get((cls, *args))
+            if obj is None:
+                obj = cls(*args)
+                obj._shared_args = args
+                _shared_objects[(cls, *args)] = obj
+            _shared_objects[key] = obj
+        return obj
+
+    @property
+    def is_shared(self) -> bool:
+        return self._shared_args is not None
+
+    def copy(self) -> WorldObj:
+        """
+        Copy of this object, and of the object it contains, outside of any
+        grid. Shared objects are their own copy.
+        """
+
+        if self._shared_args is not None:
+            return self
+
+        obj = object.__new__(type(self))
+        obj.set_state(self.get_state())
+        obj.owner = None
+        if obj.contains is not None:
+            obj.contains = obj.contains.copy()
+        return obj
+
+    def get_state(self) -> dict[str, Any]:
+        """
+        Values of the attributes of this object, to restore with `set_state`
+        """
+
+        state = {name: getattr(self, name) for name in _slot_names(type(self))}
+        state.update(getattr(self, "__dict__", {}))
+        return state
+
+    def set_state(self, state: dict[str, Any]):
+        # The attributes are set directly: the grid encoding is restored
+        # alongside the objects
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+    def __reduce_ex__(self, protocol):
+        # Copies of a shared object are the shared object of this process
+        if self._shared_args is not None:
+            return type(self).shared, self._shared_args
+        return super().__reduce_ex__(protocol)
+
+    def update_encoding(self):
+        """Update the encoding of the grid cell holding this object"""
+        if self.owner is not None:
+            grid, i, j = self.owner
+            grid.encode_cell(i, j, self.encode())
+
     def can_overlap(self) -> bool:
         """Can the agent overlap with this?"""
         return False
@@ -82,9 +200,9 @@ class WorldObj:
         is_locked = state == 2
 
         if obj_type == "wall":
-            v = Wall(color)
+            v = Wall.shared(color)
         elif obj_type == "floor":
-            v = Floor(color)
+            v = Floor.shared(color)
         elif obj_type == "ball":
             v = Ball(color)
         elif obj_type == "key":
@@ -94,9 +212,9 @@ class WorldObj:
         elif obj_type == "door":
             v = Door(color, is_open, is_locked)
         elif obj_type == "goal":
-            v = Goal()
+            v = Goal.shared()
         elif obj_type == "lava":
-            v = Lava()
+            v = Lava.shared()
         else:
             assert False, "unknown object type in decode '%s'" % obj_type
 
@@ -108,6 +226,9 @@ class WorldObj:
 
 
 class Goal(WorldObj):
+    __slots__ = ()
+    stateless = True
+
     def __init__(self):
         super().__init__("goal", "green")
 
@@ -123,6 +244,9 @@ class Floor(WorldObj):
     Colored floor tile the agent can walk over
     """
 
+    __slots__ = ()
+    stateless = True
+
     def __init__(self, color: str = "blue"):
         super().__init__("floor", color)
 
@@ -136,6 +260,9 @@ class Floor(WorldObj):
 
 
 class Lava(WorldObj):
+    __slots__ = ()
+    stateless = True
+
     def __init__(self):
         super().__init__("lava", "red")
 
@@ -159,6 +286,9 @@ class Lava(WorldObj):
 
 
 class Wall(WorldObj):
+    __slots__ = ()
+    stateless = True
+
     def __init__(self, color: str = "grey"):
         super().__init__("wall", color)
 
@@ -170,10 +300,30 @@ class Wall(WorldObj):
 
 
 class Door(WorldObj):
+    __slots__ = ("_is_open", "_is_locked")
+
     def __init__(self, color: str, is_open: bool = False, is_locked: bool = False):
+        self._is_open = is_open
+        self._is_locked = is_locked
         super().__init__("door", color)
-        self.is_open = is_open
-        self.is_locked = is_locked
+
+    @property
+    def is_open(self) -> bool:
+        return self._is_open
+
+    @is_open.setter
+    def is_open(self, is_open: bool):
+        self._is_open = is_open
+        self.update_encoding()
+
+    @property
+    def is_locked(self) -> bool:
+        return self._is_locked
+
+    @is_locked.setter
+    def is_locked(self, is_locked: bool):
+        self._is_locked = is_locked
+        self.update_encoding()
 
     def can_overlap(self):
         """The agent can only walk over this cell when the door is open"""
@@ -238,6 +388,8 @@ class Door(WorldObj):
 
 
 class Key(WorldObj):
+    __slots__ = ()
+
     def __init__(self, color: str = "blue"):
         super().__init__("key", color)
 
@@ -260,6 +412,8 @@ class Key(WorldObj):
 
 
 class Ball(WorldObj):
+    __slots__ = ()
+
     def __init__(self, color="blue"):
         super().__init__("ball", color)
 
@@ -271,6 +425,8 @@ class Ball(WorldObj):
 
 
 class Box(WorldObj):
+    __slots__ = ()
+
     def __init__(self, color, contains: WorldObj | None = None):
         super().__init__("box", color)
         self.contains = contains
@@ -292,3 +448,15 @@ class Box(WorldObj):
         # Replace the box by its contents
         env.grid.set(pos[0], pos[1], self.contains)
         return True
+
+
+def shared_factory(obj_type: Callable[[], WorldObj]) -> Callable[[], WorldObj]:
+    """
+    Factory of the shared instance of `obj_type` if it is a stateless object
+    class, or `obj_type` itself otherwise
+    """
+
+    if isinstance(obj_type, type) and issubclass(obj_type, WorldObj):
+        if obj_type.stateless:
+            return obj_type.shared
+    return obj_type
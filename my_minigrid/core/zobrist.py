@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import functools
+
+import numpy as np
+
+from my_minigrid.core.constants import COLOR_TO_IDX, OBJECT_TO_IDX, STATE_TO_IDX
+
+# Number of distinct (type, color, state) cell encodings
+NUM_CELL_CODES = len(OBJECT_TO_IDX) * len(COLOR_TO_IDX) * len(STATE_TO_IDX)
+
+
+@functools.lru_cache(maxsize=None)
+def zobrist_keys(width: int, height: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Random 64-bit keys of the Zobrist hashes of grids of a given size: a
+    (width, height, NUM_CELL_CODES) array of keys of the cell encodings and
+    a (width, height, 4) array of keys of the agent positions and
+    directions.
+
+    The keys are drawn from a generator seeded with the grid size, so the
+    hashes are the same in every process.
+    """
+
+    rng = np.random.default_rng((width, height))
+    cell_keys = rng.integers(
+        0, 2**64, size=(width, height, NUM_CELL_CODES), dtype=np.uint64
+    )
+    agent_keys = rng.integers(0, 2**64, size=(width, height, 4), dtype=np.uint64)
+
+    cell_keys.setflags(write=False)
+    agent_keys.setflags(write=False)
+    return cell_keys, agent_keys
+
+
+def cell_codes(cells: np.ndarray) -> np.ndarray:
+    """
+    Index of the encodings of an array of cells in `zobrist_keys`
+    """
+
+    types = cells[..., 0].astype(np.int64)
+    colors = cells[..., 1]
+    return (types * len(COLOR_TO_IDX) + colors) * len(STATE_TO_IDX) + cells[..., 2]
+
+
+def cell_code(cell) -> int:
+    """
+    Version of `cell_codes` for a single cell, on Python integers
+    """
+
+    obj_type, color, state = (int(v) for v in cell)
+    return (obj_type * len(COLOR_TO_IDX) + color) * len(STATE_TO_IDX) + state
+
+
+def hash_grids(grids: np.ndarray) -> np.ndarray:
+    """
+    Zobrist hashes of a batch of grids, the XOR of the keys of their cells
+
+    :param grids: (N, width, height, 3) grid encodings
+    :return: (N,) uint64 hashes
+    """
+
+    num_grids, width, height, _ = grids.shape
+    cell_keys, _ = zobrist_keys(width, height)
+
+    keys = cell_keys[
+        np.arange(width)[:, None], np.arange(height)[None, :], cell_codes(grids)
+    ]
+    return np.bitwise_xor.reduce(keys.reshape(num_grids, -1), axis=1)
+
+
+def hash_states(
+    grids: np.ndarray, agent_pos: np.ndarray, agent_dir: np.ndarray
+) -> np.ndarray:
+    """
+    Zobrist hashes of a batch of environment states: the hashes of their
+    grids combined with the keys of the agents positions and directions
+
+    :param grids: (N, width, height, 3) grid encodings
+    :param agent_pos: (N, 2) agent positions
+    :param agent_dir: (N,) agent directions
+    :return: (N,) uint64 hashes
+    """
+
+    _, width, height, _ = grids.shape
+    _, agent_keys = zobrist_keys(width, height)
+
+    return hash_grids(grids) ^ agent_keys[agent_pos[:, 0], agent_pos[:, 1], agent_dir]
+
+
+class CountMinSketch:
+    """
+    Approximate counts of 64-bit hashes in a fixed amount of memory
+
+    The counts are kept in `depth` rows of `width` counters, each hash
+    being counted in one counter per row, picked by a multiply-shift hash
+    of the row. The count of a hash is the smallest of its counters: it is
+    only overestimated when all of them are shared with other hashes.
+    """
+
+    def __init__(self, width: int = 2**20, depth: int = 4, seed: int = 0):
+        # A width of 1 would shift the 64-bit hashes by 64 bits
+        assert width >= 2 and width & (width - 1) == 0, "The width must be a power of 2, at least 2"
+
+        self.width = width
+        self.depth = depth
+        self.counts = np.zeros((depth, width), dtype=np.uint32)
+
+        # Odd multipliers of the hashes of the rows
+        rng = np.random.default_rng(seed)
+        self.multipliers = rng.integers(0, 2**64, size=depth, dtype=np.uint64) | 1
+        self.shift = np.uint64(64 - (width.bit_length() - 1))
+
+    def add(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Count a batch of hashes, and return their counts afterwards. Hashes
+        repeated in the batch all get the count after the batch.
+        """
+
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        rows = np.arange(self.depth)[:, None]
+        index = (hashes[None, :] * self.multipliers[:, None]) >> self.shift
+
+        np.add.at(self.counts, (rows, index), 1)
+        return self.counts[rows, index].min(axis=0)
@@ -9,12 +9,20 @@ from my_minigrid.envs.babyai.core.verifier import (
     AfterInstr,
     AndInstr,
     BeforeInstr,
+    Instr,
+    ObjDesc,
     PutNextInstr,
     SeqInstr,
 )
 from my_minigrid.minigrid_env import MissionSpace
 
 
+def _copy_lists(attrs):
+    # The lists of objects and positions are copied, not to be modified by
+    # the verifier
+    return {k: list(v) if isinstance(v, list) else v for k, v in attrs.items()}
+
+
 class RejectSampling(Exception):
     """
     Exception used for rejection sampling
@@ -102,6 +110,38 @@ class RoomGridLevel(RoomGrid):
 
         return obs, reward, terminated, truncated, info
 
+    def get_state(self):
+        state = super().get_state()
+        state["instrs"] = self.instrs
+        state["surface"] = self.surface
+
+        # Attributes of the instructions and object descriptions, which hold
+        # the state of the verifier
+        state["verifier"] = [
+            (node, _copy_lists(vars(node))) for node in self.verifier_nodes(self.instrs)
+        ]
+        return state
+
+    def set_state(self, state):
+        super().set_state(state)
+        self.instrs = state["instrs"]
+        self.surface = state["surface"]
+        for node, attrs in state["verifier"]:
+            vars(node).update(_copy_lists(attrs))
+
+    def verifier_nodes(self, instr):
+        """
+        Instructions and object descriptions making up an instruction
+        """
+
+        nodes = [instr]
+        for value in vars(instr).values():
+            if isinstance(value, Instr):
+                nodes += self.verifier_nodes(value)
+            elif isinstance(value, ObjDesc):
+                nodes.append(value)
+        return nodes
+
     def update_objs_poss(self, instr=None):
         if instr is None:
             instr = self.instrs
@@ -4,9 +4,9 @@ Levels described in the Baby AI ICLR 2019 submission, with the `Go to` instructi
 """
 from __future__ import annotations
 
-from minigrid.envs.babyai.core.levelgen import LevelGen
-from minigrid.envs.babyai.core.roomgrid_level import RejectSampling, RoomGridLevel
-from minigrid.envs.babyai.core.verifier import GoToInstr, ObjDesc
+from my_minigrid.envs.babyai.core.levelgen import LevelGen
+from my_minigrid.envs.babyai.core.roomgrid_level import RejectSampling, RoomGridLevel
+from my_minigrid.envs.babyai.core.verifier import GoToInstr, ObjDesc
 import numpy as np
 
 
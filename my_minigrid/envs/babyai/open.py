@@ -4,9 +4,9 @@ Levels described in the Baby AI ICLR 2019 submission, with the `Open` instructio
 """
 from __future__ import annotations
 
-from minigrid.core.constants import COLOR_NAMES
-from minigrid.envs.babyai.core.roomgrid_level import RoomGridLevel
-from minigrid.envs.babyai.core.verifier import (
+from my_minigrid.core.constants import COLOR_NAMES
+from my_minigrid.envs.babyai.core.roomgrid_level import RoomGridLevel
+from my_minigrid.envs.babyai.core.verifier import (
     LOC_NAMES,
     AfterInstr,
     BeforeInstr,
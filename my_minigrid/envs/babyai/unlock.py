@@ -4,10 +4,10 @@ Levels described in the Baby AI ICLR 2019 submission, with the `Unlock` instruct
 """
 from __future__ import annotations
 
-from minigrid.core.constants import COLOR_NAMES
-from minigrid.core.world_object import Ball, Box, Key
-from minigrid.envs.babyai.core.roomgrid_level import RoomGridLevel
-from minigrid.envs.babyai.core.verifier import ObjDesc, OpenInstr, PickupInstr
+from my_minigrid.core.constants import COLOR_NAMES
+from my_minigrid.core.world_object import Ball, Box, Key
+from my_minigrid.envs.babyai.core.roomgrid_level import RoomGridLevel
+from my_minigrid.envs.babyai.core.verifier import ObjDesc, OpenInstr, PickupInstr
 
 
 class Unlock(RoomGridLevel):
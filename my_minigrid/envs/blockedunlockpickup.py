@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-from minigrid.core.constants import COLOR_NAMES
-from minigrid.core.mission import MissionSpace
-from minigrid.core.roomgrid import RoomGrid
-from minigrid.core.world_object import Ball
+from my_minigrid.core.constants import COLOR_NAMES
+from my_minigrid.core.mission import MissionSpace
+from my_minigrid.core.roomgrid import RoomGrid
+from my_minigrid.core.world_object import Ball
 
 
 class BlockedUnlockPickupEnv(RoomGrid):
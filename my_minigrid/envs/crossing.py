@@ -4,10 +4,10 @@ import itertools as itt
 
 import numpy as np
 
-from minigrid.core.grid import Grid
-from minigrid.core.mission import MissionSpace
-from minigrid.core.world_object import Goal, Lava
-from minigrid.minigrid_env import MiniGridEnv
+from my_minigrid.core.grid import Grid
+from my_minigrid.core.mission import MissionSpace
+from my_minigrid.core.world_object import Goal, Lava
+from my_minigrid.minigrid_env import MiniGridEnv
 
 
 class CrossingEnv(MiniGridEnv):
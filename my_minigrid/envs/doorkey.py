@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-from minigrid.core.grid import Grid
-from minigrid.core.mission import MissionSpace
-from minigrid.core.world_object import Door, Goal, Key
-from minigrid.minigrid_env import MiniGridEnv
+from my_minigrid.core.grid import Grid
+from my_minigrid.core.mission import MissionSpace
+from my_minigrid.core.world_object import Door, Goal, Key
+from my_minigrid.minigrid_env import MiniGridEnv
 
 
 class DoorKeyEnv(MiniGridEnv):
@@ -4,10 +4,10 @@ from operator import add
 
 from gymnasium.spaces import Discrete
 
-from minigrid.core.grid import Grid
-from minigrid.core.mission import MissionSpace
-from minigrid.core.world_object import Ball, Goal
-from minigrid.minigrid_env import MiniGridEnv
+from my_minigrid.core.grid import Grid
+from my_minigrid.core.mission import MissionSpace
+from my_minigrid.core.world_object import Ball, Goal
+from my_minigrid.minigrid_env import MiniGridEnv
 
 
 class DynamicObstaclesEnv(MiniGridEnv):
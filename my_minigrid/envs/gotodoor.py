@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-from minigrid.core.constants import COLOR_NAMES
-from minigrid.core.grid import Grid
-from minigrid.core.mission import MissionSpace
-from minigrid.core.world_object import Door
-from minigrid.minigrid_env import MiniGridEnv
+from my_minigrid.core.constants import COLOR_NAMES
+from my_minigrid.core.grid import Grid
+from my_minigrid.core.mission import MissionSpace
+from my_minigrid.core.world_object import Door
+from my_minigrid.minigrid_env import MiniGridEnv
 
 
 class GoToDoorEnv(MiniGridEnv):
@@ -2,11 +2,11 @@ from __future__ import annotations
 
 import numpy as np
 
-from minigrid.core.actions import Actions
-from minigrid.core.grid import Grid
-from minigrid.core.mission import MissionSpace
-from minigrid.core.world_object import Ball, Key, Wall
-from minigrid.minigrid_env import MiniGridEnv
+from my_minigrid.core.actions import Actions
+from my_minigrid.core.grid import Grid
+from my_minigrid.core.mission import MissionSpace
+from my_minigrid.core.world_object import Ball, Key, Wall
+from my_minigrid.minigrid_env import MiniGridEnv
 
 
 class MemoryEnv(MiniGridEnv):
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-from minigrid.core.constants import COLOR_NAMES, DIR_TO_VEC
-from minigrid.core.mission import MissionSpace
-from minigrid.core.roomgrid import RoomGrid
-from minigrid.core.world_object import Ball, Box, Key
+from my_minigrid.core.constants import COLOR_NAMES, DIR_TO_VEC
+from my_minigrid.core.mission import MissionSpace
+from my_minigrid.core.roomgrid import RoomGrid
+from my_minigrid.core.world_object import Ball, Box, Key
 
 
 class ObstructedMazeEnv(RoomGrid):
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-from minigrid.core.constants import DIR_TO_VEC
-from minigrid.core.roomgrid import RoomGrid
-from minigrid.core.world_object import Ball, Box, Key
-from minigrid.envs.obstructedmaze import ObstructedMazeEnv
+from my_minigrid.core.constants import DIR_TO_VEC
+from my_minigrid.core.roomgrid import RoomGrid
+from my_minigrid.core.world_object import Ball, Box, Key
+from my_minigrid.envs.obstructedmaze import ObstructedMazeEnv
 
 
 class ObstructedMaze_Full(ObstructedMazeEnv):
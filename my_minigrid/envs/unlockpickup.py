@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from minigrid.core.constants import COLOR_NAMES
-from minigrid.core.mission import MissionSpace
-from minigrid.core.roomgrid import RoomGrid
+from my_minigrid.core.constants import COLOR_NAMES
+from my_minigrid.core.mission import MissionSpace
+from my_minigrid.core.roomgrid import RoomGrid
 
 
 class UnlockPickupEnv(RoomGrid):
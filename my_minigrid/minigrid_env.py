@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import copy
 import hashlib
 import math
 from abc import abstractmethod
@@ -14,9 +15,17 @@ from gymnasium.core import ActType, ObsType
 
 from my_minigrid.core.actions import Actions
 from my_minigrid.core.constants import COLOR_NAMES, DIR_TO_VEC, TILE_PIXELS
-from my_minigrid.core.grid import Grid
+from my_minigrid.core.grid import FrameRenderer, Grid
 from my_minigrid.core.mission import MissionSpace
+from my_minigrid.core.view import (
+    EMPTY_ENCODING,
+    extract_views,
+    opaque,
+    process_vis_single,
+    view_offsets,
+)
 from my_minigrid.core.world_object import Point, WorldObj
+from my_minigrid.core.zobrist import zobrist_keys
 
 T = TypeVar("T")
 
@@ -115,6 +124,7 @@ class MiniGridEnv(gym.Env):
         self.highlight = highlight
         self.tile_size = tile_size
         self.agent_pov = agent_pov
+        self.frame_renderer = FrameRenderer()
 
     def reset(
         self,
@@ -156,6 +166,63 @@ class MiniGridEnv(gym.Env):
 
         return obs, {}
 
+    def get_state(self) -> dict[str, Any]:
+        """
+        Snapshot of the state of the environment, to come back to it with
+        `set_state`: the grid (its cells, encoding and the state of its
+        objects), the agent, the step count, the mission and the state of
+        the random number generator.
+
+        Objects are referenced rather than copied, so that taking and
+        restoring snapshots only costs copies of the cells list, of the grid
+        encoding and of the few attributes of the objects that aren't shared.
+        Attributes set by the `_gen_grid` of specific environments aren't
+        included.
+        """
+
+        objects = {}
+        pending = [*self.grid.grid, self.carrying]
+        while pending:
+            obj = pending.pop()
+            if obj is None or obj.is_shared or id(obj) in objects:
+                continue
+            objects[id(obj)] = (obj, obj.get_state())
+            pending.append(obj.contains)
+
+        return {
+            "grid": self.grid,
+            "cells": list(self.grid.grid),
+            "encoding": self.grid.encoding.copy(),
+            "objects": list(objects.values()),
+            "agent_pos": copy.copy(self.agent_pos),
+            "agent_dir": self.agent_dir,
+            "carrying": self.carrying,
+            "step_count": self.step_count,
+            "max_steps": self.max_steps,
+            "mission": self.mission,
+            "np_random": self.np_random.bit_generator.state,
+        }
+
+    def set_state(self, state: dict[str, Any]):
+        """
+        Restore a snapshot taken with `get_state`
+        """
+
+        self.grid = state["grid"]
+        self.grid.grid = list(state["cells"])
+        self.grid.encoding = state["encoding"].copy()
+        self.grid.zobrist = None
+        for obj, obj_state in state["objects"]:
+            obj.set_state(obj_state)
+
+        self.agent_pos = copy.copy(state["agent_pos"])
+        self.agent_dir = state["agent_dir"]
+        self.carrying = state["carrying"]
+        self.step_count = state["step_count"]
+        self.max_steps = state["max_steps"]
+        self.mission = state["mission"]
+        self.np_random.bit_generator.state = state["np_random"]
+
     def hash(self, size=16):
         """Compute a hash that uniquely identifies the current state of the environment.
         :param size: Size of the hashing
@@ -168,6 +235,17 @@ class MiniGridEnv(gym.Env):
 
         return sample_hash.hexdigest()[:size]
 
+    def zobrist_hash(self) -> int:
+        """
+        64-bit Zobrist hash of the grid and agent position and direction,
+        updated incrementally as the grid changes (see `Grid.zobrist_hash`),
+        for hashing states at every step
+        """
+
+        _, agent_keys = zobrist_keys(self.width, self.height)
+        x, y = self.agent_pos
+        return self.grid.zobrist_hash() ^ agent_keys.item(x, y, self.agent_dir)
+
     @property
     def steps_remaining(self):
         return self.max_steps - self.step_count
@@ -625,15 +703,63 @@ class MiniGridEnv(gym.Env):
 
         return grid, vis_mask
 
+    def gen_obs_view(self, agent_view_size=None):
+        """
+        Generate the encoding of the sub-grid observed by the agent, without
+        the carried object nor the hidden cells removed, and its visibility
+        mask, gathered directly from the grid encoding
+        if agent_view_size is None, self.agent_view_size is used
+        """
+
+        agent_view_size = agent_view_size or self.agent_view_size
+        agent_pos = agent_view_size // 2, agent_view_size - 1
+
+        image = extract_views(
+            self.grid.encoding[None],
+            np.asarray(self.agent_pos)[None],
+            np.asarray(self.agent_dir)[None],
+            agent_view_size,
+        )[0]
+
+        # Process occluders and visibility
+        if not self.see_through_walls:
+            vis_mask = process_vis_single(opaque(image), agent_pos)
+        else:
+            vis_mask = np.ones(image.shape[:2], dtype=bool)
+
+        return image, vis_mask
+
+    def gen_obs_image(self, agent_view_size=None):
+        """
+        Generate the encoding of the sub-grid observed by the agent, like
+        encoding the output of `gen_obs_grid` with its visibility mask, but
+        gathered directly from the grid encoding without building any
+        intermediate grid.
+        if agent_view_size is None, self.agent_view_size is used
+        """
+
+        agent_view_size = agent_view_size or self.agent_view_size
+        agent_pos = agent_view_size // 2, agent_view_size - 1
+
+        image, vis_mask = self.gen_obs_view(agent_view_size)
+
+        # Make it so the agent sees what it's carrying
+        if self.carrying:
+            image[agent_pos] = self.carrying.encode()
+        else:
+            image[agent_pos] = EMPTY_ENCODING
+
+        image[~vis_mask] = 0
+
+        return image
+
     def gen_obs(self):
         """
         Generate the agent's view (partially observable, low-resolution encoding)
         """
 
-        grid, vis_mask = self.gen_obs_grid()
-
         # Encode the partially observable view into a numpy array
-        image = grid.encode(vis_mask)
+        image = self.gen_obs_image()
 
         # Observations are dictionaries containing:
         # - an image (partially observable view of the environment)
@@ -664,41 +790,26 @@ class MiniGridEnv(gym.Env):
         Render a non-paratial observation for visualization
         """
         # Compute which cells are visible to the agent
-        _, vis_mask = self.gen_obs_grid()
-
-        # Compute the world coordinates of the bottom-left corner
-        # of the agent's view area
-        f_vec = self.dir_vec
-        r_vec = self.right_vec
-        top_left = (
-            self.agent_pos
-            + f_vec * (self.agent_view_size - 1)
-            - r_vec * (self.agent_view_size // 2)
-        )
-
-        # Mask of which cells to highlight
-        highlight_mask = np.zeros(shape=(self.width, self.height), dtype=bool)
-
-        # For each cell in the visibility mask
-        for vis_j in range(0, self.agent_view_size):
-            for vis_i in range(0, self.agent_view_size):
-                # If this cell is not visible, don't highlight it
-                if not vis_mask[vis_i, vis_j]:
-                    continue
+        _, vis_mask = self.gen_obs_view()
 
-                # Compute the world coordinates of this cell
-                abs_i, abs_j = top_left - (f_vec * vis_j) + (r_vec * vis_i)
+        # Compute the world coordinates of the cells of the agent's view
+        coords = np.asarray(self.agent_pos) + view_offsets(self.agent_view_size)[
+            self.agent_dir
+        ]
+        abs_i, abs_j = coords[..., 0], coords[..., 1]
 
-                if abs_i < 0 or abs_i >= self.width:
-                    continue
-                if abs_j < 0 or abs_j >= self.height:
-                    continue
-
-                # Mark this cell to be highlighted
-                highlight_mask[abs_i, abs_j] = True
+        # Highlight the visible cells inside the grid
+        inside = (
+            (0 <= abs_i) & (abs_i < self.width) & (0 <= abs_j) & (abs_j < self.height)
+        )
+        visible = vis_mask & inside
+        highlight_mask = np.zeros(shape=(self.width, self.height), dtype=bool)
+        highlight_mask[abs_i[visible], abs_j[visible]] = True
 
-        # Render the whole grid
-        img = self.grid.render(
+        # Render the whole grid, only redrawing the cells that changed since
+        # the previous frame
+        img = self.frame_renderer.render(
+            self.grid,
             tile_size,
             self.agent_pos,
             self.agent_dir,
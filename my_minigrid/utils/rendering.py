@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import math
 
 import numpy as np
@@ -25,18 +26,32 @@ def downsample(img, factor):
 def fill_coords(img, fn, color):
     """
     Fill pixels of an image with coordinates matching a filter function
+
+    The filter function is evaluated once, on the arrays of the coordinates
+    of all the pixels.
     """
 
-    for y in range(img.shape[0]):
-        for x in range(img.shape[1]):
-            yf = (y + 0.5) / img.shape[0]
-            xf = (x + 0.5) / img.shape[1]
-            if fn(xf, yf):
-                img[y, x] = color
+    xf, yf = pixel_coords(img.shape[1], img.shape[0])
+    img[fn(xf, yf)] = color
 
     return img
 
 
+@functools.lru_cache(maxsize=None)
+def pixel_coords(width, height):
+    """
+    Coordinates of the centers of the pixels of an image, normalized to [0, 1]
+    """
+
+    xf = (np.arange(width) + 0.5) / width
+    yf = (np.arange(height) + 0.5) / height
+    xf, yf = np.meshgrid(xf, yf)
+    xf.setflags(write=False)
+    yf.setflags(write=False)
+
+    return xf, yf
+
+
 def rotate_fn(fin, cx, cy, theta):
     def fout(x, y):
         x = x - cx
@@ -64,19 +79,19 @@ def point_in_line(x0, y0, x1, y1, r):
 
     def fn(x, y):
         # Fast, early escape test
-        if x < xmin or x > xmax or y < ymin or y > ymax:
-            return False
+        inside = (x >= xmin) & (x <= xmax) & (y >= ymin) & (y <= ymax)
 
-        q = np.array([x, y])
-        pq = q - p0
+        pqx = x - p0[0]
+        pqy = y - p0[1]
 
         # Closest point on line
-        a = np.dot(pq, dir)
+        a = pqx * dir[0] + pqy * dir[1]
         a = np.clip(a, 0, dist)
-        p = p0 + a * dir
+        px = p0[0] + a * dir[0]
+        py = p0[1] + a * dir[1]
 
-        dist_to_line = np.linalg.norm(q - p)
-        return dist_to_line <= r
+        dist_to_line = np.sqrt((x - px) * (x - px) + (y - py) * (y - py))
+        return inside & (dist_to_line <= r)
 
     return fn
 
@@ -90,7 +105,7 @@ def point_in_circle(cx, cy, r):
 
 def point_in_rect(xmin, xmax, ymin, ymax):
     def fn(x, y):
-        return x >= xmin and x <= xmax and y >= ymin and y <= ymax
+        return (x >= xmin) & (x <= xmax) & (y >= ymin) & (y <= ymax)
 
     return fn
 
@@ -100,25 +115,28 @@ def point_in_triangle(a, b, c):
     b = np.array(b, dtype=np.float32)
     c = np.array(c, dtype=np.float32)
 
+    v0 = c - a
+    v1 = b - a
+
+    # Compute dot products
+    dot00 = np.dot(v0, v0)
+    dot01 = np.dot(v0, v1)
+    dot11 = np.dot(v1, v1)
+    inv_denom = 1 / (dot00 * dot11 - dot01 * dot01)
+
     def fn(x, y):
-        v0 = c - a
-        v1 = b - a
-        v2 = np.array((x, y)) - a
+        v2x = x - a[0]
+        v2y = y - a[1]
 
-        # Compute dot products
-        dot00 = np.dot(v0, v0)
-        dot01 = np.dot(v0, v1)
-        dot02 = np.dot(v0, v2)
-        dot11 = np.dot(v1, v1)
-        dot12 = np.dot(v1, v2)
+        dot02 = v0[0] * v2x + v0[1] * v2y
+        dot12 = v1[0] * v2x + v1[1] * v2y
 
         # Compute barycentric coordinates
-        inv_denom = 1 / (dot00 * dot11 - dot01 * dot01)
         u = (dot11 * dot02 - dot01 * dot12) * inv_denom
         v = (dot00 * dot12 - dot01 * dot02) * inv_denom
 
         # Check if point is in triangle
-        return (u >= 0) and (v >= 0) and (u + v) < 1
+        return (u >= 0) & (v >= 0) & ((u + v) < 1)
 
     return fn
 
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+from typing import Any
+
+import gymnasium as gym
+import numpy as np
+
+from my_minigrid.core.actions import Actions
+from my_minigrid.core.constants import COLOR_TO_IDX, DIR_TO_VEC, OBJECT_TO_IDX, STATE_TO_IDX
+from my_minigrid.core.view import (
+    EMPTY_ENCODING,
+    extract_views,
+    opaque,
+    process_vis,
+)
+from my_minigrid.core.zobrist import hash_states
+
+# Environments whose dynamics are implemented by `VectorMiniGridEnv`
+SUPPORTED_ENVS = ("EmptyEnv", "DoorKeyEnv", "CrossingEnv", "GoToRedBallGrey")
+
+DIR_VECS = np.array(DIR_TO_VEC)
+
+OVERLAP_TYPES = [OBJECT_TO_IDX[t] for t in ("empty", "goal", "floor", "lava")]
+PICKUP_TYPES = [OBJECT_TO_IDX[t] for t in ("key", "ball", "box")]
+
+
+class VectorMiniGridEnv(gym.Env):
+    """
+    Batched MiniGrid engine, stepping several environments at once with
+    NumPy array operations.
+
+    The N grids are stored as a (N, width, height, 3) array of cell
+    encodings, as produced by `Grid.encode`, along with the agents
+    positions, directions and carried objects. Moving, turning, picking up,
+    dropping, toggling, the view extraction and the occlusion are computed
+    for all the environments together instead of going through `WorldObj`
+    instances one environment at a time.
+
+    The given environments are only used to generate the levels: when an
+    episode starts, the corresponding environment is reset and its grid is
+    encoded in the arrays. Environments are reset automatically when their
+    episode ends, like in `torch_ac`'s `ParallelEnv`, which this class can
+    replace. `reset` and `step` return the observations as a dict of
+    batched entries: a (N, view_size, view_size, 3) "image" array, a (N,)
+    "direction" array and a list of "mission" strings.
+
+    Only the environments of `SUPPORTED_ENVS`, whose dynamics are the
+    default `MiniGridEnv.step` or a BabyAI "go to" instruction, are
+    supported. Boxes are assumed to be empty.
+    """
+
+    def __init__(self, envs: list[gym.Env]):
+        assert len(envs) >= 1, "No environment given."
+
+        first = envs[0].unwrapped
+        for env in envs:
+            env = env.unwrapped
+            assert (
+                type(env).__name__ in SUPPORTED_ENVS
+            ), f"Unsupported environment: {type(env).__name__}"
+            assert (env.width, env.height) == (first.width, first.height)
+            assert env.agent_view_size == first.agent_view_size
+            assert env.see_through_walls == first.see_through_walls
+
+        self.envs = envs
+        self.num_envs = len(envs)
+        self.observation_space = envs[0].observation_space
+        self.action_space = envs[0].action_space
+
+        self.width = first.width
+        self.height = first.height
+        self.agent_view_size = first.agent_view_size
+        self.see_through_walls = first.see_through_walls
+
+        # BabyAI "go to" levels succeed when the agent faces a target
+        self.goto = hasattr(first, "instrs")
+
+        n = self.num_envs
+        self.grids = np.zeros((n, self.width, self.height, 3), dtype=np.uint8)
+        self.agent_pos = np.zeros((n, 2), dtype=np.int64)
+        self.agent_dir = np.zeros(n, dtype=np.int64)
+        self.carrying = np.tile(EMPTY_ENCODING, (n, 1))
+        self.step_count = np.zeros(n, dtype=np.int64)
+        self.max_steps = np.zeros(n, dtype=np.int64)
+        self.missions = [None] * n
+
+        # Positions of the objects to go to and their (type, color)
+        self.targets = np.zeros((n, self.width, self.height), dtype=bool)
+        self.target_types = np.zeros((n, 2), dtype=np.uint8)
+
+    def reset(self, *, seed=None, options=None):
+        for i in range(self.num_envs):
+            self._reset_env(i)
+        return self.gen_obs()
+
+    def _reset_env(self, i: int):
+        """
+        Generate a new level for the environment `i`
+        """
+
+        self.envs[i].reset()
+        env = self.envs[i].unwrapped
+
+        self.grids[i] = env.grid.encode()
+        self.agent_pos[i] = env.agent_pos
+        self.agent_dir[i] = env.agent_dir
+        self.carrying[i] = EMPTY_ENCODING
+        self.step_count[i] = 0
+        self.max_steps[i] = env.max_steps
+        self.missions[i] = env.mission
+
+        if self.goto:
+            desc = env.instrs.desc
+            self.targets[i] = False
+            for x, y in desc.obj_poss:
+                self.targets[i, x, y] = True
+            self.target_types[i] = (OBJECT_TO_IDX[desc.type], COLOR_TO_IDX[desc.color])
+
+    def _reward(self) -> np.ndarray:
+        """
+        Compute the rewards to be given upon success
+        """
+
+        return 1 - 0.9 * (self.step_count / self.max_steps)
+
+    def step(self, actions):
+        actions = np.asarray(actions)
+        if np.any((actions < 0) | (actions >= len(Actions))):
+            raise ValueError(f"Unknown action in: {actions}")
+
+        envs = np.arange(self.num_envs)
+        self.step_count += 1
+
+        reward = np.zeros(self.num_envs)
+        terminated = np.zeros(self.num_envs, dtype=bool)
+
+        # Get the positions in front of the agents and their contents
+        fwd_pos = self.agent_pos + DIR_VECS[self.agent_dir]
+        fwd_x, fwd_y = fwd_pos[:, 0], fwd_pos[:, 1]
+        fwd_cells = self.grids[envs, fwd_x, fwd_y]
+        fwd_types = fwd_cells[:, 0]
+        carried = self.carrying[:, 0] != OBJECT_TO_IDX["empty"]
+
+        # Rotate left or right
+        left = actions == Actions.left
+        right = actions == Actions.right
+        self.agent_dir[left] = (self.agent_dir[left] - 1) % 4
+        self.agent_dir[right] = (self.agent_dir[right] + 1) % 4
+
+        # Move forward
+        forward = actions == Actions.forward
+        open_door = (fwd_types == OBJECT_TO_IDX["door"]) & (
+            fwd_cells[:, 2] == STATE_TO_IDX["open"]
+        )
+        moved = forward & (np.isin(fwd_types, OVERLAP_TYPES) | open_door)
+        self.agent_pos[moved] = fwd_pos[moved]
+
+        goal = forward & (fwd_types == OBJECT_TO_IDX["goal"])
+        terminated |= goal
+        reward = np.where(goal, self._reward(), reward)
+        terminated |= forward & (fwd_types == OBJECT_TO_IDX["lava"])
+
+        # Pick up an object
+        picked = (
+            (actions == Actions.pickup) & np.isin(fwd_types, PICKUP_TYPES) & ~carried
+        )
+        self.carrying[picked] = fwd_cells[picked]
+        self.grids[envs[picked], fwd_x[picked], fwd_y[picked]] = EMPTY_ENCODING
+
+        # Drop an object
+        dropped = (
+            (actions == Actions.drop)
+            & (fwd_types == OBJECT_TO_IDX["empty"])
+            & carried
+        )
+        self.grids[envs[dropped], fwd_x[dropped], fwd_y[dropped]] = self.carrying[
+            dropped
+        ]
+        if self.goto:
+            # Dropping a target updates its position
+            moved_target = dropped & np.all(
+                self.carrying[:, :2] == self.target_types, axis=1
+            )
+            self.targets[moved_target] = False
+            self.targets[
+                envs[moved_target], fwd_x[moved_target], fwd_y[moved_target]
+            ] = True
+        self.carrying[dropped] = EMPTY_ENCODING
+
+        # Toggle a door: unlock it with a key of the same color, or open or
+        # close it. Toggling a box replaces it by its (empty) contents.
+        toggle = actions == Actions.toggle
+        door = toggle & (fwd_types == OBJECT_TO_IDX["door"])
+        state = fwd_cells[:, 2]
+        locked = state == STATE_TO_IDX["locked"]
+        unlocked = (
+            locked
+            & (self.carrying[:, 0] == OBJECT_TO_IDX["key"])
+            & (self.carrying[:, 1] == fwd_cells[:, 1])
+        )
+        new_state = np.where(
+            locked,
+            np.where(unlocked, STATE_TO_IDX["open"], state),
+            np.where(
+                state == STATE_TO_IDX["open"],
+                STATE_TO_IDX["closed"],
+                STATE_TO_IDX["open"],
+            ),
+        )
+        self.grids[envs[door], fwd_x[door], fwd_y[door], 2] = new_state[door]
+        box = toggle & (fwd_types == OBJECT_TO_IDX["box"])
+        self.grids[envs[box], fwd_x[box], fwd_y[box]] = EMPTY_ENCODING
+
+        # Check whether the agents go to their target
+        if self.goto:
+            front_pos = self.agent_pos + DIR_VECS[self.agent_dir]
+            success = self.targets[envs, front_pos[:, 0], front_pos[:, 1]]
+            terminated |= success
+            reward = np.where(success, self._reward(), reward)
+
+        truncated = self.step_count >= self.max_steps
+
+        for i in np.flatnonzero(terminated | truncated):
+            self._reset_env(i)
+
+        obs = self.gen_obs()
+        infos = tuple({} for _ in range(self.num_envs))
+
+        return obs, reward, terminated, truncated, infos
+
+    def gen_obs(self) -> dict[str, Any]:
+        """
+        Generate the agents views (partially observable, low-resolution
+        encodings), like `MiniGridEnv.gen_obs` for each environment
+        """
+
+        sz = self.agent_view_size
+        agent_view_pos = (sz // 2, sz - 1)
+
+        image = extract_views(self.grids, self.agent_pos, self.agent_dir, sz)
+
+        # Process occluders and visibility
+        if not self.see_through_walls:
+            vis_mask = process_vis(opaque(image), agent_view_pos)
+        else:
+            vis_mask = np.ones(image.shape[:3], dtype=bool)
+
+        # Make it so the agents see what they are carrying
+        image[:, agent_view_pos[0], agent_view_pos[1]] = self.carrying
+        image[~vis_mask] = 0
+
+        return {
+            "image": image,
+            "direction": self.agent_dir.copy(),
+            "mission": list(self.missions),
+        }
+
+    def zobrist_hash(self) -> np.ndarray:
+        """
+        Zobrist hashes of the states of the environments, like
+        `MiniGridEnv.zobrist_hash` for each environment
+        """
+
+        return hash_states(self.grids, self.agent_pos, self.agent_dir)
+
+    def render(self):
+        raise NotImplementedError
@@ -12,6 +12,7 @@ from gymnasium.core import ObservationWrapper, ObsType, Wrapper
 
 from my_minigrid.core.constants import COLOR_TO_IDX, OBJECT_TO_IDX, STATE_TO_IDX
 from my_minigrid.core.world_object import Goal
+from my_minigrid.core.zobrist import CountMinSketch, hash_grids, hash_states
 
 
 class ReseedWrapper(Wrapper):
@@ -187,6 +188,81 @@ class PositionBonus(Wrapper):
         return obs, reward, terminated, truncated, info
 
 
+class NoveltyBonus(Wrapper):
+    """
+    Adds a count-based exploration bonus ``scale / sqrt(count)``, like
+    :class:`PositionBonus`, but counting full states or observations.
+
+    States are keyed on the Zobrist hash of the grid and agent position and
+    direction (``key="state"``), observations on the Zobrist hash of their
+    image (``key="obs"``). Unlike the dicts of :class:`PositionBonus` and
+    :class:`ActionBonus`, the counts are kept in a count-min sketch of
+    ``depth`` rows of ``width`` counters, so the memory used is fixed
+    (``4 * width * depth`` bytes) however many states are visited. The
+    counts can only be overestimated, when counters are shared by several
+    states.
+
+    Example:
+        >>> import gymnasium as gym
+        >>> from my_minigrid.wrappers import NoveltyBonus
+        >>> env = gym.make("MiniGrid-Empty-5x5-v0")
+        >>> env_bonus = NoveltyBonus(env)
+        >>> _, _ = env_bonus.reset(seed=0)
+        >>> _, reward, _, _, _ = env_bonus.step(1)
+        >>> print(reward)
+        1.0
+        >>> _, reward, _, _, _ = env_bonus.step(0)
+        >>> _, reward, _, _, _ = env_bonus.step(1)
+        >>> print(reward)
+        0.7071067811865475
+    """
+
+    def __init__(self, env, key="state", scale=1.0, width=2**20, depth=4):
+        """A wrapper that adds an exploration bonus to less visited states.
+
+        Args:
+            env: The environment to apply the wrapper
+            key: "state" to count the states of the environment, "obs" to
+                count the observations
+            scale: The bonus of a state visited once
+            width: The number of counters per row of the count-min sketch,
+                a power of 2, at least 2
+            depth: The number of rows of the count-min sketch
+        """
+        assert key in ("state", "obs"), key
+        super().__init__(env)
+        self.key = key
+        self.scale = scale
+        self.counts = CountMinSketch(width, depth)
+
+    def state_hash(self) -> int:
+        env = self.unwrapped
+        if hasattr(env, "zobrist_hash"):
+            return env.zobrist_hash()
+        return hash_states(
+            env.grid.encode()[None],
+            np.array([env.agent_pos]),
+            np.array([env.agent_dir]),
+        )[0]
+
+    def step(self, action):
+        """Steps through the environment with `action`."""
+        obs, reward, terminated, truncated, info = self.env.step(action)
+
+        # We use the state or observation after the update
+        if self.key == "state":
+            key = self.state_hash()
+        else:
+            key = hash_grids(obs["image"][None])[0]
+
+        new_count = self.counts.add([key])[0]
+
+        bonus = self.scale / math.sqrt(new_count)
+        reward += bonus
+
+        return obs, reward, terminated, truncated, info
+
+
 class ImgObsWrapper(ObservationWrapper):
     """
     Use the image as the only observation output, no language/mission.
@@ -84,29 +84,113 @@ class ACModel(nn.Module, torch_ac.RecurrentACModel):
         return self.image_embedding_size
 
     def forward(self, obs, memory):
-        x = obs.image.transpose(1, 3).transpose(2, 3)
+        x = self._get_embed_image(obs.image)
+        embedding, memory = self._get_embed_memory(x, memory)
+
+        dist, value = self._get_dist_value(obs, embedding)
+
+        return dist, value, memory
+
+    def act(self, obs, memory):
+        """Samples the actions of the observations, as `forward` followed
+        by sampling its distribution, but with the Gumbel-max trick on the
+        log-probabilities, without building a distribution.
+
+        Returns the actions, their log-probabilities, the values and the
+        memory."""
+
+        x = self._get_embed_image(obs.image)
+        embedding, memory = self._get_embed_memory(x, memory)
+
+        logits, value = self._get_logits_value(obs, embedding)
+
+        # argmax(logits + G) with G = -log(E) Gumbel noise, E ~ Exp(1)
+        noise = torch.empty_like(logits).exponential_().log()
+        action = (logits - noise).argmax(dim=1)
+        log_prob = logits.gather(1, action.unsqueeze(1)).squeeze(1)
+
+        return action, log_prob, value, memory
+
+    def forward_sequence(self, obs, memory, mask):
+        """Runs the model on B sequences of R consecutive steps, the steps
+        of a sequence being consecutive rows of `obs` and `mask`, from the
+        (B, memory_size) `memory` before their first step. As in `forward`,
+        the memory is multiplied by the mask of a step before the step.
+
+        The LSTM is unrolled over the steps with the kernel of `nn.LSTM`,
+        in one call per run of steps without a reset (a step whose mask is
+        0 in some sequence). Returns the distributions and values of the
+        B * R steps, and the memory after the last step."""
+
+        x = self._get_embed_image(obs.image)
+
+        if self.use_memory:
+            num_sequences = memory.shape[0]
+            mask = mask.reshape(num_sequences, -1)
+            num_steps = mask.shape[1]
+
+            # (B * R) x D -> R x B x D
+            x = x.reshape(num_sequences, num_steps, -1).transpose(0, 1)
+
+            resets = ((mask[:, 1:] == 0).any(dim=0).nonzero().squeeze(1) + 1).tolist()
+            weights = [self.memory_rnn.weight_ih, self.memory_rnn.weight_hh,
+                       self.memory_rnn.bias_ih, self.memory_rnn.bias_hh]
+
+            h = memory[:, :self.semi_memory_size].unsqueeze(0)
+            c = memory[:, self.semi_memory_size:].unsqueeze(0)
+            outputs = []
+            for start, end in zip([0] + resets, resets + [num_steps]):
+                step_mask = mask[:, start].reshape(1, -1, 1)
+                output, h, c = torch.lstm(x[start:end], (h * step_mask, c * step_mask), weights,
+                                          True, 1, 0.0, self.training, False, False)
+                outputs.append(output)
+
+            # R x B x D -> (B * R) x D
+            embedding = torch.cat(outputs).transpose(0, 1).reshape(num_sequences * num_steps, -1)
+            memory = torch.cat((h[0], c[0]), dim=1).float()
+        else:
+            embedding = x
+
+        dist, value = self._get_dist_value(obs, embedding)
+
+        return dist, value, memory
+
+    def _get_embed_image(self, image):
+        x = image.transpose(1, 3).transpose(2, 3)
         x = self.image_conv(x)
-        x = x.reshape(x.shape[0], -1)
+        return x.reshape(x.shape[0], -1)
 
+    def _get_embed_memory(self, x, memory):
         if self.use_memory:
             hidden = (memory[:, :self.semi_memory_size], memory[:, self.semi_memory_size:])
             hidden = self.memory_rnn(x, hidden)
             embedding = hidden[0]
-            memory = torch.cat(hidden, dim=1)
+            memory = torch.cat(hidden, dim=1).float()
         else:
             embedding = x
 
+        return embedding, memory
+
+    def _get_dist_value(self, obs, embedding):
+        logits, value = self._get_logits_value(obs, embedding)
+        dist = Categorical(logits=logits)
+
+        return dist, value
+
+    def _get_logits_value(self, obs, embedding):
         if self.use_text:
             embed_text = self._get_embed_text(obs.text)
             embedding = torch.cat((embedding, embed_text), dim=1)
 
+        # The log-probabilities and the value are computed in float32
+        # under autocast, as the memory
         x = self.actor(embedding)
-        dist = Categorical(logits=F.log_softmax(x, dim=1))
+        logits = F.log_softmax(x.float(), dim=1)
 
         x = self.critic(embedding)
-        value = x.squeeze(1)
+        value = x.squeeze(1).float()
 
-        return dist, value, memory
+        return logits, value
 
     # def get_embedding(self, obs):
     #     x = obs.image.transpose(1, 3).transpose(2, 3)
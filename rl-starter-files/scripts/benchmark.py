@@ -0,0 +1,162 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+import argparse
+import copy
+import time
+import torch
+import torch_ac
+from torch.distributions.categorical import Categorical
+from torch_ac.utils.penv import ParallelEnv
+
+import utils
+from utils import device
+from model import ACModel
+
+
+# (use_amp, use_compile) of the modes of training
+MODES = {
+    "fp32": (False, False),
+    "amp": (True, False),
+    "compile": (False, True),
+    "amp+compile": (True, True),
+}
+
+# Parse arguments
+
+parser = argparse.ArgumentParser()
+parser.add_argument(
+    "--env",
+    default="MiniGrid-DoorKey-5x5-v0",
+    help="name of the environment to train on (default: MiniGrid-DoorKey-5x5-v0)",
+)
+parser.add_argument("--seed", type=int, default=1, help="random seed (default: 1)")
+parser.add_argument(
+    "--procs", type=int, default=16, help="number of processes (default: 16)"
+)
+parser.add_argument(
+    "--frames-per-proc",
+    type=int,
+    default=128,
+    help="number of frames per process before update (default: 128)",
+)
+parser.add_argument(
+    "--updates",
+    type=int,
+    default=5,
+    help="number of PPO updates timed, after a first one compiling the model (default: 5)",
+)
+parser.add_argument(
+    "--recurrence",
+    type=int,
+    default=1,
+    help="number of time-steps gradient is backpropagated (default: 1). If > 1, a LSTM is added to the model to have memory.",
+)
+parser.add_argument(
+    "--text",
+    action="store_true",
+    default=False,
+    help="add a GRU to the model to handle text input",
+)
+parser.add_argument(
+    "--modes",
+    nargs="+",
+    default=list(MODES),
+    choices=list(MODES),
+    help="modes of training to benchmark (default: all)",
+)
+parser.add_argument(
+    "--amp-atol",
+    type=float,
+    default=0.05,
+    help="largest difference of log-probabilities with fp32 allowed in mixed precision (default: 0.05)",
+)
+parser.add_argument(
+    "--atol",
+    type=float,
+    default=1e-4,
+    help="largest difference of log-probabilities with fp32 allowed in fp32 (default: 1e-4)",
+)
+
+
+def make_algo(args, use_amp, use_compile):
+    """Creates the PPO algorithm of a mode, its model being initialized
+    with the same weights in every mode."""
+
+    utils.seed(args.seed)
+    envs = [utils.make_env(args.env, args.seed + 10000 * i) for i in range(args.procs)]
+    obs_space, preprocess_obss = utils.get_obss_preprocessor(envs[0].observation_space)
+    acmodel = ACModel(obs_space, envs[0].action_space, args.recurrence > 1, args.text)
+
+    return torch_ac.PPOAlgo(
+        ParallelEnv(envs),
+        acmodel,
+        device,
+        args.frames_per_proc,
+        recurrence=args.recurrence,
+        preprocess_obss=preprocess_obss,
+        use_amp=use_amp,
+        use_compile=use_compile,
+    )
+
+
+def measure_fps(algo, num_updates):
+    """Returns the frames per second of `num_updates` updates, collection
+    included, after a first update compiling the model."""
+
+    exps, _ = algo.collect_experiences()
+    algo.update_parameters(exps)
+
+    start_time = time.time()
+    for _ in range(num_updates):
+        exps, _ = algo.collect_experiences()
+        algo.update_parameters(exps)
+    if device.type == "cuda":
+        torch.cuda.synchronize()
+
+    return num_updates * algo.num_frames / (time.time() - start_time)
+
+
+def max_log_prob_error(algo):
+    """Returns the largest difference between the log-probabilities of the
+    actions of a rollout stored by `algo.collect_experiences`, the ones of
+    the ratio of PPO, and the ones given by its model in eager fp32."""
+
+    eager_model = copy.deepcopy(algo.acmodel)
+    exps, _ = algo.collect_experiences()
+
+    with torch.no_grad():
+        if algo.acmodel.recurrent:
+            eager_dist, _, _ = eager_model(exps.obs, exps.memory * exps.mask)
+        else:
+            eager_dist, _ = eager_model(exps.obs)
+    eager_log_prob = Categorical(logits=eager_dist.logits).log_prob(exps.action)
+
+    return (exps.log_prob - eager_log_prob).abs().max().item()
+
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+
+    print(f"Device: {device}\n")
+
+    results = {}
+    for mode in args.modes:
+        algo = make_algo(args, *MODES[mode])
+        fps = measure_fps(algo, args.updates)
+        error = max_log_prob_error(algo)
+        results[mode] = (fps, error)
+
+    failed = False
+    base_fps = results[args.modes[0]][0]
+    print(f"{'mode':<12} {'FPS':>8} {'change':>8} {'log-prob error':>15}")
+    for mode, (fps, error) in results.items():
+        use_amp, _ = MODES[mode]
+        ok = error <= (args.amp_atol if use_amp else args.atol)
+        failed |= not ok
+        print(f"{mode:<12} {fps:8.0f} {100 * (fps / base_fps - 1):+7.1f}% {error:15.2e}"
+              f" {'' if ok else 'FAIL'}")
+
+    sys.exit(1 if failed else 0)
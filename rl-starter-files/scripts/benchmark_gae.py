@@ -0,0 +1,84 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+import argparse
+import time
+import torch
+from torch_ac.algos.gae import compute_gae
+
+
+# Parse arguments
+
+parser = argparse.ArgumentParser()
+parser.add_argument(
+    "--frames-per-proc",
+    type=int,
+    nargs="+",
+    default=[128, 256, 512, 1024, 2048],
+    help="numbers of frames per process of the rollouts (default: 128 256 512 1024 2048)",
+)
+parser.add_argument(
+    "--procs", type=int, default=16, help="number of processes (default: 16)"
+)
+parser.add_argument(
+    "--device", default="cpu", help="device of the rollout tensors (default: cpu)"
+)
+parser.add_argument(
+    "--num-runs",
+    type=int,
+    default=10,
+    help="number of times to compute the advantages of each rollout (default: 10)",
+)
+
+
+def gae_loop(rewards, values, masks, next_value, next_mask, discount, gae_lambda):
+    """Step by step computation of the advantages, as `compute_gae`."""
+
+    num_frames_per_proc = len(rewards)
+    advantages = torch.zeros_like(values)
+
+    for i in reversed(range(num_frames_per_proc)):
+        next_mask_ = masks[i+1] if i < num_frames_per_proc - 1 else next_mask
+        next_value_ = values[i+1] if i < num_frames_per_proc - 1 else next_value
+        next_advantage = advantages[i+1] if i < num_frames_per_proc - 1 else 0
+
+        delta = rewards[i] + discount * next_value_ * next_mask_ - values[i]
+        advantages[i] = delta + discount * gae_lambda * next_advantage * next_mask_
+
+    return advantages
+
+
+def benchmark_gae(num_frames_per_procs, num_procs, device, num_runs):
+    discount, gae_lambda = 0.99, 0.95
+
+    for num_frames_per_proc in num_frames_per_procs:
+        shape = (num_frames_per_proc, num_procs)
+        rewards = torch.rand(shape, device=device)
+        values = torch.randn(shape, device=device)
+        masks = (torch.rand(shape, device=device) > 0.01).float()
+        next_value = torch.randn(num_procs, device=device)
+        next_mask = torch.ones(num_procs, device=device)
+        args = (rewards, values, masks, next_value, next_mask, discount, gae_lambda)
+
+        times = []
+        for gae in (gae_loop, compute_gae):
+            gae(*args)
+            t0 = time.time()
+            for _ in range(num_runs):
+                gae(*args)
+            if device.type == "cuda":
+                torch.cuda.synchronize()
+            t1 = time.time()
+            times.append(1000 * (t1 - t0) / num_runs)
+
+        assert torch.equal(gae_loop(*args), compute_gae(*args))
+
+        print(f"T={num_frames_per_proc:<5} loop: {times[0]:7.2f} ms"
+              f"  compute_gae: {times[1]:6.2f} ms  speedup: {times[0] / times[1]:5.1f}x")
+
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    benchmark_gae(args.frames_per_proc, args.procs, torch.device(args.device), args.num_runs)
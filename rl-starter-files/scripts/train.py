@@ -10,6 +10,8 @@ import time
 import datetime
 import torch_ac
 import tensorboardX
+from torch_ac.utils.penv import ParallelEnv
+from my_minigrid.vector_env import VectorMiniGridEnv
 
 import utils
 from utils import device
@@ -52,6 +54,36 @@ parser.add_argument(
     default=10**7,
     help="number of frames of training (default: 1e7)",
 )
+parser.add_argument(
+    "--shared-memory",
+    action="store_true",
+    default=False,
+    help="send observations, rewards and dones through shared memory instead of pipes",
+)
+parser.add_argument(
+    "--envs-per-worker",
+    type=int,
+    default=1,
+    help="number of environments stepped by each worker process (default: 1)",
+)
+parser.add_argument(
+    "--env-batch-size",
+    type=int,
+    default=None,
+    help="step the environments asynchronously, computing actions for the first ENV_BATCH_SIZE environments done (default: synchronous)",
+)
+parser.add_argument(
+    "--reset-pool-size",
+    type=int,
+    default=0,
+    help="number of levels generated ahead of time for each environment (default: 0)",
+)
+parser.add_argument(
+    "--vector-env",
+    action="store_true",
+    default=False,
+    help="step the environments with the batched NumPy engine (Empty, DoorKey, Crossing and GoToRedBallGrey only)",
+)
 
 # Parameters for main algorithm
 parser.add_argument(
@@ -120,16 +152,43 @@ parser.add_argument(
     default=1,
     help="number of time-steps gradient is backpropagated (default: 1). If > 1, a LSTM is added to the model to have memory.",
 )
+parser.add_argument(
+    "--novelty-bonus",
+    type=float,
+    default=0,
+    help="coefficient of the count-based exploration bonus, 0 to disable it (default: 0)",
+)
+parser.add_argument(
+    "--novelty-width",
+    type=int,
+    default=2**20,
+    help="number of columns of the count-min sketch of the exploration bonus, a power of 2, at least 2, each taking 16 bytes (default: 2**20)",
+)
 parser.add_argument(
     "--text",
     action="store_true",
     default=False,
     help="add a GRU to the model to handle text input",
 )
+parser.add_argument(
+    "--amp",
+    action="store_true",
+    default=False,
+    help="run the model in mixed precision, bfloat16 on CPU and float16 on GPU, when acting and in the PPO updates",
+)
+parser.add_argument(
+    "--compile",
+    action="store_true",
+    default=False,
+    help="compile the model used for acting and the PPO loss with torch.compile",
+)
 
 if __name__ == "__main__":
     args = parser.parse_args()
 
+    if args.novelty_width < 2 or args.novelty_width & (args.novelty_width - 1):
+        parser.error("--novelty-width must be a power of 2, at least 2")
+
     args.mem = args.recurrence > 1
 
     # Set run dir
@@ -164,6 +223,16 @@ if __name__ == "__main__":
     envs = []
     for i in range(args.procs):
         envs.append(utils.make_env(args.env, args.seed + 10000 * i))
+    if args.vector_env:
+        penv = VectorMiniGridEnv(envs)
+    else:
+        penv = ParallelEnv(
+            envs,
+            shared_memory=args.shared_memory,
+            envs_per_worker=args.envs_per_worker,
+            batch_size=args.env_batch_size,
+            reset_pool_size=args.reset_pool_size,
+        )
     txt_logger.info("Environments loaded\n")
 
     # Load training status
@@ -192,9 +261,15 @@ if __name__ == "__main__":
 
     # Load algo
 
+    novelty_bonus = None
+    if args.novelty_bonus > 0:
+        novelty_bonus = torch_ac.NoveltyBonus(
+            args.novelty_bonus, args.novelty_width, device=device
+        )
+
     if args.algo == "a2c":
         algo = torch_ac.A2CAlgo(
-            envs,
+            penv,
             acmodel,
             device,
             args.frames_per_proc,
@@ -208,10 +283,13 @@ if __name__ == "__main__":
             args.optim_alpha,
             args.optim_eps,
             preprocess_obss,
+            novelty_bonus=novelty_bonus,
+            use_amp=args.amp,
+            use_compile=args.compile,
         )
     elif args.algo == "ppo":
         algo = torch_ac.PPOAlgo(
-            envs,
+            penv,
             acmodel,
             device,
             args.frames_per_proc,
@@ -227,10 +305,13 @@ if __name__ == "__main__":
             args.epochs,
             args.batch_size,
             preprocess_obss,
+            novelty_bonus=novelty_bonus,
+            use_amp=args.amp,
+            use_compile=args.compile,
         )
     elif args.algo == "icmppo":
         algo = torch_ac.ICMPPOAlgo(
-            envs,
+            penv,
             acmodel,
             device,
             args.frames_per_proc,
@@ -246,6 +327,9 @@ if __name__ == "__main__":
             args.epochs,
             args.batch_size,
             preprocess_obss,
+            novelty_bonus=novelty_bonus,
+            use_amp=args.amp,
+            use_compile=args.compile,
         )
     else:
         raise ValueError("Incorrect algorithm name: {}".format(args.algo))
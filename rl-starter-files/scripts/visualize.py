@@ -8,6 +8,7 @@ import numpy
 
 import utils
 from utils import device
+from my_minigrid.core.grid import Grid
 
 # Parse arguments
 
@@ -49,6 +50,12 @@ parser.add_argument(
 parser.add_argument(
     "--text", action="store_true", default=False, help="add a GRU to the model"
 )
+parser.add_argument(
+    "--tile-atlas",
+    type=str,
+    default=None,
+    help="file of the tile atlas, memory-mapped by every process rendering and created if missing (default: render the atlas in memory)",
+)
 
 args = parser.parse_args()
 
@@ -65,6 +72,8 @@ print(f"Device: {device}\n")
 env = utils.make_env(args.env, args.seed, render_mode="human")
 for _ in range(args.shift):
     env.reset()
+if args.tile_atlas:
+    Grid.prewarm_tiles(env.unwrapped.tile_size, path=args.tile_atlas)
 print("Environment loaded\n")
 
 # Load agent
@@ -26,9 +26,15 @@ def get_obss_preprocessor(obs_space):
         vocab = Vocabulary(obs_space["text"])
 
         def preprocess_obss(obss, device=None):
+            # Batched observations are used as is, without going through every observation
+            if isinstance(obss, torch_ac.ObsBatch):
+                images, texts = obss["image"], obss["mission"]
+            else:
+                images = [obs["image"] for obs in obss]
+                texts = [obs["mission"] for obs in obss]
             return torch_ac.DictList({
-                "image": preprocess_images([obs["image"] for obs in obss], device=device),
-                "text": preprocess_texts([obs["mission"] for obs in obss], vocab, device=device)
+                "image": preprocess_images(images, device=device),
+                "text": preprocess_texts(texts, vocab, device=device)
             })
 
         preprocess_obss.vocab = vocab
@@ -41,7 +47,7 @@ def get_obss_preprocessor(obs_space):
 
 def preprocess_images(images, device=None):
     # Bug of Pytorch: very slow if not first converted to numpy array
-    images = numpy.array(images)
+    images = numpy.asarray(images)
     return torch.tensor(images, device=device, dtype=torch.float)
 
 
@@ -0,0 +1,64 @@
+import numpy as np
+
+from my_minigrid.core.view import EMPTY_ENCODING
+from my_minigrid.core.grid import Grid
+from my_minigrid.core.world_object import Ball, Door, Key
+from my_minigrid.core.zobrist import hash_grids
+
+
+def fresh_encoding(grid: Grid) -> np.ndarray:
+    encoding = np.zeros((grid.width, grid.height, 3), dtype=np.uint8)
+    for j in range(grid.height):
+        for i in range(grid.width):
+            obj = grid.get(i, j)
+            encoding[i, j] = EMPTY_ENCODING if obj is None else obj.encode()
+    return encoding
+
+
+def check_encoding(grid: Grid):
+    encoding = fresh_encoding(grid)
+    assert np.array_equal(grid.encode(), encoding)
+    assert grid.zobrist_hash() == int(hash_grids(encoding[None])[0])
+
+
+def test_moved_objects_keep_updating_the_encoding():
+    grid = Grid(6, 6)
+    grid.wall_rect(0, 0, 6, 6)
+    door = Door("red", is_locked=True)
+    key = Key("blue")
+    grid.set(1, 1, door)
+    grid.set(2, 1, key)
+    grid.zobrist_hash()
+
+    # Move the door: set at the new cell, then clear the old one
+    grid.set(3, 3, door)
+    grid.set(1, 1, None)
+    assert door.owner == (grid, 3, 3)
+
+    door.is_locked = False
+    door.is_open = True
+    check_encoding(grid)
+
+    # Move the key the other way round
+    grid.set(2, 1, None)
+    grid.set(4, 2, key)
+    key.color = "green"
+    check_encoding(grid)
+
+    # Replace a moved object by another one
+    grid.set(3, 3, Ball("purple"))
+    assert door.owner is None
+    door.is_open = False
+    check_encoding(grid)
+
+
+def test_process_vis_keeps_owners_of_visible_cells():
+    grid = Grid(5, 5)
+    door = Door("yellow")
+    grid.set(2, 3, door)
+    grid.set(2, 1, door)
+    grid.set(2, 3, None)
+
+    grid.process_vis((2, 4))
+    door.is_open = True
+    check_encoding(grid)
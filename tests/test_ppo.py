@@ -0,0 +1,72 @@
+import copy
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(ROOT, "torch-ac"))
+sys.path.insert(0, os.path.join(ROOT, "rl-starter-files"))
+
+import numpy as np
+import pytest
+import torch
+import torch_ac
+from torch_ac.utils.penv import ParallelEnv
+
+import utils
+from model import ACModel
+
+
+def make_algo(recurrence):
+    utils.seed(1)
+    envs = [utils.make_env("MiniGrid-DoorKey-5x5-v0", 1 + 10000 * i) for i in range(4)]
+    obs_space, preprocess_obss = utils.get_obss_preprocessor(envs[0].observation_space)
+    acmodel = ACModel(obs_space, envs[0].action_space, use_memory=True)
+    return torch_ac.PPOAlgo(ParallelEnv(envs), acmodel, "cpu", num_frames_per_proc=12,
+                            recurrence=recurrence, epochs=4, batch_size=24,
+                            preprocess_obss=preprocess_obss)
+
+
+def copy_exps(exps):
+    if isinstance(exps, dict):
+        return type(exps)({key: copy_exps(value) for key, value in exps.items()})
+    return exps.clone() if isinstance(exps, torch.Tensor) else copy.deepcopy(exps)
+
+
+def update(algo, exps, sequence_update):
+    """Updates the parameters of `algo` from a copy of `exps`, and returns
+    the logs, the parameters and the memories written back."""
+
+    algo.sequence_update = sequence_update
+    algo.batch_num = 0
+    np.random.seed(0)
+    exps = copy_exps(exps)
+    logs = algo.update_parameters(exps)
+    return logs, [p.detach().clone() for p in algo.acmodel.parameters()], exps.memory
+
+
+@pytest.mark.parametrize("recurrence", [2, 3])
+def test_sequence_update_matches_step_update(recurrence):
+    algo = make_algo(recurrence)
+    assert algo.sequence_update
+    exps, _ = algo.collect_experiences()
+    model_state = copy.deepcopy(algo.acmodel.state_dict())
+    optimizer_state = copy.deepcopy(algo.optimizer.state_dict())
+
+    results = []
+    for sequence_update in [True, False]:
+        algo.acmodel.load_state_dict(model_state)
+        algo.optimizer.load_state_dict(optimizer_state)
+        results.append(update(algo, exps, sequence_update))
+
+    (seq_logs, seq_params, seq_memory), (step_logs, step_params, step_memory) = results
+
+    # The memories read at the start of the sequences of an epoch are
+    # the ones written back by the previous epoch
+    starts = np.arange(0, algo.num_frames, recurrence)
+    starts = np.concatenate([starts, starts + recurrence // 2])
+    assert torch.allclose(seq_memory[starts], step_memory[starts], atol=1e-5)
+
+    for seq_param, step_param in zip(seq_params, step_params):
+        assert torch.allclose(seq_param, step_param, atol=1e-5)
+    for key in seq_logs:
+        assert seq_logs[key] == pytest.approx(step_logs[key], rel=1e-4, abs=1e-5)
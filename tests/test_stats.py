@@ -0,0 +1,33 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "torch-ac")))
+
+import pytest
+import torch
+from torch_ac.algos.stats import clip_grad_norms
+
+
+def make_parameters(scale):
+    torch.manual_seed(0)
+    parameters = [torch.nn.Parameter(torch.randn(4, 3)), torch.nn.Parameter(torch.randn(5))]
+    for p in parameters:
+        p.grad = scale * torch.randn_like(p)
+    return parameters
+
+
+@pytest.mark.parametrize("scale", [0.01, 10.0])
+@pytest.mark.parametrize("has_clip_grads_with_norm", [True, False])
+def test_clip_grad_norms_matches_clip_grad_norm(monkeypatch, scale, has_clip_grads_with_norm):
+    if not has_clip_grads_with_norm:
+        monkeypatch.delattr(torch.nn.utils, "clip_grads_with_norm_", raising=False)
+
+    parameters = make_parameters(scale)
+    expected_parameters = make_parameters(scale)
+    expected_norm = torch.nn.utils.clip_grad_norm_(expected_parameters, 0.5)
+
+    grad_norms = clip_grad_norms(parameters, 0.5)
+
+    assert torch.linalg.vector_norm(grad_norms).item() == pytest.approx(expected_norm.item())
+    for p, expected_p in zip(parameters, expected_parameters):
+        assert torch.allclose(p.grad, expected_p.grad)
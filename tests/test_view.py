@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from my_minigrid.core.grid import Grid
+from my_minigrid.core.view import (
+    MAX_LUT_WIDTH,
+    _sweep_vis,
+    opaque,
+    process_vis,
+    process_vis_single,
+)
+from my_minigrid.core.world_object import Door, Wall
+
+
+def reference_process_vis(opaque_mask: np.ndarray, agent_pos: tuple[int, int]) -> np.ndarray:
+    """The per-cell loop of `Grid.process_vis` before the lookup tables,
+    reading the opaque cells from a mask instead of the grid objects."""
+
+    width, height = opaque_mask.shape
+    mask = np.zeros(shape=(width, height), dtype=bool)
+
+    mask[agent_pos[0], agent_pos[1]] = True
+
+    for j in reversed(range(0, height)):
+        for i in range(0, width - 1):
+            if not mask[i, j]:
+                continue
+
+            if opaque_mask[i, j]:
+                continue
+
+            mask[i + 1, j] = True
+            if j > 0:
+                mask[i + 1, j - 1] = True
+                mask[i, j - 1] = True
+
+        for i in reversed(range(1, width)):
+            if not mask[i, j]:
+                continue
+
+            if opaque_mask[i, j]:
+                continue
+
+            mask[i - 1, j] = True
+            if j > 0:
+                mask[i - 1, j - 1] = True
+                mask[i, j - 1] = True
+
+    return mask
+
+
+@pytest.mark.parametrize("width", [1, 2, 3, 5, 7, MAX_LUT_WIDTH, MAX_LUT_WIDTH + 1, 11])
+@pytest.mark.parametrize("density", [0.1, 0.3, 0.6])
+def test_process_vis_paths_match_reference(width, density):
+    rng = np.random.default_rng(width * 100 + int(density * 10))
+    height = int(rng.integers(1, 10))
+    num_grids = 16
+
+    masks = rng.random((num_grids, width, height)) < density
+    for _ in range(8):
+        agent_pos = (int(rng.integers(width)), int(rng.integers(height)))
+        expected = np.stack([reference_process_vis(mask, agent_pos) for mask in masks])
+
+        assert np.array_equal(process_vis(masks, agent_pos), expected)
+        assert np.array_equal(_sweep_vis(masks, agent_pos), expected)
+        for mask, expected_mask in zip(masks, expected):
+            assert np.array_equal(process_vis_single(mask, agent_pos), expected_mask)
+
+
+@pytest.mark.parametrize("size", [7, MAX_LUT_WIDTH + 3])
+def test_opaque_cells_of_grid_views(size):
+    rng = np.random.default_rng(size)
+    for _ in range(10):
+        grid = Grid(size, size)
+        for i, j in zip(rng.integers(size, size=12), rng.integers(size, size=12)):
+            if rng.random() < 0.5:
+                grid.set(int(i), int(j), Wall())
+            else:
+                grid.set(int(i), int(j), Door("red", is_open=bool(rng.random() < 0.5)))
+
+        agent_pos = (size // 2, size - 1)
+        mask = opaque(grid.encode())
+        expected = reference_process_vis(mask, agent_pos)
+
+        assert np.array_equal(process_vis_single(mask, agent_pos), expected)
+        assert np.array_equal(grid.process_vis(agent_pos), expected)
@@ -0,0 +1,11 @@
+import pickle
+
+from my_minigrid.core.world_object import Floor, Wall
+
+
+def test_shared_objects_with_default_arguments():
+    assert Wall.shared() is Wall.shared("grey")
+    assert Wall.shared("grey") is Wall.shared()
+    assert Floor.shared() is Floor.shared("blue")
+    assert Wall.shared("red") is not Wall.shared()
+    assert pickle.loads(pickle.dumps(Wall.shared())) is Wall.shared("grey")
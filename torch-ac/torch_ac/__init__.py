@@ -1,3 +1,3 @@
 from torch_ac.algos import A2CAlgo, PPOAlgo, ICMPPOAlgo
 from torch_ac.model import ACModel, RecurrentACModel
-from torch_ac.utils import DictList
\ No newline at end of file
+from torch_ac.utils import DictList, NoveltyBonus, ObsBatch, ScalarReshapeReward, batched_reshape_reward
\ No newline at end of file
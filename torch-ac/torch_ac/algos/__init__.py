@@ -1,3 +1,4 @@
 from torch_ac.algos.a2c import A2CAlgo
 from torch_ac.algos.ppo import PPOAlgo
-from torch_ac.algos.icmppo import ICMPPOAlgo
\ No newline at end of file
+from torch_ac.algos.icmppo import ICMPPOAlgo
+from torch_ac.algos.gae import compute_gae
\ No newline at end of file
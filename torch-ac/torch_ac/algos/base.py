@@ -1,22 +1,31 @@
 from abc import ABC, abstractmethod
+import numpy
 import torch
 
+from torch_ac.algos.gae import compute_gae
 from torch_ac.format import default_preprocess_obss
-from torch_ac.utils import DictList, ParallelEnv
+from torch_ac.utils import DictList, ObsBatch, ObsBuffer, ParallelEnv
+from torch_ac.utils.reward import as_batched_reshape_reward
 
 
 class BaseAlgo(ABC):
     """The base class for RL algorithms."""
 
     def __init__(self, envs, acmodel, device, num_frames_per_proc, discount, lr, gae_lambda, entropy_coef,
-                 value_loss_coef, max_grad_norm, recurrence, preprocess_obss, reshape_reward):
+                 value_loss_coef, max_grad_norm, recurrence, preprocess_obss, reshape_reward,
+                 novelty_bonus=None, use_amp=False, use_compile=False):
         """
         Initializes a `BaseAlgo` instance.
 
         Parameters:
         ----------
-        envs : list
-            a list of environments that will be run in parallel
+        envs : list or ParallelEnv
+            a list of environments that will be run in parallel, or an
+            already created `ParallelEnv` (e.g. using shared memory). If
+            the `ParallelEnv` has a `batch_size`, experiences are collected
+            asynchronously, see `_collect_frames_async`. A vector environment
+            with the same interface, returning observations as a dict of
+            batched entries, can also be given
         acmodel : torch.Module
             the model
         num_frames_per_proc : int
@@ -41,12 +50,24 @@ class BaseAlgo(ABC):
             and converts them into the format that the model can handle
         reshape_reward : function
             a function that shapes the reward, takes an
-            (observation, action, reward, done) tuple as an input
+            (observation, action, reward, done) tuple as an input, or a
+            function shaping the rewards of a whole step, marked with
+            `batched_reshape_reward`
+        novelty_bonus : NoveltyBonus
+            a count-based exploration bonus added to the rewards, computed
+            from the batch of observations reached by a step
+        use_amp : bool
+            whether to run the model under autocast, in bfloat16 on CPU and
+            float16 on GPU, when acting and in the updates of PPO, which
+            needs torch 2.3 or later
+        use_compile : bool
+            whether to act with the model compiled by `torch.compile`, and
+            to compile the loss of PPO, which needs torch 2.3 or later
         """
 
         # Store parameters
 
-        self.env = ParallelEnv(envs)
+        self.env = ParallelEnv(envs) if isinstance(envs, (list, tuple)) else envs
         self.acmodel = acmodel
         self.device = device
         self.num_frames_per_proc = num_frames_per_proc
@@ -58,21 +79,39 @@ class BaseAlgo(ABC):
         self.max_grad_norm = max_grad_norm
         self.recurrence = recurrence
         self.preprocess_obss = preprocess_obss or default_preprocess_obss
-        self.reshape_reward = reshape_reward
+        self.reshape_reward = as_batched_reshape_reward(reshape_reward)
+        self.novelty_bonus = novelty_bonus
+        self.use_amp = use_amp
+        self.use_compile = use_compile
 
         # Control parameters
 
         assert self.acmodel.recurrent or self.recurrence == 1
         assert self.num_frames_per_proc % self.recurrence == 0
+        assert not (self.use_amp or self.use_compile) or torch.__version__ >= "2.3", \
+            "use_amp and use_compile need torch 2.3 or later."
 
         # Configure acmodel
 
         self.acmodel.to(self.device)
         self.acmodel.train()
+        self.act_model = torch.compile(self.acmodel) if self.use_compile else self.acmodel
+
+        # Models implementing `act` sample the actions of the rollouts
+        # without building distributions
+        self.model_act = getattr(self.acmodel, "act", None)
+        if self.model_act is not None and self.use_compile:
+            self.model_act = torch.compile(self.model_act)
+
+        # Configure autocast
+
+        self.device_type = torch.device(self.device or "cpu").type
+        self.amp_dtype = torch.float16 if self.device_type == "cuda" else torch.bfloat16
 
         # Store helpers values
 
-        self.num_procs = len(envs)
+        self.num_procs = self.env.num_envs
+        self.env_batch_size = getattr(self.env, "batch_size", None)
         self.num_frames = self.num_frames_per_proc * self.num_procs
 
         # Initialize experience values
@@ -80,7 +119,9 @@ class BaseAlgo(ABC):
         shape = (self.num_frames_per_proc, self.num_procs)
 
         self.obs = self.env.reset()
-        self.obss = [None] * (shape[0])
+        if isinstance(self.obs, dict):
+            self.obs = ObsBatch(self.obs)
+        self.obs_buffer = ObsBuffer(*shape)
         if self.acmodel.recurrent:
             self.memory = torch.zeros(shape[1], self.acmodel.memory_size, device=self.device)
             self.memories = torch.zeros(*shape, self.acmodel.memory_size, device=self.device)
@@ -94,9 +135,16 @@ class BaseAlgo(ABC):
 
         # Initialize log values
 
-        self.log_episode_return = torch.zeros(self.num_procs, device=self.device)
-        self.log_episode_reshaped_return = torch.zeros(self.num_procs, device=self.device)
-        self.log_episode_num_frames = torch.zeros(self.num_procs, device=self.device)
+        self.log_episode_return = numpy.zeros(self.num_procs, dtype=numpy.float32)
+        self.log_episode_reshaped_return = numpy.zeros(self.num_procs, dtype=numpy.float32)
+        self.log_episode_num_frames = numpy.zeros(self.num_procs, dtype=numpy.float32)
+
+        # Rewards of the environments, terminal statuses and (step, process)
+        # of the episode ends of the rollout, kept on the host by the steps
+        # for the log values and copied to the device once per rollout
+        self.log_rewards = numpy.zeros(shape, dtype=numpy.float32)
+        self.dones = numpy.zeros(shape, dtype=bool)
+        self.log_episode_ends = []
 
         self.log_done_counter = 0
         self.log_return = [0] * self.num_procs
@@ -124,73 +172,19 @@ class BaseAlgo(ABC):
             reward, policy loss, value loss, etc.
         """
 
-        for i in range(self.num_frames_per_proc):
-            # Do one agent-environment interaction
-
-            preprocessed_obs = self.preprocess_obss(self.obs, device=self.device)
-            with torch.no_grad():
-                if self.acmodel.recurrent:
-                    dist, value, memory = self.acmodel(preprocessed_obs, self.memory * self.mask.unsqueeze(1))
-                else:
-                    dist, value = self.acmodel(preprocessed_obs)
-            action = dist.sample()
-
-            obs, reward, terminated, truncated, _ = self.env.step(action.cpu().numpy())
-            done = tuple(a | b for a, b in zip(terminated, truncated))
-
-            # Update experiences values
-
-            self.obss[i] = self.obs
-            self.obs = obs
-            if self.acmodel.recurrent:
-                self.memories[i] = self.memory
-                self.memory = memory
-            self.masks[i] = self.mask
-            self.mask = 1 - torch.tensor(done, device=self.device, dtype=torch.float)
-            self.actions[i] = action
-            self.values[i] = value
-            if self.reshape_reward is not None:
-                self.rewards[i] = torch.tensor([
-                    self.reshape_reward(obs_, action_, reward_, done_)
-                    for obs_, action_, reward_, done_ in zip(obs, action, reward, done)
-                ], device=self.device)
-            else:
-                self.rewards[i] = torch.tensor(reward, device=self.device)
-            self.log_probs[i] = dist.log_prob(action)
-
-            # Update log values
-
-            self.log_episode_return += torch.tensor(reward, device=self.device, dtype=torch.float)
-            self.log_episode_reshaped_return += self.rewards[i]
-            self.log_episode_num_frames += torch.ones(self.num_procs, device=self.device)
-
-            for i, done_ in enumerate(done):
-                if done_:
-                    self.log_done_counter += 1
-                    self.log_return.append(self.log_episode_return[i].item())
-                    self.log_reshaped_return.append(self.log_episode_reshaped_return[i].item())
-                    self.log_num_frames.append(self.log_episode_num_frames[i].item())
-
-            self.log_episode_return *= self.mask
-            self.log_episode_reshaped_return *= self.mask
-            self.log_episode_num_frames *= self.mask
+        self._collect_frames()
 
         # Add advantage and return to experiences
 
         preprocessed_obs = self.preprocess_obss(self.obs, device=self.device)
-        with torch.no_grad():
+        with torch.no_grad(), self.autocast():
             if self.acmodel.recurrent:
-                _, next_value, _ = self.acmodel(preprocessed_obs, self.memory * self.mask.unsqueeze(1))
+                _, next_value, _ = self.act_model(preprocessed_obs, self.memory * self.mask.unsqueeze(1))
             else:
-                _, next_value = self.acmodel(preprocessed_obs)
+                _, next_value = self.act_model(preprocessed_obs)
 
-        for i in reversed(range(self.num_frames_per_proc)):
-            next_mask = self.masks[i+1] if i < self.num_frames_per_proc - 1 else self.mask
-            next_value = self.values[i+1] if i < self.num_frames_per_proc - 1 else next_value
-            next_advantage = self.advantages[i+1] if i < self.num_frames_per_proc - 1 else 0
-
-            delta = self.rewards[i] + self.discount * next_value * next_mask - self.values[i]
-            self.advantages[i] = delta + self.discount * self.gae_lambda * next_advantage * next_mask
+        self.advantages = compute_gae(self.rewards, self.values, self.masks, next_value, self.mask,
+                                      self.discount, self.gae_lambda)
 
         # Define experiences:
         #   the whole experience is the concatenation of the experience
@@ -201,9 +195,7 @@ class BaseAlgo(ABC):
         #   - D is the dimensionality.
 
         exps = DictList()
-        exps.obs = [self.obss[i][j]
-                    for j in range(self.num_procs)
-                    for i in range(self.num_frames_per_proc)]
+        exps.obs = self.obs_buffer.flatten()
         if self.acmodel.recurrent:
             # T x P x D -> P x T x D -> (P * T) x D
             exps.memory = self.memories.transpose(0, 1).reshape(-1, *self.memories.shape[2:])
@@ -217,10 +209,6 @@ class BaseAlgo(ABC):
         exps.returnn = exps.value + exps.advantage
         exps.log_prob = self.log_probs.transpose(0, 1).reshape(-1)
 
-        # Preprocess experiences
-
-        exps.obs = self.preprocess_obss(exps.obs, device=self.device)
-
         # Log some values
 
         keep = max(self.log_done_counter, self.num_procs)
@@ -239,6 +227,222 @@ class BaseAlgo(ABC):
 
         return exps, logs
 
+    def _collect_frames(self):
+        """Runs `self.num_frames_per_proc` steps in every environment and
+        stores the experiences and log values."""
+
+        self.obs_buffer.reset()
+        self.log_episode_ends = []
+        self.masks[0] = self.mask
+        if self.reshape_reward is None:
+            self.rewards.zero_()
+
+        if self.env_batch_size is not None:
+            self._collect_frames_async()
+        else:
+            self._collect_frames_sync()
+
+        self._copy_host_values()
+        self._update_log_values()
+
+    def _collect_frames_sync(self):
+        """Same as `_collect_frames` for a synchronous `ParallelEnv`, all the
+        environments doing each step together."""
+
+        for i in range(self.num_frames_per_proc):
+            # Do one agent-environment interaction
+
+            preprocessed_obs = self.preprocess_obss(self.obs, device=self.device)
+            if self.acmodel.recurrent:
+                action, log_prob, value, memory = self._act(preprocessed_obs, self.memory * self.mask.unsqueeze(1))
+            else:
+                action, log_prob, value, _ = self._act(preprocessed_obs)
+
+            self.obs_buffer.write(preprocessed_obs, i)
+
+            obs, reward, terminated, truncated, _ = self.env.step(action.cpu().numpy())
+            if isinstance(obs, dict):
+                obs = ObsBatch(obs)
+            done = tuple(a | b for a, b in zip(terminated, truncated))
+
+            # Update experiences values
+
+            self.obs = obs
+            if self.acmodel.recurrent:
+                self.memories[i] = self.memory
+                self.memory = memory
+                # The memories are reset before the next step
+                self.mask = 1 - torch.tensor(done, device=self.device, dtype=torch.float)
+            self.actions[i] = action
+            self.values[i] = value
+            if self.reshape_reward is not None:
+                reshaped_reward = self.reshape_reward(obs, action, numpy.asarray(reward), numpy.asarray(done))
+                self.rewards[i] = torch.as_tensor(reshaped_reward, device=self.device, dtype=torch.float)
+            if self.novelty_bonus is not None:
+                self.rewards[i] += self.novelty_bonus(obs)
+            self.log_probs[i] = log_prob
+            self.log_rewards[i] = reward
+            self.dones[i] = done
+
+            # Update log values
+
+            self.log_episode_ends += [(i, env_id) for env_id, done_ in enumerate(done) if done_]
+
+    def _collect_frames_async(self):
+        """Same as `_collect_frames` for an asynchronous `ParallelEnv`.
+
+        The actions are computed for the environments returned first by
+        `self.env.recv`, and every environment keeps its own trajectory:
+        the i-th experience of an environment is stored at the i-th row,
+        whatever the other environments are doing. An environment that has
+        done its `self.num_frames_per_proc` steps waits for the others."""
+
+        num_steps = numpy.zeros(self.num_procs, dtype=int)
+        waiting = list(range(self.num_procs))
+        num_sent = 0
+
+        # The experiences are filled environment by environment
+        if isinstance(self.obs, ObsBatch):
+            self.obs = list(self.obs.copy())
+
+        while True:
+            # Send actions to the waiting environments that still have steps to do
+
+            env_ids = [env_id for env_id in waiting if num_steps[env_id] < self.num_frames_per_proc]
+            waiting = [env_id for env_id in waiting if num_steps[env_id] >= self.num_frames_per_proc]
+
+            if len(env_ids) > 0:
+                ids = torch.tensor(env_ids, device=self.device)
+                steps = torch.tensor(num_steps[env_ids], device=self.device)
+
+                preprocessed_obs = self.preprocess_obss([self.obs[env_id] for env_id in env_ids], device=self.device)
+                if self.acmodel.recurrent:
+                    memory = self.memory[ids] * self.mask[ids].unsqueeze(1)
+                    action, log_prob, value, memory = self._act(preprocessed_obs, memory)
+                else:
+                    action, log_prob, value, _ = self._act(preprocessed_obs)
+
+                self.obs_buffer.write(preprocessed_obs, steps, ids)
+                if self.acmodel.recurrent:
+                    self.memories[steps, ids] = self.memory[ids]
+                    self.memory[ids] = memory
+                self.actions[steps, ids] = action.int()
+                self.values[steps, ids] = value
+                self.log_probs[steps, ids] = log_prob
+
+                self.env.send(action.cpu().numpy(), env_ids)
+                num_sent += len(env_ids)
+
+            if num_sent == 0:
+                break
+
+            # Receive the environments that finished their step first
+
+            env_ids, obs, reward, terminated, truncated, _ = self.env.recv(min(self.env_batch_size, num_sent))
+            num_sent -= len(env_ids)
+            done = tuple(a | b for a, b in zip(terminated, truncated))
+
+            ids = torch.tensor(env_ids, device=self.device)
+            steps = torch.tensor(num_steps[env_ids], device=self.device)
+
+            for env_id, obs_ in zip(env_ids, obs):
+                self.obs[env_id] = obs_
+            if self.acmodel.recurrent:
+                # The memories are reset before the next step
+                self.mask[ids] = 1 - torch.tensor(done, device=self.device, dtype=torch.float)
+            if self.reshape_reward is not None:
+                reshaped_reward = self.reshape_reward(obs, self.actions[steps, ids], numpy.asarray(reward),
+                                                      numpy.asarray(done))
+                self.rewards[steps, ids] = torch.as_tensor(reshaped_reward, device=self.device, dtype=torch.float)
+            if self.novelty_bonus is not None:
+                self.rewards[steps, ids] += self.novelty_bonus(obs)
+            self.log_rewards[num_steps[env_ids], env_ids] = reward
+            self.dones[num_steps[env_ids], env_ids] = done
+
+            # Update log values
+
+            self.log_episode_ends += [(num_steps[env_id], env_id) for env_id, done_ in zip(env_ids, done) if done_]
+
+            num_steps[env_ids] += 1
+            waiting += list(env_ids)
+
+    def _act(self, preprocessed_obs, memory=None):
+        """Samples the actions of the preprocessed observations, with
+        `self.acmodel.act` if the model implements it, or by sampling the
+        distribution returned by the model otherwise.
+
+        Returns the actions, their log-probabilities, the values and the
+        memory, None for a non-recurrent model."""
+
+        with torch.inference_mode(), self.autocast():
+            if self.model_act is not None:
+                if self.acmodel.recurrent:
+                    return self.model_act(preprocessed_obs, memory)
+                action, log_prob, value = self.model_act(preprocessed_obs)
+            else:
+                if self.acmodel.recurrent:
+                    dist, value, memory = self.act_model(preprocessed_obs, memory)
+                else:
+                    dist, value = self.act_model(preprocessed_obs)
+                action = dist.sample()
+                log_prob = dist.log_prob(action)
+
+        return action, log_prob, value, memory
+
+    def _copy_host_values(self):
+        """Copies the masks and the rewards of the environments of the
+        rollout, kept on the host by the steps, to the device at once.
+
+        The mask of the first step is the one left by the previous rollout,
+        and the rewards of the environments are added to the bonuses
+        already on the device, unless the rewards were reshaped."""
+
+        masks = (1 - torch.from_numpy(self.dones).float()).to(self.device)
+        self.masks[1:] = masks[:-1]
+        self.mask = masks[-1].clone()
+        if self.reshape_reward is None:
+            self.rewards += torch.from_numpy(self.log_rewards).to(self.device)
+
+    def _update_log_values(self):
+        """Accumulates the returns and numbers of frames of the episodes
+        over the rollout, and logs the episodes that ended, in the order
+        they ended.
+
+        The values are accumulated with NumPy from the rewards kept on the
+        host and a single copy of the reshaped rewards, so that the steps
+        of the rollout don't wait for the device."""
+
+        reshaped_rewards = self.rewards.cpu().numpy()
+        done = self.dones
+
+        # Values of the episodes at each step, before the ended ones are reset
+        episode_values = numpy.zeros((3, *self.log_rewards.shape), dtype=numpy.float32)
+
+        for i in range(self.num_frames_per_proc):
+            self.log_episode_return += self.log_rewards[i]
+            self.log_episode_reshaped_return += reshaped_rewards[i]
+            self.log_episode_num_frames += 1
+
+            episode_values[0, i] = self.log_episode_return
+            episode_values[1, i] = self.log_episode_reshaped_return
+            episode_values[2, i] = self.log_episode_num_frames
+
+            self.log_episode_return[done[i]] = 0
+            self.log_episode_reshaped_return[done[i]] = 0
+            self.log_episode_num_frames[done[i]] = 0
+
+        for i, env_id in self.log_episode_ends:
+            self.log_done_counter += 1
+            self.log_return.append(episode_values[0, i, env_id].item())
+            self.log_reshaped_return.append(episode_values[1, i, env_id].item())
+            self.log_num_frames.append(episode_values[2, i, env_id].item())
+
+    def autocast(self):
+        """Returns the autocast context in which the model is run, enabled
+        only if `self.use_amp`."""
+
+        return torch.autocast(self.device_type, dtype=self.amp_dtype, enabled=self.use_amp)
+
     @abstractmethod
     def update_parameters(self):
         pass
@@ -0,0 +1,52 @@
+import numpy
+import torch
+
+
+def compute_gae(rewards, values, masks, next_value, next_mask, discount, gae_lambda):
+    """Computes the generalized advantage estimates of a rollout.
+
+    Parameters:
+    ----------
+    rewards, values : torch.Tensor
+        `(T, P)` tensors of the rewards and values of the `T` steps of `P`
+        environments
+    masks : torch.Tensor
+        `(T, P)` tensor of the discount masks of the steps: the mask of a
+        step multiplies the discount of the value and advantage of the
+        step before it, e.g. 0 for the first step of an episode and 1
+        otherwise
+    next_value, next_mask : torch.Tensor
+        `(P,)` tensors of the value and mask of the step after the rollout
+    discount : float
+    gae_lambda : float
+
+    Returns
+    -------
+    advantages : torch.Tensor
+        `(T, P)` tensor of the advantages, on the device of `values`
+
+    The deltas are computed for all the steps at once, and the advantages
+    by a single reverse scan over the steps in NumPy, in the same order of
+    operations as a step by step computation, which gives the same values.
+    """
+
+    next_values = torch.cat([values[1:], next_value.unsqueeze(0)])
+    next_masks = torch.cat([masks[1:], next_mask.unsqueeze(0)])
+    deltas = rewards + discount * next_values * next_masks - values
+
+    advantages = reverse_scan(
+        deltas.cpu().numpy(), next_masks.cpu().numpy(), discount * gae_lambda
+    )
+    return torch.from_numpy(advantages).to(values.device)
+
+
+def reverse_scan(deltas, masks, coef):
+    """Computes in place `deltas[i] += coef * deltas[i + 1] * masks[i]`
+    from the last step to the first one, and returns `deltas`."""
+
+    buffer = numpy.empty_like(deltas[0])
+    for i in reversed(range(len(deltas) - 1)):
+        numpy.multiply(deltas[i + 1], coef, out=buffer)
+        buffer *= masks[i]
+        deltas[i] += buffer
+    return deltas
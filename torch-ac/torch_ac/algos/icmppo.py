@@ -3,8 +3,10 @@ import torch
 import torch.nn as nn
 import torch.nn.functional as F
 
-from torch_ac.algos.base import BaseAlgo
+from torch_ac.algos.ppo import PPOAlgo
+from torch_ac.algos.gae import compute_gae
 from torch_ac.utils import DictList
+from torch_ac.utils.reward import as_batched_reshape_reward
 # from utils import Swish, linear_decay_beta, linear_decay_lr, linear_decay_eps
 
 class ICM(nn.Module):
@@ -82,33 +84,29 @@ class ICM(nn.Module):
 
 
 
-class ICMPPOAlgo(BaseAlgo):
+class ICMPPOAlgo(PPOAlgo):
     """The Proximal Policy Optimization algorithm
-    ([Schulman et al., 2015](https://arxiv.org/abs/1707.06347))."""
+    ([Schulman et al., 2015](https://arxiv.org/abs/1707.06347)), with the
+    intrinsic rewards of an intrinsic curiosity module added to the rewards
+    of the advantages. The parameters are updated as by `PPOAlgo`."""
 
     def __init__(self, envs, acmodel, device=None, num_frames_per_proc=None, discount=0.99, lr=0.001, gae_lambda=0.95,
                  entropy_coef=0.01, value_loss_coef=0.5, max_grad_norm=0.5, recurrence=4,
                  adam_eps=1e-8, clip_eps=0.2, epochs=4, batch_size=256, preprocess_obss=None,
-                 reshape_reward=None, intr_range=0.004, icm_epochs=10, icm_batch_size=128):
-        num_frames_per_proc = num_frames_per_proc or 128
-
+                 reshape_reward=None, intr_range=0.004, icm_epochs=10, icm_batch_size=128, novelty_bonus=None,
+                 reshape_intr_reward=None, use_amp=False, use_compile=False):
         super().__init__(envs, acmodel, device, num_frames_per_proc, discount, lr, gae_lambda, entropy_coef,
-                         value_loss_coef, max_grad_norm, recurrence, preprocess_obss, reshape_reward)
-
-        self.clip_eps = clip_eps
-        self.epochs = epochs
-        self.batch_size = batch_size
-
-        assert self.batch_size % self.recurrence == 0
-
-        self.optimizer = torch.optim.Adam(self.acmodel.parameters(), lr, eps=adam_eps)
-        self.batch_num = 0
+                         value_loss_coef, max_grad_norm, recurrence, adam_eps, clip_eps, epochs, batch_size,
+                         preprocess_obss, reshape_reward, novelty_bonus, use_amp, use_compile)
 
-        self.icm = ICM(state_dim=acmodel.semi_memory_size, action_dim=envs[0].action_space.n).to(device)
+        self.icm = ICM(state_dim=acmodel.semi_memory_size, action_dim=self.env.action_space.n).to(device)
         self.optimizer_icm = torch.optim.Adam(self.icm.parameters(), lr, eps=adam_eps)
         self.intr_range = intr_range
         self.icm_epochs = icm_epochs
         self.icm_batch_size = icm_batch_size
+        # Shapes the intrinsic rewards of the whole rollout at once, like
+        # `reshape_reward` for the rewards of a step
+        self.reshape_intr_reward = as_batched_reshape_reward(reshape_intr_reward)
 
     def collect_experiences(self):
         """Collects rollouts and computes advantages.
@@ -131,56 +129,7 @@ class ICMPPOAlgo(BaseAlgo):
             reward, policy loss, value loss, etc.
         """
 
-        for i in range(self.num_frames_per_proc):
-            # Do one agent-environment interaction
-
-            preprocessed_obs = self.preprocess_obss(self.obs, device=self.device)
-            with torch.no_grad():
-                if self.acmodel.recurrent:
-                    dist, value, memory = self.acmodel(preprocessed_obs, self.memory * self.mask.unsqueeze(1))
-                else:
-                    dist, value = self.acmodel(preprocessed_obs)
-            action = dist.sample()
-
-            obs, reward, terminated, truncated, _ = self.env.step(action.cpu().numpy())
-            done = tuple(a | b for a, b in zip(terminated, truncated))
-
-            # Update experiences values
-
-            self.obss[i] = self.obs
-            self.obs = obs
-            if self.acmodel.recurrent:
-                self.memories[i] = self.memory
-                self.memory = memory
-            self.masks[i] = self.mask
-            self.mask = 1 - torch.tensor(done, device=self.device, dtype=torch.float)
-            self.actions[i] = action
-            self.values[i] = value
-            if self.reshape_reward is not None:
-                self.rewards[i] = torch.tensor([
-                    self.reshape_reward(obs_, action_, reward_, done_)
-                    for obs_, action_, reward_, done_ in zip(obs, action, reward, done)
-                ], device=self.device)
-            else:
-                self.rewards[i] = torch.tensor(reward, device=self.device)
-            self.log_probs[i] = dist.log_prob(action)
-
-            # Update log values
-
-            self.log_episode_return += torch.tensor(reward, device=self.device, dtype=torch.float)
-            self.log_episode_reshaped_return += self.rewards[i]
-            self.log_episode_num_frames += torch.ones(self.num_procs, device=self.device)
-
-            for i, done_ in enumerate(done):
-                if done_:
-                    self.log_done_counter += 1
-                    self.log_return.append(self.log_episode_return[i].item())
-                    self.log_reshaped_return.append(self.log_episode_reshaped_return[i].item())
-                    self.log_num_frames.append(self.log_episode_num_frames[i].item())
-
-            self.log_episode_return *= self.mask
-            self.log_episode_reshaped_return *= self.mask
-            self.log_episode_num_frames *= self.mask
+        self._collect_frames()
 
         # Define experiences:
         #   the whole experience is the concatenation of the experience
@@ -190,13 +139,8 @@ class ICMPPOAlgo(BaseAlgo):
         #   - P is self.num_procs,
         #   - D is the dimensionality.
 
-        # Preprocess experiences
         exps = DictList()
-        exps.obs = [self.obss[i][j]
-                    for j in range(self.num_procs)
-                    for i in range(self.num_frames_per_proc)]
-        exps.obs = self.preprocess_obss(exps.obs, device=self.device)
-        # print(self.rewards.shape)
+        exps.obs = self.obs_buffer.flatten()
         if self.acmodel.recurrent:
             # T x P x D -> P x T x D -> (P * T) x D
             exps.memory = self.memories.transpose(0, 1).reshape(-1, *self.memories.shape[2:])
@@ -210,46 +154,44 @@ class ICMPPOAlgo(BaseAlgo):
         # Add advantage and return to experiences
         preprocessed_obs = self.preprocess_obss(self.obs, device=self.device)
         with torch.no_grad():
-            if self.acmodel.recurrent:
-                _, next_value, _ = self.acmodel(preprocessed_obs, self.memory * self.mask.unsqueeze(1))
-            else:
-                _, next_value = self.acmodel(preprocessed_obs)
+            with self.autocast():
+                if self.acmodel.recurrent:
+                    _, next_value, _ = self.act_model(preprocessed_obs, self.memory * self.mask.unsqueeze(1))
+                else:
+                    _, next_value = self.act_model(preprocessed_obs)
 
             # calculate intrinsic reward
             transform = lambda x: x.reshape(self.num_procs, -1)[:, :-1].reshape(-1)
             # print(exps.obs[:-1])
-            curr_obs, next_obs = [], []
-            for i in range(self.num_procs):
-                for j in range(self.num_frames_per_proc):
-                    if j == 0:
-                        curr_obs.append(self.obss[j][i])
-                    elif j == self.num_frames_per_proc - 1:
-                        next_obs.append(self.obss[j][i])
-                    else:
-                        curr_obs.append(self.obss[j][i])
-                        next_obs.append(self.obss[j][i])
-            assert len(curr_obs) == len(next_obs)
-
-            curr_states = self.preprocess_obss(curr_obs)
-            next_states = self.preprocess_obss(next_obs)
+            # The observations of each process but its last one, and but its first one
+            curr_states = DictList({
+                key: value.reshape(self.num_procs, -1, *value.shape[1:])[:, :-1].reshape(-1, *value.shape[1:])
+                for key, value in exps.obs.items()
+            })
+            next_states = DictList({
+                key: value.reshape(self.num_procs, -1, *value.shape[1:])[:, 1:].reshape(-1, *value.shape[1:])
+                for key, value in exps.obs.items()
+            })
             actions = transform(exps.action).long()
             mask = transform(exps.mask)
             # print(curr_states.shape)
             # print(next_states.shape)
             intr_reward, _, _ = self.icm(actions, curr_states, next_states, mask)
-            intr_reward = torch.clamp(intr_reward, 0, self.intr_range).reshape(self.num_procs, -1).transpose(0, 1)
+            intr_reward = torch.clamp(intr_reward, 0, self.intr_range)
+            if self.reshape_intr_reward is not None:
+                dones = self.masks.transpose(0, 1)[:, 1:].reshape(-1) == 0
+                intr_reward = self.reshape_intr_reward(next_states, actions, intr_reward, dones)
+                intr_reward = torch.as_tensor(intr_reward, device=self.device, dtype=torch.float)
+            intr_reward = intr_reward.reshape(self.num_procs, -1).transpose(0, 1)
             # intr_reward = (intr_reward * self.intr_range).reshape(self.num_procs, -1).transpose(0, 1)
             # print(intr_reward.shape)
         self._icm_update(self.icm_epochs, self.icm_batch_size, curr_states, next_states, actions, mask)
 
-        for i in reversed(range(self.num_frames_per_proc)):
-            next_mask = self.masks[i+1] if i < self.num_frames_per_proc - 1 else self.mask
-            next_value = self.values[i+1] if i < self.num_frames_per_proc - 1 else next_value
-            next_advantage = self.advantages[i+1] if i < self.num_frames_per_proc - 1 else 0
-
-            in_reward = intr_reward[i] if i < self.num_frames_per_proc - 1 else 0
-            delta = (self.rewards[i] + in_reward) + in_reward + self.discount * next_value * next_mask - self.values[i]
-            self.advantages[i] = delta + self.discount * self.gae_lambda * next_advantage * next_mask
+        # The last step has no intrinsic reward
+        in_reward = torch.cat([intr_reward, torch.zeros_like(intr_reward[:1])])
+        rewards = (self.rewards + in_reward) + in_reward
+        self.advantages = compute_gae(rewards, self.values, self.masks, next_value, self.mask,
+                                      self.discount, self.gae_lambda)
 
 
         # print(exps.obs.image.shape)
@@ -305,133 +247,3 @@ class ICMPPOAlgo(BaseAlgo):
                 self.optimizer_icm.step()
                 # linear_decay_lr(self.optimizer_icm, self.timestep * 16)
             # print('icm_update loss: ', epoch_forw_loss, epoch_inv_loss)
-
-
-    def update_parameters(self, exps):
-        # Collect experiences
-
-        for _ in range(self.epochs):
-            # Initialize log values
-
-            log_entropies = []
-            log_values = []
-            log_policy_losses = []
-            log_value_losses = []
-            log_grad_norms = []
-
-            for inds in self._get_batches_starting_indexes():
-                # Initialize batch values
-
-                batch_entropy = 0
-                batch_value = 0
-                batch_policy_loss = 0
-                batch_value_loss = 0
-                batch_loss = 0
-
-                # Initialize memory
-
-                if self.acmodel.recurrent:
-                    memory = exps.memory[inds]
-
-                for i in range(self.recurrence):
-                    # Create a sub-batch of experience
-
-                    sb = exps[inds + i]
-
-                    # Compute loss
-
-                    if self.acmodel.recurrent:
-                        dist, value, memory = self.acmodel(sb.obs, memory * sb.mask)
-                    else:
-                        dist, value = self.acmodel(sb.obs)
-
-                    entropy = dist.entropy().mean()
-
-                    ratio = torch.exp(dist.log_prob(sb.action) - sb.log_prob)
-                    surr1 = ratio * sb.advantage
-                    surr2 = torch.clamp(ratio, 1.0 - self.clip_eps, 1.0 + self.clip_eps) * sb.advantage
-                    policy_loss = -torch.min(surr1, surr2).mean()
-
-                    value_clipped = sb.value + torch.clamp(value - sb.value, -self.clip_eps, self.clip_eps)
-                    surr1 = (value - sb.returnn).pow(2)
-                    surr2 = (value_clipped - sb.returnn).pow(2)
-                    value_loss = torch.max(surr1, surr2).mean()
-
-                    loss = policy_loss - self.entropy_coef * entropy + self.value_loss_coef * value_loss
-
-                    # Update batch values
-
-                    batch_entropy += entropy.item()
-                    batch_value += value.mean().item()
-                    batch_policy_loss += policy_loss.item()
-                    batch_value_loss += value_loss.item()
-                    batch_loss += loss
-
-                    # Update memories for next epoch
-
-                    if self.acmodel.recurrent and i < self.recurrence - 1:
-                        exps.memory[inds + i + 1] = memory.detach()
-
-                # Update batch values
-
-                batch_entropy /= self.recurrence
-                batch_value /= self.recurrence
-                batch_policy_loss /= self.recurrence
-                batch_value_loss /= self.recurrence
-                batch_loss /= self.recurrence
-
-                # Update actor-critic
-
-                self.optimizer.zero_grad()
-                batch_loss.backward()
-                grad_norm = sum(p.grad.data.norm(2).item() ** 2 for p in self.acmodel.parameters()) ** 0.5
-                torch.nn.utils.clip_grad_norm_(self.acmodel.parameters(), self.max_grad_norm)
-                self.optimizer.step()
-
-                # Update log values
-
-                log_entropies.append(batch_entropy)
-                log_values.append(batch_value)
-                log_policy_losses.append(batch_policy_loss)
-                log_value_losses.append(batch_value_loss)
-                log_grad_norms.append(grad_norm)
-
-        # Log some values
-
-        logs = {
-            "entropy": np.mean(log_entropies),
-            "value": np.mean(log_values),
-            "policy_loss": np.mean(log_policy_losses),
-            "value_loss": np.mean(log_value_losses),
-            "grad_norm": np.mean(log_grad_norms)
-        }
-
-        return logs
-
-    def _get_batches_starting_indexes(self):
-        """Gives, for each batch, the indexes of the observations given to
-        the model and the experiences used to compute the loss at first.
-
-        First, the indexes are the integers from 0 to `self.num_frames` with a step of
-        `self.recurrence`, shifted by `self.recurrence//2` one time in two for having
-        more diverse batches. Then, the indexes are splited into the different batches.
-
-        Returns
-        -------
-        batches_starting_indexes : list of list of int
-            the indexes of the experiences to be used at first for each batch
-        """
-
-        indexes = np.arange(0, self.num_frames, self.recurrence)
-        indexes = np.random.permutation(indexes)
-
-        # Shift starting indexes by self.recurrence//2 half the time
-        if self.batch_num % 2 == 1:
-            indexes = indexes[(indexes + self.recurrence) % self.num_frames_per_proc != 0]
-            indexes += self.recurrence // 2
-        self.batch_num += 1
-
-        num_indexes = self.batch_size // self.recurrence
-        batches_starting_indexes = [indexes[i:i+num_indexes] for i in range(0, len(indexes), num_indexes)]
-
-        return batches_starting_indexes
@@ -3,6 +3,8 @@ import torch
 import torch.nn.functional as F
 
 from torch_ac.algos.base import BaseAlgo
+from torch_ac.algos.stats import UpdateStats, clip_grad_norms
+from torch_ac.utils import RolloutBatch
 
 class PPOAlgo(BaseAlgo):
     """The Proximal Policy Optimization algorithm
@@ -11,11 +13,12 @@ class PPOAlgo(BaseAlgo):
     def __init__(self, envs, acmodel, device=None, num_frames_per_proc=None, discount=0.99, lr=0.001, gae_lambda=0.95,
                  entropy_coef=0.01, value_loss_coef=0.5, max_grad_norm=0.5, recurrence=4,
                  adam_eps=1e-8, clip_eps=0.2, epochs=4, batch_size=256, preprocess_obss=None,
-                 reshape_reward=None):
+                 reshape_reward=None, novelty_bonus=None, use_amp=False, use_compile=False):
         num_frames_per_proc = num_frames_per_proc or 128
 
         super().__init__(envs, acmodel, device, num_frames_per_proc, discount, lr, gae_lambda, entropy_coef,
-                         value_loss_coef, max_grad_norm, recurrence, preprocess_obss, reshape_reward)
+                         value_loss_coef, max_grad_norm, recurrence, preprocess_obss, reshape_reward,
+                         novelty_bonus, use_amp, use_compile)
 
         self.clip_eps = clip_eps
         self.epochs = epochs
@@ -23,111 +26,137 @@ class PPOAlgo(BaseAlgo):
 
         assert self.batch_size % self.recurrence == 0
 
+        # Recurrent models implementing `forward_sequence` are updated
+        # with whole sequences of experiences at once
+        self.sequence_update = self.acmodel.recurrent and hasattr(self.acmodel, "forward_sequence")
+
         self.optimizer = torch.optim.Adam(self.acmodel.parameters(), lr, eps=adam_eps)
         self.batch_num = 0
 
+        # The loss is compiled as the model, and scaled in float16 to avoid
+        # the underflow of the gradients
+        self.compute_loss = torch.compile(self._compute_loss) if self.use_compile else self._compute_loss
+        if self.use_amp and self.amp_dtype == torch.float16:
+            self.scaler = torch.amp.GradScaler(self.device_type)
+        else:
+            self.scaler = None
+
     def update_parameters(self, exps):
         # Collect experiences
 
+        batch = RolloutBatch(exps)
+
         for _ in range(self.epochs):
             # Initialize log values
 
-            log_entropies = []
-            log_values = []
-            log_policy_losses = []
-            log_value_losses = []
-            log_grad_norms = []
+            stats = UpdateStats(self.recurrence)
+
+            # Whether the starting indexes of this epoch are shifted
+            shifted = self.batch_num % 2 == 1
 
             for inds in self._get_batches_starting_indexes():
                 # Initialize batch values
 
-                batch_entropy = 0
-                batch_value = 0
-                batch_policy_loss = 0
-                batch_value_loss = 0
                 batch_loss = 0
 
                 # Initialize memory
 
                 if self.acmodel.recurrent:
-                    memory = exps.memory[inds]
+                    memory = batch.select("memory", inds)
+
+                # The sequences are unrolled by the model in two parts,
+                # split where the sequences of next epoch start for their
+                # memories to be updated, or one sub-batch of experience at a time
+                if self.sequence_update:
+                    middle = self.recurrence - self.recurrence // 2 if shifted else self.recurrence // 2
+                    if 0 < middle < self.recurrence:
+                        parts = [(0, middle), (middle, self.recurrence)]
+                    else:
+                        parts = [(0, self.recurrence)]
+                else:
+                    parts = [(i, i + 1) for i in range(self.recurrence)]
 
-                for i in range(self.recurrence):
+                for start, end in parts:
                     # Create a sub-batch of experience
 
-                    sb = exps[inds + i]
-                    # print(len(sb.obs))
-
-                    # Compute loss
-
-                    if self.acmodel.recurrent:
-                        dist, value, memory = self.acmodel(sb.obs, memory * sb.mask)
+                    if self.sequence_update:
+                        steps = torch.arange(start, end, device=inds.device)
+                        sb = batch[(inds.unsqueeze(1) + steps).reshape(-1)]
                     else:
-                        dist, value = self.acmodel(sb.obs)
+                        sb = batch[inds + start]
 
-                    entropy = dist.entropy().mean()
-
-                    ratio = torch.exp(dist.log_prob(sb.action) - sb.log_prob)
-                    surr1 = ratio * sb.advantage
-                    surr2 = torch.clamp(ratio, 1.0 - self.clip_eps, 1.0 + self.clip_eps) * sb.advantage
-                    policy_loss = -torch.min(surr1, surr2).mean()
+                    # Compute loss
 
-                    value_clipped = sb.value + torch.clamp(value - sb.value, -self.clip_eps, self.clip_eps)
-                    surr1 = (value - sb.returnn).pow(2)
-                    surr2 = (value_clipped - sb.returnn).pow(2)
-                    value_loss = torch.max(surr1, surr2).mean()
+                    with self.autocast():
+                        if self.sequence_update:
+                            dist, value, memory = self.acmodel.forward_sequence(sb.obs, memory, sb.mask)
+                        elif self.acmodel.recurrent:
+                            dist, value, memory = self.acmodel(sb.obs, memory * sb.mask)
+                        else:
+                            dist, value = self.acmodel(sb.obs)
 
-                    loss = policy_loss - self.entropy_coef * entropy + self.value_loss_coef * value_loss
+                        entropy, policy_loss, value_loss, loss = self.compute_loss(sb, dist, value)
 
-                    # Update batch values
+                    # Update batch values, a part of several steps counting
+                    # as many times as its number of steps
 
-                    batch_entropy += entropy.item()
-                    batch_value += value.mean().item()
-                    batch_policy_loss += policy_loss.item()
-                    batch_value_loss += value_loss.item()
-                    batch_loss += loss
+                    num_steps = end - start
+                    stats.add_part(num_steps, entropy, value, policy_loss, value_loss)
+                    batch_loss += loss * num_steps
 
                     # Update memories for next epoch
 
-                    if self.acmodel.recurrent and i < self.recurrence - 1:
-                        exps.memory[inds + i + 1] = memory.detach()
+                    if self.acmodel.recurrent and end < self.recurrence:
+                        batch.index_copy("memory", inds + end, memory.detach())
 
                 # Update batch values
 
-                batch_entropy /= self.recurrence
-                batch_value /= self.recurrence
-                batch_policy_loss /= self.recurrence
-                batch_value_loss /= self.recurrence
                 batch_loss /= self.recurrence
 
                 # Update actor-critic
 
                 self.optimizer.zero_grad()
-                batch_loss.backward()
-                grad_norm = sum(p.grad.data.norm(2).item() ** 2 for p in self.acmodel.parameters()) ** 0.5
-                torch.nn.utils.clip_grad_norm_(self.acmodel.parameters(), self.max_grad_norm)
-                self.optimizer.step()
+                if self.scaler is not None:
+                    self.scaler.scale(batch_loss).backward()
+                    self.scaler.unscale_(self.optimizer)
+                    grad_norms = clip_grad_norms(self.acmodel.parameters(), self.max_grad_norm)
+                    self.scaler.step(self.optimizer)
+                    self.scaler.update()
+                else:
+                    batch_loss.backward()
+                    grad_norms = clip_grad_norms(self.acmodel.parameters(), self.max_grad_norm)
+                    self.optimizer.step()
 
                 # Update log values
 
-                log_entropies.append(batch_entropy)
-                log_values.append(batch_value)
-                log_policy_losses.append(batch_policy_loss)
-                log_value_losses.append(batch_value_loss)
-                log_grad_norms.append(grad_norm)
+                stats.add_batch(grad_norms)
 
         # Log some values
 
-        logs = {
-            "entropy": numpy.mean(log_entropies),
-            "value": numpy.mean(log_values),
-            "policy_loss": numpy.mean(log_policy_losses),
-            "value_loss": numpy.mean(log_value_losses),
-            "grad_norm": numpy.mean(log_grad_norms)
-        }
+        logs = stats.logs()
 
         return logs
 
+    def _compute_loss(self, sb, dist, value):
+        """Computes the entropy, policy loss, value loss and total loss of
+        a sub-batch of experience."""
+
+        entropy = dist.entropy().mean()
+
+        ratio = torch.exp(dist.log_prob(sb.action) - sb.log_prob)
+        surr1 = ratio * sb.advantage
+        surr2 = torch.clamp(ratio, 1.0 - self.clip_eps, 1.0 + self.clip_eps) * sb.advantage
+        policy_loss = -torch.min(surr1, surr2).mean()
+
+        value_clipped = sb.value + torch.clamp(value - sb.value, -self.clip_eps, self.clip_eps)
+        surr1 = (value - sb.returnn).pow(2)
+        surr2 = (value_clipped - sb.returnn).pow(2)
+        value_loss = torch.max(surr1, surr2).mean()
+
+        loss = policy_loss - self.entropy_coef * entropy + self.value_loss_coef * value_loss
+
+        return entropy, policy_loss, value_loss, loss
+
     def _get_batches_starting_indexes(self):
         """Gives, for each batch, the indexes of the observations given to
         the model and the experiences used to compute the loss at first.
@@ -138,8 +167,9 @@ class PPOAlgo(BaseAlgo):
 
         Returns
         -------
-        batches_starting_indexes : list of list of int
-            the indexes of the experiences to be used at first for each batch
+        batches_starting_indexes : list of torch.Tensor
+            the indexes of the experiences to be used at first for each batch,
+            on the device of the experiences
         """
 
         indexes = numpy.arange(0, self.num_frames, self.recurrence)
@@ -152,6 +182,7 @@ class PPOAlgo(BaseAlgo):
         self.batch_num += 1
 
         num_indexes = self.batch_size // self.recurrence
-        batches_starting_indexes = [indexes[i:i+num_indexes] for i in range(0, len(indexes), num_indexes)]
+        indexes = torch.as_tensor(indexes, device=self.device)
+        batches_starting_indexes = list(torch.split(indexes, num_indexes))
 
         return batches_starting_indexes
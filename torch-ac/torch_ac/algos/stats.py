@@ -0,0 +1,92 @@
+import numpy
+import torch
+
+
+def clip_grad_norms(parameters, max_norm):
+    """Clips the gradients of `parameters` to a total norm of `max_norm`,
+    as `torch.nn.utils.clip_grad_norm_`, and returns the tensor of the norms
+    of the gradients of the parameters, before clipping.
+
+    The total norm is computed from the norms of the gradients of the
+    parameters on their device, without synchronizing with it."""
+
+    parameters = [p for p in parameters if p.grad is not None]
+    grad_norms = torch.stack([torch.linalg.vector_norm(p.grad, 2) for p in parameters])
+    total_norm = torch.linalg.vector_norm(grad_norms, 2)
+    if hasattr(torch.nn.utils, "clip_grads_with_norm_"):
+        torch.nn.utils.clip_grads_with_norm_(parameters, max_norm, total_norm)
+    else:
+        # Before torch 2.6, the gradients are scaled as by `clip_grads_with_norm_`
+        clip_coef = torch.clamp(max_norm / (total_norm + 1e-6), max=1.0)
+        for p in parameters:
+            p.grad.mul_(clip_coef.to(p.grad.device))
+    return grad_norms
+
+
+class UpdateStats:
+    """Statistics of the batches of an epoch of updates, kept as tensors
+    on the device of the model and reduced on the host once, by `logs`.
+
+    The losses of a part of a batch of several steps count as many times
+    as its number of steps, and the values logged are the same as if each
+    statistic had been fetched with `.item()` and accumulated in Python."""
+
+    def __init__(self, recurrence):
+        self.recurrence = recurrence
+        self.batches = []
+        self.grad_norms = []
+        self.parts = []
+        self.num_steps = []
+
+    def add_part(self, num_steps, entropy, value, policy_loss, value_loss):
+        """Adds the losses of a part of `num_steps` steps of a batch."""
+
+        self.parts.append(torch.stack([entropy, value.mean(), policy_loss, value_loss]).detach())
+        self.num_steps.append(num_steps)
+
+    def add_batch(self, grad_norms):
+        """Ends a batch, whose update had gradients of norms `grad_norms`."""
+
+        self.batches.append(self.num_steps)
+        self.grad_norms.append(grad_norms)
+        self.num_steps = []
+
+    def logs(self):
+        """Returns the means over the batches of the entropy, value, policy
+        loss, value loss and gradient norm."""
+
+        parts = iter(torch.stack(self.parts).tolist())
+        grad_norms = torch.stack(self.grad_norms).tolist()
+
+        log_entropies = []
+        log_values = []
+        log_policy_losses = []
+        log_value_losses = []
+        log_grad_norms = []
+
+        for batch_num_steps, batch_grad_norms in zip(self.batches, grad_norms):
+            batch_entropy = 0
+            batch_value = 0
+            batch_policy_loss = 0
+            batch_value_loss = 0
+
+            for num_steps in batch_num_steps:
+                entropy, value, policy_loss, value_loss = next(parts)
+                batch_entropy += entropy * num_steps
+                batch_value += value * num_steps
+                batch_policy_loss += policy_loss * num_steps
+                batch_value_loss += value_loss * num_steps
+
+            log_entropies.append(batch_entropy / self.recurrence)
+            log_values.append(batch_value / self.recurrence)
+            log_policy_losses.append(batch_policy_loss / self.recurrence)
+            log_value_losses.append(batch_value_loss / self.recurrence)
+            log_grad_norms.append(sum(grad_norm ** 2 for grad_norm in batch_grad_norms) ** 0.5)
+
+        return {
+            "entropy": numpy.mean(log_entropies),
+            "value": numpy.mean(log_values),
+            "policy_loss": numpy.mean(log_policy_losses),
+            "value_loss": numpy.mean(log_value_losses),
+            "grad_norm": numpy.mean(log_grad_norms)
+        }
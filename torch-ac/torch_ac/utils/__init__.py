@@ -1,2 +1,6 @@
 from torch_ac.utils.dictlist import DictList
-from torch_ac.utils.penv import ParallelEnv
\ No newline at end of file
+from torch_ac.utils.batch import RolloutBatch
+from torch_ac.utils.buffer import ObsBuffer
+from torch_ac.utils.penv import ParallelEnv, ObsBatch
+from torch_ac.utils.novelty import NoveltyBonus
+from torch_ac.utils.reward import ScalarReshapeReward, batched_reshape_reward
\ No newline at end of file
@@ -0,0 +1,50 @@
+from torch_ac.utils.dictlist import DictList
+
+
+class RolloutBatch:
+    """The experiences of a rollout, a `DictList` of tensors whose entries
+    can be `DictList`s themselves (e.g. "obs"), kept as a flat dict of
+    contiguous tensors keyed by their path, e.g. `("obs", "image")`.
+
+    Sub-batches are gathered with `index_select` on tensors of indexes
+    already on the device of the experiences, instead of indexing every
+    entry of the nested `DictList`s with NumPy arrays.
+
+    The tensors are the ones of the experiences when they are already
+    contiguous, so `index_copy` also updates the experiences."""
+
+    def __init__(self, exps):
+        self.tensors = {}
+        self._flatten(exps, ())
+
+    def _flatten(self, value, path):
+        if isinstance(value, dict):
+            for key, entry in value.items():
+                self._flatten(entry, path + (key,))
+        else:
+            self.tensors[path] = value.contiguous()
+
+    def __getitem__(self, indexes):
+        """Gathers the experiences of index `indexes`, a tensor of
+        indexes, as a `DictList` structured like the experiences."""
+
+        batch = DictList()
+        for path, tensor in self.tensors.items():
+            entries = batch
+            for key in path[:-1]:
+                if key not in entries:
+                    dict.__setitem__(entries, key, DictList())
+                entries = dict.__getitem__(entries, key)
+            dict.__setitem__(entries, path[-1], tensor.index_select(0, indexes))
+        return batch
+
+    def select(self, key, indexes):
+        """Gathers the entry `key` of the experiences of index `indexes`."""
+
+        return self.tensors[(key,)].index_select(0, indexes)
+
+    def index_copy(self, key, indexes, values):
+        """Writes `values` in the entry `key` of the experiences of index
+        `indexes`."""
+
+        self.tensors[(key,)].index_copy_(0, indexes, values)
@@ -0,0 +1,83 @@
+import torch
+
+from torch_ac.utils.dictlist import DictList
+
+
+class ObsBuffer:
+    """Preallocated `(num_frames_per_proc, num_procs, ...)` tensors holding
+    the preprocessed observations of a rollout, one per entry of the
+    preprocessed observations (e.g. a `(T, P, 7, 7, 3)` tensor of images and
+    a `(T, P, L)` tensor of tokens).
+
+    The observations preprocessed at each step are written in the buffer,
+    so the experiences don't need to preprocess them again at the end of
+    the rollout. Entries whose size varies between steps, like the tokens
+    of missions of different lengths, are zero-padded to the longest one
+    of the rollout, as the preprocessing of the whole rollout at once
+    would have done. The tensors grow when an entry is larger than ever
+    before, and are reused otherwise."""
+
+    def __init__(self, num_frames_per_proc, num_procs):
+        self.shape = (num_frames_per_proc, num_procs)
+        self.buffers = {}
+        self.sizes = {}
+
+    def reset(self):
+        """Starts a new rollout."""
+
+        self.sizes = {}
+
+    def write(self, obs, steps, procs=slice(None)):
+        """Writes the preprocessed observations `obs` of the processes
+        `procs` at the steps `steps`."""
+
+        entries = obs.items() if isinstance(obs, dict) else [(None, obs)]
+        for key, value in entries:
+            size = tuple(value.shape[1:])
+            buffer = self._buffer(key, value, size)
+
+            index = (steps, procs) + tuple(slice(0, d) for d in size)
+            if size != tuple(buffer.shape[2:]):
+                buffer[steps, procs] = 0
+            buffer[index] = value
+
+            self.sizes[key] = tuple(map(max, self.sizes.get(key, size), size))
+
+    def _buffer(self, key, value, size):
+        """Returns the buffer of an entry, (re)allocated if it can't hold
+        values of this size."""
+
+        buffer = self.buffers.get(key)
+        if buffer is not None and (buffer.dtype, buffer.device) != (value.dtype, value.device):
+            buffer = None
+
+        if buffer is not None:
+            if all(d <= b for d, b in zip(size, buffer.shape[2:])):
+                return buffer
+            size = tuple(map(max, size, buffer.shape[2:]))
+
+        new_buffer = torch.zeros(*self.shape, *size, dtype=value.dtype, device=value.device)
+        if buffer is not None:
+            new_buffer[(...,) + tuple(slice(0, d) for d in buffer.shape[2:])] = buffer
+
+        self.buffers[key] = new_buffer
+        return new_buffer
+
+    def flatten(self):
+        """Returns the observations of the rollout with the observations of
+        each process in consecutive rows, i.e. `(P * T, ...)` tensors, as a
+        `DictList` or a tensor like the preprocessed observations."""
+
+        num_frames_per_proc, num_procs = self.shape
+
+        entries = {}
+        for key, size in self.sizes.items():
+            buffer = self.buffers[key][(slice(None), slice(None)) + tuple(slice(0, d) for d in size)]
+            # T x P x D -> P x T x D -> (P * T) x D
+            flat = torch.empty(num_procs, num_frames_per_proc, *size, dtype=buffer.dtype, device=buffer.device)
+            flat.copy_(buffer.transpose(0, 1))
+            entries[key] = flat.reshape(-1, *size)
+
+        if None in entries:
+            return entries[None]
+        return DictList(entries)
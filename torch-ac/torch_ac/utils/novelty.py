@@ -0,0 +1,94 @@
+import numpy
+import torch
+
+from torch_ac.utils.penv import ObsBatch
+
+
+def xor_reduce(x):
+    """XOR of the entries of the last dimension of an integer tensor."""
+
+    while x.shape[-1] > 1:
+        if x.shape[-1] % 2 == 1:
+            x = torch.cat([x[..., :1] ^ x[..., -1:], x[..., 1:-1]], dim=-1)
+        half = x.shape[-1] // 2
+        x = x[..., :half] ^ x[..., half:]
+    return x[..., 0]
+
+
+class NoveltyBonus:
+    """A count-based exploration bonus, `coef / sqrt(count)`, where `count`
+    is the number of times an observation was visited.
+
+    The observations are hashed with a Zobrist hash of their "image"
+    entry, and counted in a count-min sketch: `depth` rows of `width`
+    counters, indexed by `depth` independent hashes of the observation
+    hash. The count of an observation is the smallest of its counters, so
+    it can only be overestimated, when all of its counters are shared
+    with other observations. The memory used is fixed, `4 * width * depth`
+    bytes, whatever the number of observations.
+
+    Everything is computed on `device` with tensor operations, for the
+    whole batch of observations at once. Observations repeated in a batch
+    all get the count after the batch."""
+
+    def __init__(self, coef=0.005, width=2**20, depth=4, device=None, seed=0):
+        # A width of 1 would shift the 64-bit hashes by 64 bits
+        assert width >= 2 and width & (width - 1) == 0, "The width must be a power of 2, at least 2."
+
+        self.coef = coef
+        self.width = width
+        self.depth = depth
+        self.device = device
+        self.generator = torch.Generator().manual_seed(seed)
+
+        self.counts = torch.zeros(depth, width, dtype=torch.int32, device=device)
+
+        # Odd multipliers of the multiply-shift hashes of the rows
+        self.multipliers = (self._random_keys(depth) | 1).to(device)
+        self.shift = 64 - (width.bit_length() - 1)
+
+        # Zobrist keys of the (position, byte value) of the images, by size
+        self.image_keys = {}
+
+    def _random_keys(self, *size):
+        high = torch.randint(0, 2**32, size, generator=self.generator, dtype=torch.int64)
+        low = torch.randint(0, 2**32, size, generator=self.generator, dtype=torch.int64)
+        return (high << 32) | low
+
+    def hash(self, images):
+        """Zobrist hashes of a `(batch_size, ...)` uint8 tensor of images,
+        as a `(batch_size,)` int64 tensor."""
+
+        images = images.reshape(len(images), -1).long()
+        size = images.shape[1]
+        if size not in self.image_keys:
+            self.image_keys[size] = self._random_keys(size, 256).to(self.device)
+        keys = self.image_keys[size]
+
+        return xor_reduce(keys[torch.arange(size, device=self.device), images])
+
+    def add(self, hashes):
+        """Counts observations given by their hashes, and returns their
+        counts afterwards."""
+
+        # The top bits of the products with the multipliers index the rows
+        rows = torch.arange(self.depth, device=self.device).unsqueeze(1).expand(-1, len(hashes))
+        indexes = ((hashes.unsqueeze(0) * self.multipliers.unsqueeze(1)) >> self.shift) & (self.width - 1)
+
+        ones = torch.ones(rows.shape, dtype=self.counts.dtype, device=self.device)
+        self.counts.index_put_((rows, indexes), ones, accumulate=True)
+
+        return self.counts[rows, indexes].min(dim=0).values
+
+    def __call__(self, obss):
+        """Counts a batch of observations, an `ObsBatch` or a list of
+        observations, and returns their bonuses as a float tensor."""
+
+        if isinstance(obss, ObsBatch):
+            images = obss["image"]
+        else:
+            images = numpy.stack([obs["image"] for obs in obss])
+        images = torch.as_tensor(images, device=self.device)
+
+        counts = self.add(self.hash(images))
+        return self.coef * torch.rsqrt(counts.float())
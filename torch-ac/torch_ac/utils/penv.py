@@ -1,56 +1,387 @@
+import collections
+import copy
 import multiprocessing
+import multiprocessing.connection
+import threading
+import numpy
 import gymnasium as gym
 
 
 multiprocessing.set_start_method("fork")
 
-def worker(conn, env):
+def worker(conn, env_slice):
     while True:
         cmd, data = conn.recv()
         if cmd == "step":
-            obs, reward, terminated, truncated, info = env.step(data)
-            if terminated or truncated:
-                obs, _ = env.reset()
-            conn.send((obs, reward, terminated, truncated, info))
+            conn.send(env_slice.step(*data))
         elif cmd == "reset":
-            obs, _ = env.reset()
-            conn.send(obs)
+            conn.send(env_slice.reset())
         else:
             raise NotImplementedError
 
+class ResetPool:
+    """Levels of several environments generated ahead of time.
+
+    A background thread keeps up to `size` ready-to-play levels per
+    environment: it resets a private copy of the environment and queues a
+    copy of the result with its first observation. As the private copy
+    goes through the same resets as the environment would, the levels are
+    the same as with inline resets, as long as stepping the environment
+    doesn't use its random generator.
+
+    The thread must be started in the process that uses the pool, i.e.
+    after the workers are forked."""
+
+    def __init__(self, envs, size):
+        self.sources = [copy.deepcopy(env) for env in envs]
+        self.size = size
+        self.levels = [collections.deque() for _ in envs]
+        self.condition = threading.Condition()
+        thread = threading.Thread(target=self._generate, daemon=True)
+        thread.start()
+
+    def _generate(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: any(len(levels) < self.size for levels in self.levels))
+                i = min(range(len(self.levels)), key=lambda i: len(self.levels[i]))
+            source = self.sources[i]
+            obs, _ = source.reset()
+            level = (copy.deepcopy(source), obs)
+            with self.condition:
+                self.levels[i].append(level)
+                self.condition.notify_all()
+
+    def pop(self, i):
+        """Returns the next `(env, obs)` level of the environment `i`,
+        waiting for it if none is ready."""
+
+        with self.condition:
+            self.condition.wait_for(lambda: self.levels[i])
+            level = self.levels[i].popleft()
+            self.condition.notify_all()
+        return level
+
+class EnvSlice:
+    """Consecutive environments stepped sequentially by the same process.
+
+    Without `buffers`, `step` gives a `(obs, reward, terminated, truncated, info)`
+    tuple per environment and `reset` an observation per environment.
+    With `buffers`, the observation arrays, the reward and the episode flags
+    are written in the shared buffers and only the observation entries that
+    changed (e.g. the mission) are given: a `(changed, info)` tuple per
+    environment for `step` and `changed` for `reset`.
+
+    If `reset_pool_size` is set, the environments are reset with levels
+    pregenerated by a `ResetPool`, created at the first `reset`. The
+    environments popped from the pool replace the reset ones in `self.envs`
+    and, if given, at `self.start + i` in the `parent_envs` list the slice
+    was taken from."""
+
+    def __init__(self, envs, start, buffers=None, reset_pool_size=0, parent_envs=None):
+        self.envs = envs
+        self.start = start
+        self.parent_envs = parent_envs
+        self.buffers = buffers
+        self.reset_pool_size = reset_pool_size
+        self.reset_pool = None
+        self.extras = [{} for _ in self.envs]
+
+    def reset(self):
+        results = []
+        for i in range(len(self.envs)):
+            obs = self._reset(i)
+            if self.buffers is None:
+                results.append(obs)
+            else:
+                self.buffers.write(self.start + i, obs)
+                results.append(self.buffers.changed_extras(obs, self.extras[i]))
+        return results
+
+    def step(self, actions, indexes=None):
+        """Steps the environments of indexes `indexes` in the slice,
+        or all of them if `indexes` is None."""
+
+        if indexes is None:
+            indexes = range(len(self.envs))
+        results = []
+        for i, action in zip(indexes, actions):
+            env = self.envs[i]
+            obs, reward, terminated, truncated, info = env.step(action)
+            if terminated or truncated:
+                obs = self._reset(i)
+            if self.buffers is None:
+                results.append((obs, reward, terminated, truncated, info))
+            else:
+                self.buffers.write(self.start + i, obs, reward, terminated, truncated)
+                results.append((self.buffers.changed_extras(obs, self.extras[i]), info))
+        return results
+
+    def _reset(self, i):
+        """Resets the environment `i` and returns its observation."""
+
+        if self.reset_pool is not None:
+            self.envs[i], obs = self.reset_pool.pop(i)
+            if self.parent_envs is not None:
+                self.parent_envs[self.start + i] = self.envs[i]
+            return obs
+        obs, _ = self.envs[i].reset()
+        if self.reset_pool_size > 0 and i == len(self.envs) - 1:
+            self.reset_pool = ResetPool(self.envs, self.reset_pool_size)
+        return obs
+
+def shared_array(shape, dtype):
+    """Allocates a NumPy array in memory shared with the forked processes."""
+
+    dtype = numpy.dtype(dtype)
+    raw = multiprocessing.RawArray("b", int(numpy.prod(shape)) * dtype.itemsize)
+    return numpy.frombuffer(raw, dtype=dtype).reshape(shape)
+
+class SharedBuffers:
+    """The observation arrays, rewards and episode flags of several
+    environments, stored in shared memory.
+
+    Every `Box` and `Discrete` entry of the dict observation space gets its
+    own `(num_envs, ...)` array. The other entries (e.g. the mission string)
+    are called extras and still go through the pipes."""
+
+    def __init__(self, observation_space, num_envs):
+        assert isinstance(observation_space, gym.spaces.Dict), \
+            "Shared memory is only supported for dict observation spaces."
+
+        self.obs = {}
+        for key, space in observation_space.spaces.items():
+            if isinstance(space, gym.spaces.Box):
+                self.obs[key] = shared_array((num_envs, *space.shape), space.dtype)
+            elif isinstance(space, gym.spaces.Discrete):
+                self.obs[key] = shared_array((num_envs,), numpy.int64)
+        self.reward = shared_array((num_envs,), numpy.float32)
+        self.terminated = shared_array((num_envs,), numpy.bool_)
+        self.truncated = shared_array((num_envs,), numpy.bool_)
+
+    def write(self, index, obs, reward=0, terminated=False, truncated=False):
+        for key, array in self.obs.items():
+            array[index] = obs[key]
+        self.reward[index] = reward
+        self.terminated[index] = terminated
+        self.truncated[index] = truncated
+
+    def changed_extras(self, obs, extras):
+        """Returns the extras of `obs` that differ from `extras`, and
+        updates `extras` accordingly."""
+
+        changed = {key: value for key, value in obs.items()
+                   if key not in self.obs and (key not in extras or extras[key] != value)}
+        extras.update(changed)
+        return changed
+
+class ObsBatch:
+    """The observations of several environments, stored as one batched
+    entry per observation key.
+
+    Indexing with a key gives the batched entry, e.g. a `(num_envs, 7, 7, 3)`
+    array for "image". Indexing with an integer, or iterating, gives the
+    observation of one environment as a dict, so an `ObsBatch` can be used
+    wherever a list of observations is expected.
+
+    Example:
+        >>> obss = ObsBatch({"image": numpy.zeros((2, 7, 7, 3)), "mission": ["a", "b"]})
+        >>> obss["image"].shape
+        (2, 7, 7, 3)
+        >>> obss[1]["mission"]
+        'b'
+    """
+
+    def __init__(self, entries):
+        self.entries = entries
+
+    def __len__(self):
+        return len(next(iter(self.entries.values())))
+
+    def __getitem__(self, index):
+        if isinstance(index, str):
+            return self.entries[index]
+        return {key: value[index] for key, value in self.entries.items()}
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def keys(self):
+        return self.entries.keys()
+
+    def copy(self):
+        return ObsBatch({key: value.copy() for key, value in self.entries.items()})
+
 class ParallelEnv(gym.Env):
-    """A concurrent execution of environments in multiple processes."""
+    """A concurrent execution of environments in multiple processes.
+
+    The environments are split in slices of `envs_per_worker` consecutive
+    environments. The first slice is run in the main process and every other
+    slice in its own worker process, that steps its environments sequentially
+    and sends back a single message.
+
+    If `shared_memory` is set, the workers write the observation arrays,
+    rewards and episode flags in shared memory instead of pickling them
+    through the pipes. `reset` and `step` then return an `ObsBatch` of
+    zero-copy arrays and arrays of rewards and flags. These arrays are
+    views of the shared buffers: they are only valid until the next call
+    to `reset` or `step`.
+
+    If `batch_size` is set, the environments are stepped asynchronously:
+    `send` gives actions to some environments and `recv` returns the
+    `batch_size` environments that finished their step first, so a slow
+    environment (e.g. a long reset) doesn't stall the others. Every slice
+    then runs in a worker process.
 
-    def __init__(self, envs):
+    If `reset_pool_size` is set, every process keeps up to `reset_pool_size`
+    levels per environment generated ahead of time by a background thread
+    (see `ResetPool`), so the step ending an episode doesn't have to wait
+    for a new level to be generated."""
+
+    def __init__(self, envs, shared_memory=False, envs_per_worker=1, batch_size=None,
+                 reset_pool_size=0):
         assert len(envs) >= 1, "No environment given."
+        assert envs_per_worker >= 1, "At least one environment per worker is needed."
+        assert batch_size is None or 1 <= batch_size <= len(envs), "Invalid batch size."
 
         self.envs = envs
+        self.num_envs = len(envs)
         self.observation_space = self.envs[0].observation_space
         self.action_space = self.envs[0].action_space
+        self.shared_memory = shared_memory
+        self.envs_per_worker = envs_per_worker
+        self.batch_size = batch_size
+        self.reset_pool_size = reset_pool_size
+
+        self.buffers = None
+        if self.shared_memory:
+            self.buffers = SharedBuffers(self.observation_space, self.num_envs)
+            self.extras = [{} for _ in self.envs]
+
+        self.slices = [EnvSlice(self.envs[start:start + envs_per_worker], start, self.buffers,
+                                reset_pool_size, self.envs)
+                       for start in range(0, self.num_envs, envs_per_worker)]
+        self.local_slice = self.slices[0] if self.batch_size is None else None
 
         self.locals = []
-        for env in self.envs[1:]:
+        for env_slice in self.slices:
+            if env_slice is self.local_slice:
+                continue
             local, remote = multiprocessing.Pipe()
             self.locals.append(local)
-            p = multiprocessing.Process(target=worker, args=(remote, env))
+            p = multiprocessing.Process(target=worker, args=(remote, env_slice))
             p.daemon = True
             p.start()
             remote.close()
+        self.remote_slices = self.slices[1:] if self.local_slice is not None else self.slices
+
+        # Environments of the steps sent to each worker, in sending order,
+        # and results received but not returned by `recv` yet
+        self.pending = {local: collections.deque() for local in self.locals}
+        self.num_pending = 0
+        self.received = collections.deque()
 
     def reset(self):
         for local in self.locals:
             local.send(("reset", None))
-        results = [self.envs[0].reset()[0]] + [local.recv() for local in self.locals]
+        results = self.local_slice.reset() if self.local_slice is not None else []
+        for local in self.locals:
+            results += local.recv()
+        if self.shared_memory:
+            for extras, changed in zip(self.extras, results):
+                extras.update(changed)
+            return self._obs_batch()
         return results
 
     def step(self, actions):
-        for local, action in zip(self.locals, actions[1:]):
-            local.send(("step", action))
-        obs, reward, terminated, truncated, info = self.envs[0].step(actions[0])
-        if terminated or truncated:
-            obs, _ = self.envs[0].reset()
-        results = zip(*[(obs, reward, terminated, truncated, info)] + [local.recv() for local in self.locals])
+        if self.local_slice is None:
+            self.send(actions)
+            env_ids, results = self._recv(self.num_envs)
+            results = [results[i] for i in numpy.argsort(env_ids)]
+        else:
+            for local, env_slice in zip(self.locals, self.remote_slices):
+                local.send(("step", (actions[env_slice.start:env_slice.start + len(env_slice.envs)], None)))
+            results = self.local_slice.step(actions[:len(self.local_slice.envs)])
+            for local in self.locals:
+                results += local.recv()
+        if self.shared_memory:
+            for extras, (changed, _) in zip(self.extras, results):
+                extras.update(changed)
+            infos = tuple(info for _, info in results)
+            return self._obs_batch(), self.buffers.reward, self.buffers.terminated, \
+                self.buffers.truncated, infos
+        results = zip(*results)
         return results
 
+    def send(self, actions, env_ids=None):
+        """Starts stepping the environments of ids `env_ids` (all of them if
+        None) with `actions`, without waiting for the results. Their results
+        are then given by `recv`. An environment must be received before
+        being sent again."""
+
+        assert self.local_slice is None, "`send` needs a `batch_size`."
+
+        if env_ids is None:
+            env_ids = range(self.num_envs)
+        requests = collections.defaultdict(lambda: ([], []))
+        for env_id, action in zip(env_ids, actions):
+            slice_actions, indexes = requests[env_id // self.envs_per_worker]
+            slice_actions.append(action)
+            indexes.append(env_id % self.envs_per_worker)
+        for slice_id, (slice_actions, indexes) in requests.items():
+            local = self.locals[slice_id]
+            local.send(("step", (slice_actions, indexes)))
+            self.pending[local].append([self.slices[slice_id].start + i for i in indexes])
+            self.num_pending += len(indexes)
+
+    def recv(self, batch_size=None):
+        """Waits for the results of `batch_size` environments (`self.batch_size`
+        if None), returned in the order they finished, as a
+        `(env_ids, obs, reward, terminated, truncated, info)` tuple.
+
+        With shared memory, the observations, rewards and flags are copied
+        from the shared buffers, so they stay valid after the next steps."""
+
+        env_ids, results = self._recv(batch_size or self.batch_size)
+        if self.shared_memory:
+            for env_id, (changed, _) in zip(env_ids, results):
+                self.extras[env_id].update(changed)
+            infos = tuple(info for _, info in results)
+            return env_ids, self._obs_batch(env_ids), self.buffers.reward[env_ids], \
+                self.buffers.terminated[env_ids], self.buffers.truncated[env_ids], infos
+        return (env_ids, *zip(*results))
+
+    def _recv(self, batch_size):
+        """Waits for the results of `batch_size` environments and returns
+        their ids and their raw results, in the order they finished."""
+
+        assert batch_size <= len(self.received) + self.num_pending, \
+            "Not enough environments are being stepped."
+
+        while len(self.received) < batch_size:
+            waiting = [local for local in self.locals if self.pending[local]]
+            for local in multiprocessing.connection.wait(waiting):
+                env_ids = self.pending[local].popleft()
+                self.num_pending -= len(env_ids)
+                self.received.extend(zip(env_ids, local.recv()))
+
+        env_ids, results = zip(*[self.received.popleft() for _ in range(batch_size)])
+        return numpy.array(env_ids), list(results)
+
+    def _obs_batch(self, env_ids=None):
+        """Gives the observations of the environments of ids `env_ids`
+        (copies of the shared buffers), or of all of them (views of the
+        shared buffers) if None."""
+
+        if env_ids is None:
+            entries = dict(self.buffers.obs)
+            env_ids = range(self.num_envs)
+        else:
+            entries = {key: array[env_ids] for key, array in self.buffers.obs.items()}
+        for key in self.extras[0]:
+            entries[key] = [self.extras[env_id][key] for env_id in env_ids]
+        return ObsBatch(entries)
+
     def render(self):
         raise NotImplementedError
@@ -0,0 +1,48 @@
+import torch
+
+
+def batched_reshape_reward(reshape_reward):
+    """Marks a reward shaping function as batched: it is called once per
+    step with the whole batch of environments,
+    `reshape_reward(obss, actions, rewards, dones)`, and returns a tensor
+    of the shaped rewards.
+
+    `obss` are the observations reached by the step, an `ObsBatch` or a
+    list of observations, `actions` the tensor of the actions taken, and
+    `rewards` and `dones` the arrays of the rewards received and of the
+    terminal statuses.
+
+    Example:
+        >>> @batched_reshape_reward
+        ... def reshape_reward(obss, actions, rewards, dones):
+        ...     return torch.as_tensor(rewards, dtype=torch.float) - 0.01
+    """
+
+    reshape_reward.batched = True
+    return reshape_reward
+
+
+class ScalarReshapeReward:
+    """Adapter of a reward shaping function of one environment,
+    `reshape_reward(obs, action, reward, done)` returning a number, to the
+    batched interface of `batched_reshape_reward`."""
+
+    batched = True
+
+    def __init__(self, reshape_reward):
+        self.reshape_reward = reshape_reward
+
+    def __call__(self, obss, actions, rewards, dones):
+        return torch.tensor([
+            self.reshape_reward(obss[i], actions[i], rewards[i], dones[i])
+            for i in range(len(actions))
+        ])
+
+
+def as_batched_reshape_reward(reshape_reward):
+    """Returns `reshape_reward` if it is batched or None, and its
+    `ScalarReshapeReward` adapter otherwise."""
+
+    if reshape_reward is None or getattr(reshape_reward, "batched", False):
+        return reshape_reward
+    return ScalarReshapeReward(reshape_reward)